@@ -0,0 +1,73 @@
+"""Generators of synthetic action files and docs trees for the benchmarks."""
+from __future__ import annotations
+
+import os
+
+import yaml
+
+
+def make_action(n_inputs: int, n_outputs: int, name: str = "Synthetic action") -> str:
+    action = {
+        "name": name,
+        "description": f"{name} generated with {n_inputs} inputs and {n_outputs} outputs.",
+        "inputs": {
+            f"input_{i}": {
+                "description": f"Description of input {i}, long enough to look realistic.",
+                "required": i % 3 == 0,
+                "default": f"default-{i}",
+            }
+            for i in range(n_inputs)
+        },
+        "outputs": {
+            f"output_{i}": {"description": f"Description of output {i}.", "value": f"v{i}"}
+            for i in range(n_outputs)
+        },
+        "runs": {"using": "node20", "main": "index.js"},
+    }
+    return yaml.safe_dump(action, sort_keys=False)
+
+
+def make_page(index: int, blocks: list[str], filler_lines: int = 40) -> str:
+    lines = [f"# Page {index}", ""]
+    for i in range(filler_lines):
+        lines.append(f"Paragraph {i} of page {index}, with some *emphasis* and `code`.")
+        lines.append("")
+    for action_path in blocks:
+        lines.extend(
+            [
+                "::: mkdocs-action-yml",
+                f"    :path: {action_path}",
+                "    :owner: benchmark",
+                "    :version: v1",
+                "",
+            ]
+        )
+    return "\n".join(lines)
+
+
+def make_site(
+    root: str, pages: int, blocks: int, inputs: int, outputs: int, actions: int
+) -> tuple[list[str], list[str]]:
+    """
+    Write `actions` action files and `pages` Markdown pages with `blocks` blocks each under `root`.
+
+    Blocks cycle through the actions, so that every action is documented on several pages like in
+    a real site. Returns the action paths and the page paths; block paths are relative to `root`.
+    """
+    action_paths = []
+    for i in range(actions):
+        path = os.path.join("actions", f"action{i}", "action.yml")
+        os.makedirs(os.path.join(root, os.path.dirname(path)), exist_ok=True)
+        with open(os.path.join(root, path), "w", encoding="utf-8") as f:
+            f.write(make_action(inputs, outputs, name=f"Action {i}"))
+        action_paths.append(path)
+
+    page_paths = []
+    os.makedirs(os.path.join(root, "docs"), exist_ok=True)
+    for i in range(pages):
+        page_blocks = [action_paths[(i * blocks + j) % actions] for j in range(blocks)]
+        path = os.path.join(root, "docs", f"page{i}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_page(i, page_blocks))
+        page_paths.append(path)
+    return action_paths, page_paths
@@ -0,0 +1,58 @@
+"""
+Compare the `markdown` and `html` output modes on actions with many inputs.
+
+    python3 benchmarks/bench_html.py [--repeat N] [--inputs N ...]
+
+Each case converts a page embedding one action, with the `tables` and `fenced_code` extensions
+like MkDocs. `cold` clears every cache before a conversion; `warm` keeps the rendered blocks and
+only clears the page memo, so it measures the Markdown parsing of the block output alone.
+"""
+import argparse
+import os
+import tempfile
+import timeit
+
+import markdown
+from _synthetic import make_action
+
+from mkdocs_action_yml import ActionYmlExtension, _cache, clear_cache
+
+
+def convert(page: str, output: str) -> str:
+    extensions = [ActionYmlExtension(output=output), "tables", "fenced_code"]
+    return markdown.markdown(page, extensions=extensions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--inputs", type=int, nargs="+", default=[10, 100, 500, 1000])
+    args = parser.parse_args()
+
+    print(f"{'inputs':>8} {'cache':>6} {'markdown ms':>12} {'html ms':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_inputs in args.inputs:
+            path = os.path.join(tmpdir, f"action{n_inputs}.yml")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(make_action(n_inputs, n_inputs // 5))
+            page = f"# Page\n\n::: mkdocs-action-yml\n    :path: {path}\n    :owner: benchmark\n"
+
+            for label, reset in (("cold", clear_cache), ("warm", _cache.pages.clear)):
+                best = {}
+                for output in ("markdown", "html"):
+                    convert(page, output)
+
+                    def run(output: str = output) -> None:
+                        reset()
+                        convert(page, output)
+
+                    best[output] = min(timeit.repeat(run, number=1, repeat=args.repeat))
+                print(
+                    f"{n_inputs:>8} {label:>6} {best['markdown'] * 1e3:>12.2f} "
+                    f"{best['html'] * 1e3:>10.2f} {best['markdown'] / best['html']:>7.1f}x"
+                )
+            clear_cache()
+
+
+if __name__ == "__main__":
+    main()
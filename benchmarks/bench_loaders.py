@@ -0,0 +1,97 @@
+"""
+Compare the action file loaders on a small and on a very large action.
+
+    python3 benchmarks/bench_loaders.py [--repeat N] [--steps N] [--script-bytes N]
+
+The large action is a composite action with many steps carrying multi-kilobyte `run:` scripts,
+written as block scalars like in hand-written actions, plus a few hundred inputs. The JSON loader
+is timed on the same metadata converted to JSON. The `selective` loader skips the scripts, so it
+is checked on the spec it produces rather than on the loaded data.
+"""
+import argparse
+import functools
+import json
+import os
+import timeit
+
+import yaml
+
+from mkdocs_action_yml._loaders import LOADERS, default_loader, load
+from mkdocs_action_yml._spec import ActionSpec
+
+FIXTURE = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "fixtures", "action.yml")
+
+
+def make_large_action(n_steps: int, script_bytes: int, n_inputs: int = 300) -> bytes:
+    script = "\n".join(
+        f'echo "line {i} of a generated script" && test -n "$INPUT_{i % 10}"'
+        for i in range(script_bytes // 50)
+    )
+    action = {
+        "name": "Large composite action",
+        "description": "Generated for benchmarking",
+        "inputs": {
+            f"input{i}": {"description": f"Input {i}", "required": i % 2 == 0, "default": str(i)}
+            for i in range(n_inputs)
+        },
+        "runs": {
+            "using": "composite",
+            "steps": [
+                {"name": f"Step {i}", "shell": "bash", "run": script} for i in range(n_steps)
+            ],
+        },
+    }
+    return yaml.dump(action, Dumper=_BlockDumper, width=1000).encode("utf-8")
+
+
+class _BlockDumper(yaml.SafeDumper):
+    pass
+
+
+def _represent_str(dumper: yaml.SafeDumper, value: str) -> yaml.Node:
+    style = "|" if "\n" in value else None
+    return dumper.represent_scalar("tag:yaml.org,2002:str", value, style=style)
+
+
+_BlockDumper.add_representer(str, _represent_str)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--script-bytes", type=int, default=4096)
+    args = parser.parse_args()
+
+    with open(FIXTURE, "rb") as f:
+        small = f.read()
+    cases = {"small": small, "large": make_large_action(args.steps, args.script_bytes)}
+
+    loaders = ["python", "selective", "json"]
+    if default_loader() == "libyaml":
+        loaders.insert(0, "libyaml")
+    try:
+        import ruamel.yaml  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        loaders.append("ruamel")
+
+    print(f"{'action':>8} {'bytes':>10} {'loader':>9} {'best ms':>10}")
+    for label, data in cases.items():
+        as_json = json.dumps(yaml.safe_load(data)).encode("utf-8")
+        for name in loaders:
+            source = as_json if name == "json" else data
+            if name == "selective":
+                expected = ActionSpec.from_dict(yaml.safe_load(data))
+                assert ActionSpec.from_dict(LOADERS[name](source)) == expected
+            else:
+                assert LOADERS[name](source) == yaml.safe_load(data)
+            number = 100 if label == "small" else 1
+            timer = functools.partial(load, source, name)
+            best = min(timeit.repeat(timer, number=number, repeat=args.repeat)) / number
+            print(f"{label:>8} {len(source):>10} {name:>9} {best * 1e3:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Measure how `BlockScanner.process` scales with page size.
+
+    python3 benchmarks/bench_scanner.py [--repeat N]
+
+For each page size, two pages are timed: one without any block (the common case, which should be
+close to free) and one with a block every 1000 lines. The cost per line should stay flat as pages
+grow.
+"""
+import argparse
+import functools
+import timeit
+
+from mkdocs_action_yml._processing import BlockScanner
+
+SIZES = (1_000, 10_000, 100_000, 250_000)
+FILLER = (
+    "Some paragraph text that is about as long as a typical line of prose.",
+    "",
+    "- a list item with `inline code`",
+    "    indented code block line",
+    "## A heading",
+)
+BLOCK = ("::: mkdocs-action-yml", "    :path: action.yml", "    :owner: athackst")
+
+
+def make_page(n_lines: int, block_every: int = 0) -> list:
+    lines = []
+    while len(lines) < n_lines:
+        if block_every and len(lines) % block_every == 0:
+            lines.extend(BLOCK)
+        lines.append(FILLER[len(lines) % len(FILLER)])
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scanner = BlockScanner({"mkdocs-action-yml": lambda **options: ["rendered"]})
+
+    print(f"{'lines':>10} {'page':>12} {'best ms':>10} {'ns/line':>10}")
+    for size in SIZES:
+        for label, page in (("no block", make_page(size)), ("blocks", make_page(size, 1000))):
+            best = min(
+                timeit.repeat(
+                    functools.partial(scanner.process, page), number=1, repeat=args.repeat
+                )
+            )
+            print(f"{size:>10} {label:>12} {best * 1e3:>10.3f} {best / size * 1e9:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
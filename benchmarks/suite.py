@@ -0,0 +1,196 @@
+"""
+Benchmark suite for mkdocs-action-yml.
+
+    python3 benchmarks/suite.py [--scenario NAME] [--repeat N] [--threshold 0.25]
+                                [--baseline benchmarks/baselines.json] [--update-baseline]
+
+Each scenario generates a synthetic docs tree (pages x blocks per page, actions with a number of
+inputs and outputs) in a temporary directory and measures the wall time (best of `--repeat` runs)
+and the peak traced memory of each stage:
+
+- `scan`: finding blocks in every page with `BlockScanner`, with a no-op renderer.
+- `load`: parsing every action file once, with a cold cache.
+- `render`: `make_action_docs` for every block of every page, with a cold cache.
+- `convert`: `markdown.markdown(page, extensions=[ActionYmlExtension()])` for every page.
+
+Results are compared with the committed baselines; the script exits with status 1 when a stage is
+slower, or uses more memory, than its baseline by more than the threshold. Timings depend on the
+machine, so refresh the baselines with `--update-baseline` when changing CI hardware.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import markdown
+from _synthetic import make_site
+
+from mkdocs_action_yml import ActionYmlExtension, clear_cache
+from mkdocs_action_yml._docs import load_action, make_action_docs
+from mkdocs_action_yml._processing import BlockScanner
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+SCENARIOS: dict[str, dict[str, int]] = {
+    "small": dict(pages=20, blocks=1, inputs=10, outputs=5, actions=5),
+    "many-pages": dict(pages=100, blocks=2, inputs=20, outputs=5, actions=20),
+    "large-actions": dict(pages=10, blocks=2, inputs=500, outputs=100, actions=5),
+}
+
+
+def _stages(action_paths: list[str], pages: list[str]) -> dict[str, Callable[[], Any]]:
+    scanner = BlockScanner({"mkdocs-action-yml": lambda **options: []})
+    page_lines = [page.split("\n") for page in pages]
+    blocks: list[dict[str, Any]] = []
+    collector = BlockScanner({"mkdocs-action-yml": lambda **options: blocks.append(options) or []})
+    for lines in page_lines:
+        collector.process(lines)
+
+    def scan() -> None:
+        for lines in page_lines:
+            scanner.process(lines)
+
+    def load() -> None:
+        clear_cache()
+        for path in action_paths:
+            load_action(path)
+
+    def render() -> None:
+        clear_cache()
+        for options in blocks:
+            for _ in make_action_docs(options["path"], options["owner"], options["version"]):
+                pass
+
+    def convert() -> None:
+        clear_cache()
+        for page in pages:
+            markdown.markdown(page, extensions=[ActionYmlExtension()])
+
+    return {"scan": scan, "load": load, "render": render, "convert": convert}
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    # Measure memory in a separate run, tracemalloc slows everything down.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def run_scenario(params: dict[str, int], repeat: int) -> dict[str, dict[str, float]]:
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        action_paths, page_paths = make_site(root, **params)
+        pages = []
+        for path in page_paths:
+            with open(path, encoding="utf-8") as f:
+                pages.append(f.read())
+        # Block paths are relative to the site root, like in `mkdocs build`.
+        os.chdir(root)
+        try:
+            stages = _stages(action_paths, pages)
+            return {name: _measure(func, repeat) for name, func in stages.items()}
+        finally:
+            os.chdir(cwd)
+
+
+def compare(
+    results: dict[str, Any], baselines: dict[str, Any], threshold: float, min_seconds: float = 0.0
+) -> list[tuple[str, str, str, float, float, bool]]:
+    """Return (scenario, stage, metric, baseline, current, regressed) for every shared measure."""
+    rows = []
+    for scenario, stages in results.items():
+        for stage, metrics in stages.items():
+            baseline = baselines.get(scenario, {}).get(stage)
+            if baseline is None:
+                continue
+            for metric, value in metrics.items():
+                reference = baseline[metric]
+                regressed = reference > 0 and value > reference * (1 + threshold)
+                if metric == "seconds" and value - reference < min_seconds:
+                    regressed = False
+                rows.append((scenario, stage, metric, reference, value, regressed))
+    return rows
+
+
+def _format(metric: str, value: float) -> str:
+    if metric == "seconds":
+        return f"{value * 1e3:.2f} ms"
+    return f"{value / 1024:.0f} KiB"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.002,
+        help="ignore timing differences smaller than this, they are mostly noise",
+    )
+    parser.add_argument("--baseline", default=BASELINES)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        results[name] = run_scenario(SCENARIOS[name], args.repeat)
+        for stage, metrics in results[name].items():
+            print(
+                f"{name:>14} {stage:>8} "
+                + " ".join(f"{_format(m, v):>12}" for m, v in metrics.items())
+            )
+
+    if args.update_baseline:
+        document = {
+            "machine": {"python": platform.python_version(), "platform": platform.platform()},
+            "results": results,
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baselines written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baselines at {args.baseline}, run with --update-baseline first")
+        return 0
+    with open(args.baseline) as f:
+        baselines = json.load(f)["results"]
+
+    regressions = 0
+    print(f"\nCompared with {args.baseline} (threshold {args.threshold:.0%}):")
+    for scenario, stage, metric, reference, value, regressed in compare(
+        results, baselines, args.threshold, args.min_seconds
+    ):
+        change = (value - reference) / reference if reference else 0.0
+        flag = "REGRESSION" if regressed else ""
+        regressions += regressed
+        print(
+            f"{scenario:>14} {stage:>8} {metric:>10} {_format(metric, reference):>12} "
+            f"-> {_format(metric, value):>12} {change:>+8.1%} {flag}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,23 @@
 from .__version__ import __version__
-from ._exceptions import MkDocsActionYmlException
+from ._bulk import RenderManyResult, render_many
+from ._cache import CacheInfo, cache_info, clear_cache
+from ._docs import write_action_docs
+from ._exceptions import LimitExceeded, MkDocsActionYmlException
+from ._instrument import Recorder, recorder
 from .plugin import ActionYmlExtension, makeExtension
 
-__all__ = ["__version__", "ActionYmlExtension", "MkDocsActionYmlException", "makeExtension"]
+__all__ = [
+    "__version__",
+    "ActionYmlExtension",
+    "CacheInfo",
+    "LimitExceeded",
+    "MkDocsActionYmlException",
+    "Recorder",
+    "RenderManyResult",
+    "cache_info",
+    "clear_cache",
+    "makeExtension",
+    "recorder",
+    "render_many",
+    "write_action_docs",
+]
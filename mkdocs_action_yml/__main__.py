@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from ._bulk import render_many
+from ._exceptions import MkDocsActionYmlException
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mkdocs_action_yml",
+        description="Render action.yml files to Markdown reference pages.",
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="action files or glob patterns")
+    parser.add_argument("-o", "--output-dir", required=True, help="directory of the Markdown files")
+    parser.add_argument("--owner", required=True, help="owner of the actions")
+    parser.add_argument("--version", default="main", help="version shown in usage examples")
+    parser.add_argument("--loader", default="auto", help="loader of action files")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of processes")
+    parser.add_argument(
+        "--force", action="store_true", help="render every action, ignoring the manifest"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        result = render_many(
+            args.paths,
+            args.output_dir,
+            owner=args.owner,
+            version=args.version,
+            loader=args.loader,
+            workers=args.workers,
+            force=args.force,
+        )
+    except (MkDocsActionYmlException, OSError) as e:
+        sys.stderr.write(f"error: {e}\n")
+        return 1
+    for name in result.written:
+        sys.stdout.write(f"wrote {name}\n")
+    sys.stdout.write(f"{len(result.written)} written, {len(result.unchanged)} unchanged\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
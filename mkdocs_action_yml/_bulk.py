@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, NamedTuple
+
+from .__version__ import __version__
+from ._catalog import discover
+from ._composite import local_actions
+from ._docs import load_action, write_action_docs
+from ._exceptions import MkDocsActionYmlException
+from ._store import render_key
+
+MANIFEST = ".mkdocs-action-yml.json"
+_GLOB_CHARS = set("*?[")
+
+
+class RenderManyResult(NamedTuple):
+    written: list[str]
+    unchanged: list[str]
+
+
+def expand_paths(patterns: Iterable[str]) -> list[str]:
+    """Expand glob patterns, keep plain paths, and return the unique action files in order."""
+    paths: dict[str, None] = {}
+    for pattern in patterns:
+        if _GLOB_CHARS.intersection(pattern):
+            paths.update(dict.fromkeys(discover(pattern)))
+        else:
+            paths[pattern] = None
+    return sorted(paths)
+
+
+def output_name(path: str) -> str:
+    """
+    Name of the Markdown file documenting an action, relative to the output directory.
+
+    `actions/build/action.yml` becomes `actions/build.md`, other files keep their name with a `.md`
+    extension.
+    """
+    relative = os.path.normpath(os.path.relpath(path))
+    if relative.startswith(os.pardir):
+        relative = os.path.basename(os.path.dirname(os.path.abspath(path))) or "action"
+        return relative + ".md"
+    directory, basename = os.path.split(relative)
+    if basename in ("action.yml", "action.yaml") and directory:
+        return directory + ".md"
+    return os.path.splitext(relative)[0] + ".md"
+
+
+def _render(path: str, owner: str, version: str, loader: str) -> tuple[str, list[str]]:
+    """Render an action, and list the local actions its documentation describes."""
+    sink = io.StringIO()
+    write_action_docs(sink, path, owner, version, loader)
+    action = load_action(path, loader)
+    if not action.steps:
+        return sink.getvalue(), []
+    load = functools.partial(load_action, loader=loader)
+    return sink.getvalue(), [entry.path for entry in local_actions(path, action, load)]
+
+
+def _input_hash(path: str, local: Iterable[str], owner: str, version: str, loader: str) -> str:
+    """Hash an action file and the local actions it uses, with everything that shapes its output."""
+    source = b""
+    for name in (path, *local):
+        try:
+            with open(name, "rb") as f:
+                source += name.encode("utf-8") + b"\0" + f.read() + b"\0"
+        except OSError:
+            # Removed since the last run: render again, which reports the error.
+            source += name.encode("utf-8") + b"\0\0"
+    return render_key(source, owner, version, {"loader": loader})
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path) or os.curdir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _write_if_changed(path: str, data: bytes) -> bool:
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    _write_atomic(path, data)
+    return True
+
+
+def _load_manifest(path: str) -> dict[str, dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != __version__:
+        return {}
+    entries: dict[str, dict[str, Any]] = manifest.get("entries", {})
+    return entries
+
+
+def render_many(
+    patterns: Iterable[str],
+    output_dir: str,
+    owner: str,
+    version: str = "main",
+    loader: str = "auto",
+    workers: int | None = None,
+    force: bool = False,
+) -> RenderManyResult:
+    """
+    Render many action files, given as paths or glob patterns, to Markdown files in `output_dir`.
+
+    A manifest of input and output hashes is kept in `output_dir`. Actions whose file, local
+    actions, owner and version haven't changed since the last run are not rendered again, and
+    outputs whose content is unchanged are not rewritten, so their modification times stay stable.
+    Rendering runs in a pool of `workers` processes.
+    """
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    previous = {} if force else _load_manifest(manifest_path)
+    entries: dict[str, dict[str, Any]] = {}
+    unchanged: list[str] = []
+    pending: dict[str, str] = {}
+
+    for path in expand_paths(patterns):
+        name = output_name(path)
+        if name in entries or name in pending:
+            raise MkDocsActionYmlException(
+                f"Both {path!r} and another action would be written to {name!r}"
+            )
+        entry = previous.get(name)
+        # The local actions used by an action can only change if one of the hashed files does.
+        if (
+            entry is not None
+            and entry["input"] == _input_hash(path, entry.get("local", []), owner, version, loader)
+            and os.path.exists(os.path.join(output_dir, name))
+        ):
+            entries[name] = entry
+            unchanged.append(name)
+        else:
+            pending[name] = path
+
+    written: list[str] = []
+    if pending:
+        jobs = [(path, owner, version, loader) for path in pending.values()]
+        if workers == 1 or len(jobs) == 1:
+            outputs = [_render(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outputs = list(pool.map(_render, *zip(*jobs)))
+
+        for (name, path), (text, local) in zip(pending.items(), outputs):
+            data = text.encode("utf-8")
+            if _write_if_changed(os.path.join(output_dir, name), data):
+                written.append(name)
+            else:
+                unchanged.append(name)
+            entries[name] = {
+                "source": path,
+                "input": _input_hash(path, local, owner, version, loader),
+                "output": _digest(data),
+                "local": local,
+            }
+
+    manifest = {"version": __version__, "entries": dict(sorted(entries.items()))}
+    _write_if_changed(manifest_path, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+    return RenderManyResult(sorted(written), sorted(unchanged))
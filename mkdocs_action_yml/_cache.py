@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    bytes: int
+
+
+class _Flight:
+    """A value being created by one thread, which other threads can wait for."""
+
+    def __init__(self) -> None:
+        self.owner = threading.get_ident()
+        self._done = threading.Event()
+        self._value: Any = None
+        self._error: BaseException | None = None
+
+    def finish(self, value: Any = None, error: BaseException | None = None) -> None:
+        self._value = value
+        self._error = error
+        self._done.set()
+
+    def wait(self) -> Any:
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class LRUCache:
+    """
+    A small thread-safe LRU mapping bounded by entry count and by an approximate byte size.
+
+    The byte size of an entry is supplied by the caller when it is stored, since there is no cheap
+    and reliable way to measure a Python object graph.
+
+    `get_or_create()` deduplicates concurrent misses: while one thread creates the value of a key,
+    other threads asking for the same key wait for it instead of creating it again.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value, _ = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def get_or_create(
+        self, key: Hashable, create: Callable[[], tuple[Any, int]]
+    ) -> tuple[Any, bool]:
+        """
+        Return the value of `key`, and whether this call created it with `create()`.
+
+        `create()` returns the value and its size. Only one thread creates the value of a missing
+        key; the others wait for it and count as hits. If it fails, they all raise its error, and
+        nothing is stored.
+        """
+        with self._lock:
+            if key in self._data:
+                value, _ = self._data[key]
+                self._data.move_to_end(key)
+                self._hits += 1
+                return value, False
+            flight = self._flights.get(key)
+            waiting = flight is not None and flight.owner != threading.get_ident()
+            if waiting:
+                self._hits += 1
+            else:
+                self._misses += 1
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                else:
+                    # Asked again by the thread creating it: waiting for itself would never end.
+                    flight = None
+
+        if flight is None:
+            return create()[0], True
+        if waiting:
+            return flight.wait(), False
+        try:
+            value, size = create()
+        except BaseException as e:
+            with self._lock:
+                del self._flights[key]
+            flight.finish(error=e)
+            raise
+        self.put(key, value, size)
+        with self._lock:
+            del self._flights[key]
+        flight.finish(value)
+        return value, True
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None:
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+            if size > self.max_bytes:
+                # Never cache an entry that would evict everything else on its own.
+                return
+            self._data[key] = (value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._data), self._bytes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class FileKey(NamedTuple):
+    """Identity of the current contents of a file."""
+
+    dev: int
+    ino: int
+    size: int
+    mtime_ns: int
+
+
+def file_key(path: str) -> FileKey:
+    """
+    Identify the current contents of a file by its device, inode, size and modification time.
+
+    Every path to a file, relative or not, through symlinks or `..`, or a hard link, has the same
+    key, so that a file is loaded once whatever path reaches it. A single `stat` call is needed.
+    """
+    st = os.stat(path)
+    return FileKey(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+# Parsed action metadata, shared by every Markdown instance in the process.
+actions = LRUCache()
+# Rendered block lines, keyed on the action file and the block options.
+rendered = LRUCache(max_entries=1024)
+# Preprocessed pages, keyed on their source and validated against the action files they embed.
+pages = LRUCache(max_entries=4096)
+# Files matched by the glob patterns of catalog blocks.
+discovered = LRUCache(max_entries=256)
+# Files that the relative paths of blocks resolve to, keyed on the directory and the path: one per
+# page directory and block, so they have their own cache rather than evict glob matches.
+resolved = LRUCache(max_entries=4096)
+# Contents of git blobs, keyed on their object id.
+blobs = LRUCache(max_entries=1024)
+# Changes between two versions of an action, keyed on the object ids of both blobs.
+diffs = LRUCache(max_entries=4096)
+# JSON indexes of the inputs and outputs of actions, for the `index` output.
+indexes = LRUCache(max_entries=1024)
+# Steps of workflow files that use actions, keyed on the workflow file.
+workflows = LRUCache(max_entries=4096)
+
+
+def cache_info() -> CacheInfo:
+    """Return hit/miss counters and the current size of the parsed action cache."""
+    return actions.info()
+
+
+def clear_cache() -> None:
+    """
+    Drop every cached action, rendered block, page, glob match, resolved path, git blob, version
+    diff, JSON index and workflow, and reset the counters.
+    """
+    actions.clear()
+    rendered.clear()
+    pages.clear()
+    discovered.clear()
+    resolved.clear()
+    blobs.clear()
+    diffs.clear()
+    indexes.clear()
+    workflows.clear()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from markdown.extensions.toc import slugify
+
+from . import _cache
+from ._docs import _make_action_lines, load_action
+from ._exceptions import MkDocsActionYmlException
+
+if TYPE_CHECKING:
+    from ._limits import Limits
+    from ._spec import ActionSpec
+
+
+def discover(pattern: str) -> list[str]:
+    """
+    Return the files matching a glob pattern, `**` included, in a deterministic order.
+
+    Directory walks are cached per working directory and pattern until `clear_cache()` is called;
+    the MkDocs plugin clears them at the start of every build.
+    """
+    key = (os.getcwd(), pattern)
+
+    def walk() -> tuple[list[str], int]:
+        paths = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        return paths, sum(map(len, paths))
+
+    return list(_cache.discovered.get_or_create(key, walk)[0])
+
+
+def load_catalog(
+    paths: list[str],
+    loader: str = "auto",
+    workers: int | None = None,
+    limits: Limits | None = None,
+) -> list[ActionSpec]:
+    """Load many action files in parallel, reusing the parsed action cache."""
+    if len(paths) <= 1:
+        return [load_action(path, loader, limits=limits) for path in paths]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda path: load_action(path, loader, limits=limits), paths))
+
+
+def make_catalog_docs(
+    pattern: str,
+    owner: str,
+    version: str = "main",
+    loader: str = "auto",
+    toc: bool = False,
+    workers: int | None = None,
+    output: str = "markdown",
+    sections: Iterable[str] | None = None,
+    examples: int = 0,
+    limits: Limits | None = None,
+    base_dir: str = "",
+) -> Iterator[str]:
+    paths = discover(pattern)
+    if not paths:
+        raise MkDocsActionYmlException(f"No action file matches {pattern!r}")
+    actions = load_catalog(paths, loader, workers, limits)
+    if toc:
+        yield from _make_catalog_toc(actions)
+    for path, action in zip(paths, actions):
+        yield from _make_action_lines(
+            action, path, owner, version, output, loader, None, sections, examples, limits, base_dir
+        )
+
+
+def _make_catalog_toc(actions: list[ActionSpec]) -> Iterator[str]:
+    """Create a summary table linking to the heading of every action."""
+    yield "| Action | Description |"
+    yield "| ------ | ----------- |"
+    for action in actions:
+        description = " ".join(action.description.split())
+        yield f"| [{action.name}](#{slugify(action.name, '-')}) | {description} |"
+    yield ""
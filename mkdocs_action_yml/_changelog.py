@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Iterator
+
+from . import _cache, _git
+from ._docs import load_action
+from ._exceptions import MkDocsActionYmlException
+
+if TYPE_CHECKING:
+    from ._limits import Limits
+    from ._spec import ActionSpec
+
+_VERSION_RE = re.compile(r"^v?\d")
+
+
+def version_key(version: str) -> tuple:
+    """Sort key of a version such as `v1.2.0`, which sorts `1.2.0-rc1` before `1.2.0`."""
+    release, _, prerelease = version.lstrip("v").partition("-")
+    numbers = tuple(int(part) if part.isdigit() else 0 for part in release.split("."))
+    return (numbers, not prerelease, _natural(prerelease))
+
+
+def _natural(text: str) -> tuple:
+    return tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in re.findall(r"\d+|\D+", text)
+    )
+
+
+def expand_versions(path: str, versions: str | bool) -> tuple[list[str], bool]:
+    """
+    Return the sorted versions of a `versions` option, and whether they were listed explicitly.
+
+    The option is either a comma separated list of refs, or a range of tags `first..last`, where
+    either end may be omitted; no value means every tag that looks like a version. Listed refs that
+    don't look like a version, such as a branch or a commit, come last in the order given.
+    """
+    if isinstance(versions, str) and versions and ".." not in versions:
+        listed = [version for version in versions.split(",") if version]
+        tagged = [version for version in listed if _VERSION_RE.match(version)]
+        others = [version for version in listed if not _VERSION_RE.match(version)]
+        return sorted(tagged, key=version_key) + others, True
+
+    first, _, last = versions.partition("..") if isinstance(versions, str) else ("", "", "")
+    low = version_key(first) if first else None
+    high = version_key(last) if last else None
+    found = []
+    for tag in _git.tags(path):
+        if not _VERSION_RE.match(tag):
+            continue
+        key = version_key(tag)
+        if (low is None or key >= low) and (high is None or key <= high):
+            found.append(tag)
+    return sorted(found, key=version_key), False
+
+
+def changelog_identity(path: str, versions: str | bool = "") -> tuple:
+    """Identify the output of a changelog with the versions it covers and their blobs."""
+    refs, _ = expand_versions(path, versions)
+    return tuple((ref, _oid(path, ref)) for ref in refs)
+
+
+def _oid(path: str, ref: str) -> str | None:
+    info = _git.object_info(path, ref)
+    return info.oid if info is not None and info.type == "blob" else None
+
+
+def diff_actions(old: ActionSpec, new: ActionSpec) -> list[str]:
+    """Describe the changes of the inputs, outputs and `runs.using` of an action."""
+    changes = []
+    old_inputs = {input.name: input for input in old.inputs or ()}
+    new_inputs = {input.name: input for input in new.inputs or ()}
+    for name, input in new_inputs.items():
+        before = old_inputs.get(name)
+        if before is None:
+            required = "required" if input.required else "optional"
+            changes.append(f"Added {required} input `{name}`")
+            continue
+        if before.required != input.required:
+            changes.append(f"Input `{name}` is now {'required' if input.required else 'optional'}")
+        if before.default != input.default:
+            changes.append(
+                f"Input `{name}` default changed from {_code(before.default)} "
+                f"to {_code(input.default)}"
+            )
+        if before.description != input.description:
+            changes.append(f"Input `{name}` description changed")
+    changes.extend(f"Removed input `{name}`" for name in old_inputs if name not in new_inputs)
+
+    old_outputs = {output.name: output for output in old.outputs or ()}
+    new_outputs = {output.name: output for output in new.outputs or ()}
+    for name, output in new_outputs.items():
+        before_output = old_outputs.get(name)
+        if before_output is None:
+            changes.append(f"Added output `{name}`")
+        elif before_output.description != output.description:
+            changes.append(f"Output `{name}` description changed")
+    changes.extend(f"Removed output `{name}`" for name in old_outputs if name not in new_outputs)
+
+    if old.using != new.using:
+        changes.append(f"`runs.using` changed from {_code(old.using)} to {_code(new.using)}")
+    return changes
+
+
+def _code(value: str) -> str:
+    return f"`{value}`" if value else "none"
+
+
+def make_changelog_docs(
+    path: str, versions: str | bool = "", loader: str = "auto", limits: Limits | None = None
+) -> Iterator[str]:
+    """
+    Create a table of the changes of an action between consecutive versions, newest first.
+
+    Every version is read from git, and loaded once per distinct blob. Diffs are cached on the
+    blobs of both versions, so adding a version to the list only computes one new diff.
+    """
+    refs, explicit = expand_versions(path, versions)
+    blobs = []
+    for ref in refs:
+        oid = _oid(path, ref)
+        if oid is None:
+            if explicit:
+                raise MkDocsActionYmlException(f"{path} not found in git ref {ref!r}")
+            # The action didn't exist yet in this version.
+            continue
+        blobs.append((ref, oid))
+    if not blobs:
+        raise MkDocsActionYmlException(f"No version of {path} matches {versions!r}")
+
+    rows = []
+    for old, new in zip(blobs, blobs[1:]):
+        changes = _diff(path, loader, old, new, limits) if old[1] != new[1] else []
+        rows.append((new[0], changes or ["No changes"]))
+
+    yield "| Version | Changes |"
+    yield "| ------- | ------- |"
+    for ref, changes in reversed(rows):
+        yield f"| {ref} | {changes[0]} |"
+        yield from (f"| | {change} |" for change in changes[1:])
+    yield f"| {blobs[0][0]} | First version |"
+    yield ""
+
+
+def _diff(
+    path: str,
+    loader: str,
+    old: tuple[str, str],
+    new: tuple[str, str],
+    limits: Limits | None = None,
+) -> list[str]:
+    def diff() -> tuple[list[str], int]:
+        # Parsed actions are cached on their blob, so each blob is loaded once.
+        changes = diff_actions(
+            load_action(path, loader, old[0], limits), load_action(path, loader, new[0], limits)
+        )
+        return changes, sum(map(len, changes))
+
+    return list(_cache.diffs.get_or_create((old[1], new[1], loader, limits), diff)[0])
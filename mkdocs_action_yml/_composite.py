@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+from . import _git
+from ._exceptions import MkDocsActionYmlException
+
+if TYPE_CHECKING:
+    from ._spec import ActionSpec
+
+ACTION_FILES = ("action.yml", "action.yaml")
+
+
+class LocalAction(NamedTuple):
+    uses: str
+    path: str
+    action: ActionSpec
+
+
+def is_local(uses: str) -> bool:
+    return uses.startswith("./")
+
+
+def resolve_local(uses: str, ref: str | None = None, root: str = "") -> str:
+    """
+    Return the action file of a local `uses: ./path` reference, in the working tree or in the git
+    `ref`.
+
+    Like on GitHub, the path is relative to `root`, the root of the repository, or else the
+    working directory.
+    """
+    path = os.path.join(root, os.path.normpath(uses)) if root else os.path.normpath(uses)
+    kind = _kind(path, ref)
+    if kind == "tree":
+        for name in ACTION_FILES:
+            candidate = os.path.join(path, name)
+            if _kind(candidate, ref) == "blob":
+                return candidate
+    elif kind == "blob":
+        return path
+    raise MkDocsActionYmlException(f"Local action {uses!r} not found")
+
+
+def _kind(path: str, ref: str | None) -> str | None:
+    if ref is not None:
+        info = _git.object_info(path, ref)
+        return info.type if info is not None else None
+    if os.path.isdir(path):
+        return "tree"
+    if os.path.isfile(path):
+        return "blob"
+    return None
+
+
+def repository_root(path: str, base_dir: str = "") -> str:
+    """
+    Return the root of the repository of an action file, which local actions are relative to, or
+    else `base_dir`, the working directory by default.
+    """
+    try:
+        return _git.find_root(os.path.dirname(os.path.abspath(path)))
+    except MkDocsActionYmlException:
+        return os.path.abspath(base_dir or os.curdir)
+
+
+def local_actions(
+    path: str,
+    action: ActionSpec,
+    load: Callable[[str], ActionSpec],
+    ref: str | None = None,
+    base_dir: str = "",
+) -> list[LocalAction]:
+    """
+    Return the local actions used by the steps of a composite action, directly or through other
+    composite actions.
+
+    The dependency graph is walked depth first, and every local action is listed, and loaded with
+    `load`, once however many composite actions share it, in the order of its first use. Local
+    actions are looked up in the repository of `path`, see `repository_root`; those that aren't
+    found, e.g. checked out by an earlier step, are left out, and their steps show the reference
+    as it is. A cycle raises an exception.
+    """
+    found: dict[str, LocalAction] = {}
+    stack = [os.path.realpath(path)]
+    root = repository_root(path, base_dir)
+
+    def visit(action: ActionSpec) -> None:
+        for step in action.steps or ():
+            if not is_local(step.uses):
+                continue
+            try:
+                sub_path = resolve_local(step.uses, ref, root)
+            except MkDocsActionYmlException:
+                continue
+            real_path = os.path.realpath(sub_path)
+            if real_path in stack:
+                cycle = [*stack[stack.index(real_path) :], real_path]
+                raise MkDocsActionYmlException(
+                    "Cycle in local actions: " + " -> ".join(map(os.path.relpath, cycle))
+                )
+            if real_path in found:
+                continue
+            sub_action = load(sub_path)
+            found[real_path] = LocalAction(step.uses, sub_path, sub_action)
+            stack.append(real_path)
+            visit(sub_action)
+            stack.pop()
+
+    visit(action)
+    return list(found.values())
@@ -1,22 +1,353 @@
 from __future__ import annotations
 
+import functools
+import html
 import os
-from typing import Iterator
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, NamedTuple, Sequence
 
 import yaml
 
-
-def make_action_docs(path: str, owner: str, version: str = "main") -> Iterator[str]:
-    with open(path, encoding="utf-8") as f:
-        action = yaml.safe_load(f)
-    yield from _make_title(action["name"])
-    yield from _make_description(action["description"])
-    yield from _make_runs(action["runs"])
-    if "inputs" in action:
-        yield from _make_inputs(action.get("inputs", {}))
-    if "outputs" in action:
-        yield from _make_outputs(action.get("outputs", {}))
-    yield from _make_usage(owner, path, version, action.get("inputs", {}))
+from . import _cache, _git, _limits, _loaders, _schema
+from ._composite import LocalAction, is_local, local_actions
+from ._exceptions import LimitExceeded, MkDocsActionYmlException
+from ._index import ActionIndex, build_index
+from ._instrument import recorder
+from ._spec import ActionSpec, InputSpec, OutputSpec, StepSpec
+from ._workflows import WorkflowStep, find_examples
+
+if TYPE_CHECKING:
+    from _typeshed import SupportsWrite
+
+    from ._limits import Limits
+
+# Prefix of the lines that hold finished HTML, in the `html` output mode. The extension stores
+# them in the Markdown `htmlStash`, so they are never parsed as Markdown. The `index` output is the
+# `html` output with the inputs and outputs tables loaded from a JSON index in the browser.
+RAW_HTML = "\ufdd0actionyml-html\ufdd1"
+OUTPUTS = ("markdown", "html", "index")
+SECTIONS = ("title", "description", "runs", "inputs", "outputs", "steps", "usage")
+
+
+class _Parsed(NamedTuple):
+    """An action file as cached by `load_action`."""
+
+    # None for a file over the limits it was parsed with.
+    action: ActionSpec | None
+    usage: _limits.Usage
+    # Messages of the schema errors of the file, without and with the unknown keys, each to be
+    # prefixed with the path of the file: the same file may be reached by other paths.
+    errors: tuple[str, ...] = ()
+    strict_errors: tuple[str, ...] = ()
+
+
+def source_key(path: str, ref: str | None = None) -> tuple:
+    """
+    Identify the current contents of an action file: in the working tree, or in the git `ref`
+    when one is given.
+    """
+    if ref is None:
+        return _cache.file_key(path)
+    return ("git", _git.object_id(path, ref))
+
+
+def read_source(path: str, ref: str | None = None) -> bytes:
+    """Read an action file from the working tree, or from the git `ref` when one is given."""
+    if ref is None:
+        with open(path, "rb") as f:
+            return f.read()
+    return _git.read_blob(path, _git.object_id(path, ref))
+
+
+def load_action(
+    path: str, loader: str = "auto", ref: str | None = None, limits: Limits | None = None
+) -> ActionSpec:
+    """
+    Load an action.yml as a spec, reusing the parsed result while the file is unchanged.
+
+    With a git `ref`, such as a tag, the file is read at that ref from the object database of its
+    repository instead of from the working tree.
+
+    With `limits`, files that are too large are not even read, and `LimitExceeded` is raised for
+    files with too many nodes or aliases, before anything walks the parsed document.
+    """
+    action = _load(path, loader, ref, limits).action
+    assert action is not None
+    return action
+
+
+def _load(path: str, loader: str, ref: str | None, limits: Limits | None) -> _Parsed:
+    loader = _loaders.resolve_loader(loader, path)
+    source = source_key(path, ref)
+    key = (*source, loader)
+
+    def parse() -> tuple[_Parsed, int]:
+        with recorder.measure("load", path=path, loader=loader) as record:
+            if isinstance(source, _cache.FileKey):
+                _limits.check_size(path, source.size, limits)
+                data = read_source(path)
+            else:
+                data = _git.read_blob(path, source[1])
+            raw = _loaders.load(data, loader)
+            usage = _limits.measure(len(data), raw)
+            record["bytes"] = len(data)
+            recorder.count("bytes_read", len(data))
+            try:
+                _limits.check(path, usage, limits)
+            except LimitExceeded:
+                # Remember the usage of the file, without converting it, so it isn't parsed again.
+                return _Parsed(None, usage), 0
+            action = _from_data(path, data, raw)
+            # Validate the document while it is at hand, so `check_file` needs no parse of its own.
+            # Unknown keys are the only errors of the strict validator that the other one ignores.
+            errors = _schema.validate(raw, strict=True)
+            messages = _schema.format_errors("", data, errors)
+            parsed = _Parsed(
+                action,
+                usage,
+                tuple(
+                    message
+                    for (_, error), message in zip(errors, messages)
+                    if not error.startswith("unknown key ")
+                ),
+                tuple(messages),
+            )
+            return parsed, len(data) + sum(map(len, messages))
+
+    # Threads loading the same file at the same time share a single parse.
+    parsed, created = _cache.actions.get_or_create(key, parse)
+    recorder.count("actions.miss" if created else "actions.hit")
+    # The file may have been loaded with other limits.
+    _limits.check(path, parsed.usage, limits)
+    if parsed.action is None:
+        parsed, size = parse()
+        _cache.actions.put(key, parsed, size=size)
+    return parsed
+
+
+def check_file(
+    path: str, loader: str = "auto", strict: bool = False, limits: Limits | None = None
+) -> list[str]:
+    """
+    Validate an action file, returning a message for every error.
+
+    Errors are found when `load_action` parses the file, and cached with it. Files exceeding
+    `limits` are reported as such, and not validated.
+    """
+    try:
+        errors, strict_errors = file_errors(path, loader, limits)
+    except LimitExceeded as e:
+        return [str(e)]
+    except (yaml.YAMLError, ValueError) as e:
+        return [f"{path}: can't be parsed: {' '.join(str(e).split())}"]
+    except MkDocsActionYmlException:
+        # Too broken to be converted, and so not cached: read it again for every error.
+        data = read_source(path)
+        raw = _loaders.load(data, _loaders.resolve_loader(loader, path))
+        return _schema.format_errors(path, data, _schema.validate(raw, strict))
+    return [path + message for message in (strict_errors if strict else errors)]
+
+
+def file_errors(
+    path: str, loader: str = "auto", limits: Limits | None = None
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    Return the messages of the schema errors of an action file, without and with the unknown
+    keys, as cached by `load_action`. Each message follows the path of the file, e.g. `:4: ...`,
+    so that it can be kept apart from the path, e.g. in the persistent store.
+    """
+    parsed = _load(path, loader, None, limits)
+    return parsed.errors, parsed.strict_errors
+
+
+def check_files(
+    paths: Iterable[str],
+    loader: str = "auto",
+    strict: bool = False,
+    limits: Limits | None = None,
+) -> list[str]:
+    """Validate many action files in one pass, returning every error of every file."""
+    messages = []
+    for path in paths:
+        try:
+            messages.extend(check_file(path, loader, strict, limits))
+        except OSError as e:
+            messages.append(f"{os.path.relpath(path)}: {e.strerror}")
+    return messages
+
+
+def load_index(
+    path: str, loader: str = "auto", ref: str | None = None, limits: Limits | None = None
+) -> ActionIndex:
+    """
+    Return the JSON index of an action file, built once per file and reused while it is unchanged.
+    """
+    loader = _loaders.resolve_loader(loader, path)
+
+    def build() -> tuple[ActionIndex, int]:
+        index = build_index(load_action(path, loader, ref, limits))
+        return index, len(index.data)
+
+    index: ActionIndex = _cache.indexes.get_or_create((*source_key(path, ref), loader), build)[0]
+    return index
+
+
+def _from_data(path: str, data: bytes, raw: Any) -> ActionSpec:
+    try:
+        return ActionSpec.from_dict(raw)
+    except (KeyError, TypeError, AttributeError) as e:
+        messages = _schema.format_errors(path, data, _schema.validate(raw)) or [f"{path}: {e!r}"]
+        raise MkDocsActionYmlException("Invalid action file:\n" + "\n".join(messages)) from e
+
+
+def make_action_docs(
+    path: str,
+    owner: str,
+    version: str = "main",
+    loader: str = "auto",
+    output: str = "markdown",
+    ref: str | None = None,
+    sections: Iterable[str] | None = None,
+    examples: int = 0,
+    limits: Limits | None = None,
+    base_dir: str = "",
+) -> Iterator[str]:
+    action = load_action(path, loader, ref, limits)
+    yield from _make_action_lines(
+        action, path, owner, version, output, loader, ref, sections, examples, limits, base_dir
+    )
+
+
+def write_action_docs(
+    sink: SupportsWrite[str],
+    path: str,
+    owner: str,
+    version: str = "main",
+    loader: str = "auto",
+    chunk_size: int = 64 * 1024,
+    ref: str | None = None,
+) -> int:
+    """
+    Write the documentation of an action to `sink`, e.g. a file or an `io.StringIO`.
+
+    Lines are rendered lazily and written in chunks of about `chunk_size` characters, so memory
+    use doesn't grow with the number of inputs and outputs. With a git `ref`, the action file is
+    read at that ref. Returns the number of characters written.
+    """
+    action = load_action(path, loader, ref)
+    lines = _make_action_lines(action, path, owner, version, loader=loader, ref=ref)
+    return _write_chunked(sink, lines, chunk_size)
+
+
+def _write_chunked(sink: SupportsWrite[str], lines: Iterable[str], chunk_size: int) -> int:
+    written = 0
+    chunk: list[str] = []
+    size = 0
+    for line in lines:
+        chunk.append(line)
+        chunk.append("\n")
+        size += len(line) + 1
+        if size >= chunk_size:
+            sink.write("".join(chunk))
+            written += size
+            chunk.clear()
+            size = 0
+    if chunk:
+        sink.write("".join(chunk))
+        written += size
+    return written
+
+
+def _make_action_lines(
+    action: ActionSpec,
+    path: str,
+    owner: str,
+    version: str,
+    output: str = "markdown",
+    loader: str = "auto",
+    ref: str | None = None,
+    sections: Iterable[str] | None = None,
+    examples: int = 0,
+    limits: Limits | None = None,
+    base_dir: str = "",
+) -> Iterator[str]:
+    if output not in OUTPUTS:
+        raise MkDocsActionYmlException(
+            f"Unknown output {output!r}, expected one of {', '.join(OUTPUTS)}"
+        )
+    selected = SECTIONS if sections is None else select_sections(sections)
+    html_output = output != "markdown"
+    index_output = output == "index"
+    section = functools.partial(recorder.lines, "section", path=path)
+
+    # Every section is built only when it is selected; e.g. the local actions of a composite
+    # action are not even resolved when its steps are skipped.
+    def make_inputs() -> Iterator[str]:
+        if action.inputs is None:
+            return
+        if index_output:
+            index = load_index(path, loader, ref, limits)
+            lines = _make_index_table("Inputs", index, "inputs", len(action.inputs))
+        else:
+            lines = (_make_html_inputs if html_output else _make_inputs)(action.inputs)
+        yield from section(lines, section="inputs")
+
+    def make_outputs() -> Iterator[str]:
+        if action.outputs is None:
+            return
+        if index_output:
+            index = load_index(path, loader, ref, limits)
+            lines = _make_index_table("Outputs", index, "outputs", len(action.outputs))
+        else:
+            lines = (_make_html_outputs if html_output else _make_outputs)(action.outputs)
+        yield from section(lines, section="outputs")
+
+    def make_steps() -> Iterator[str]:
+        if action.steps:
+            load = functools.partial(load_action, loader=loader, ref=ref, limits=limits)
+            local = local_actions(path, action, load, ref, base_dir)
+            yield from section(_make_steps(action.steps, local), section="steps")
+            if local:
+                yield from section(_make_local_actions(local), section="local_actions")
+
+    def make_usage() -> Iterator[str]:
+        steps = find_examples(path, owner, examples) if examples else []
+        if steps:
+            make_steps = _make_html_workflow_usage if html_output else _make_workflow_usage
+            yield from section(make_steps(steps), section="usage")
+            return
+        make = _make_html_usage if html_output else _make_usage
+        yield from section(make(owner, path, version, action.inputs or ()), section="usage")
+
+    makers: dict[str, Callable[[], Iterable[str]]] = {
+        "title": lambda: section(_make_title(action.name), section="title"),
+        "description": lambda: section(
+            _make_description(action.description), section="description"
+        ),
+        "runs": lambda: section(_make_runs(action.using), section="runs"),
+        "inputs": make_inputs,
+        "outputs": make_outputs,
+        "steps": make_steps,
+        "usage": make_usage,
+    }
+    for name in selected:
+        yield from makers[name]()
+
+
+def select_sections(sections: str | Iterable[str]) -> tuple[str, ...]:
+    """
+    Return the known sections named by a `:sections:` option, e.g. `inputs,outputs`, in the order
+    of the page.
+    """
+    if isinstance(sections, str):
+        sections = sections.split(",")
+    names = {name.strip() for name in sections} - {""}
+    unknown = names.difference(SECTIONS)
+    if unknown:
+        raise MkDocsActionYmlException(
+            f"Unknown section {', '.join(map(repr, sorted(unknown)))}, "
+            f"expected some of {', '.join(SECTIONS)}"
+        )
+    return tuple(name for name in SECTIONS if name in names)
 
 
 def _make_title(name: str) -> Iterator[str]:
@@ -30,29 +361,80 @@ def _make_description(description: str) -> Iterator[str]:
     yield ""
 
 
-def _make_runs(runs: dict) -> Iterator[str]:
-    using = runs.get("using", "")
+def _make_runs(using: str) -> Iterator[str]:
     yield f"This action is a {using} action."
     yield ""
 
 
-def _make_inputs(inputs: dict) -> Iterator[str]:
+def _make_inputs(inputs: Iterable[InputSpec]) -> Iterator[str]:
     yield from _make_table_inputs(inputs)
 
 
-def _make_outputs(outputs: dict) -> Iterator[str]:
+def _make_outputs(outputs: Iterable[OutputSpec]) -> Iterator[str]:
     yield from _make_table_outputs(outputs)
 
 
+def _make_steps(steps: Iterable[StepSpec], local: Iterable[LocalAction]) -> Iterator[str]:
+    """Create the list of the steps of a composite action."""
+    names = {entry.uses: entry.action.name for entry in local}
+    yield "## Steps"
+    yield ""
+    yield from _make_step_list(steps, names)
+    yield ""
+
+
+def _make_local_actions(local: Iterable[LocalAction]) -> Iterator[str]:
+    """Describe every local action used by a composite action, directly or not, once."""
+    names = {entry.uses: entry.action.name for entry in local}
+    yield "## Local actions"
+    yield ""
+    for entry in local:
+        yield f"### {entry.action.name}"
+        yield ""
+        yield f"`{entry.uses}`: {entry.action.description}"
+        yield ""
+        if entry.action.steps:
+            yield from _make_step_list(entry.action.steps, names)
+        else:
+            yield f"This action is a {entry.action.using} action."
+        yield ""
+
+
+def _make_step_list(steps: Iterable[StepSpec], names: dict[str, str]) -> Iterator[str]:
+    for index, step in enumerate(steps, 1):
+        yield f"{index}. {_format_step(index, step, names)}"
+
+
+def _format_step(index: int, step: StepSpec, names: dict[str, str]) -> str:
+    """Format a step, naming the local action it uses, if any."""
+    name = step.name or f"Step {index}"
+    if step.uses:
+        if is_local(step.uses) and step.uses in names:
+            return f"{name}: `{step.uses}` ({names[step.uses]})"
+        return f"{name}: `{step.uses}`"
+    if step.run:
+        return f"{name}: `run`" + (f" ({step.shell})" if step.shell else "")
+    return name
+
+
 def _make_env() -> Iterator[str]:
     yield ""
 
 
-def _make_usage(owner: str, action_file: str, version: str, inputs: dict) -> Iterator[str]:
-    usage_rows = [_format_usage_row(option, inputs[option]) for option in inputs]
+def _make_usage(
+    owner: str, action_file: str, version: str, inputs: Sequence[InputSpec]
+) -> Iterator[str]:
     yield "## Usage"
     yield ""
     yield "```yaml"
+    yield from _make_usage_example(owner, action_file, version, inputs)
+    yield "```"
+    yield ""
+
+
+def _make_usage_example(
+    owner: str, action_file: str, version: str, inputs: Sequence[InputSpec]
+) -> Iterator[str]:
     yield "name: Example usage"
     yield "on: push"
     yield "jobs:"
@@ -60,60 +442,131 @@ def _make_usage(owner: str, action_file: str, version: str, inputs: dict) -> Ite
     yield "    runs-on: ubuntu-latest"
     yield "    steps:"
     yield f"      - uses: {owner}/{os.path.splitext(os.path.basename(action_file))[0]}@{version}"
-    if usage_rows:
+    if inputs:
         yield "         with:"
-        yield from usage_rows
-    yield "```"
+        yield from map(_format_usage_row, inputs)
+
+
+def _make_workflow_usage(steps: Iterable[WorkflowStep]) -> Iterator[str]:
+    """Create usage examples from the workflow steps that use the action."""
+    yield "## Usage"
     yield ""
+    for step in steps:
+        yield "```yaml"
+        yield f"# {step.workflow}, job {step.job}"
+        yield from step.snippet.splitlines()
+        yield "```"
+        yield ""
 
 
-def _format_usage_row(name: str, input: dict) -> str:
+def _format_usage_row(input: InputSpec) -> str:
     """Format usage string for input."""
-    default = input.get("default", "")
     optional_str = ""
-    if not input.get("required", False):
+    if not input.required:
         optional_str = " # optional"
-    return f"           {name}: {default}{optional_str}"
+    return f"           {input.name}: {input.default}{optional_str}"
 
 
-def _make_table_inputs(input: dict) -> Iterator[str]:
+def _make_table_inputs(inputs: Iterable[InputSpec]) -> Iterator[str]:
     """Create the table style input options description."""
-
-    option_rows = [_format_table_inputs_row(option, input[option]) for option in input]
-
     yield "## Inputs"
     yield ""
     yield "| Input | Description | Default |"
     yield "| ----- | ----------- | ------- |"
-    yield from option_rows
+    yield from map(_format_table_inputs_row, inputs)
     yield ""
 
 
-def _format_table_inputs_row(name: str, input: dict) -> str:
+def _format_table_inputs_row(input: InputSpec) -> str:
     """Format a single row of the table."""
-    required = input.get("required", False)
-    required_str = "required" if required else "optional"
-    description = input.get("description", "")
-    default = input.get("default", "")
-    return f"| {name} | [{required_str}] {description} | `{default}` |"
+    required_str = "required" if input.required else "optional"
+    return f"| {input.name} | [{required_str}] {input.description} | `{input.default}` |"
 
 
-def _make_table_outputs(outputs: dict) -> Iterator[str]:
+def _make_table_outputs(outputs: Iterable[OutputSpec]) -> Iterator[str]:
     """Create the table style output options description."""
-
-    option_rows = [_format_table_outputs_row(option, outputs[option]) for option in outputs]
-
     yield "## Outputs"
     yield ""
     yield "| Output | Description |"
     yield "| ------ | ----------- |"
-    yield from option_rows
+    yield from map(_format_table_outputs_row, outputs)
     yield ""
 
 
-def _format_table_outputs_row(name: str, output: dict) -> str:
+def _format_table_outputs_row(output: OutputSpec) -> str:
     """Format a single row of the table."""
-    description = output.get("description", "")
-    output.get("value", "")
+    return f"| {output.name} | {output.description} |"
+
+
+def _make_html_inputs(inputs: Iterable[InputSpec]) -> Iterator[str]:
+    """Create the inputs table as HTML."""
+    yield "## Inputs"
+    yield ""
+    yield RAW_HTML + _html_table(
+        ("Input", "Description", "Default"),
+        (
+            (
+                html.escape(input.name),
+                f"[{'required' if input.required else 'optional'}] "
+                f"{html.escape(input.description)}",
+                f"<code>{html.escape(input.default)}</code>",
+            )
+            for input in inputs
+        ),
+    )
+    yield ""
+
+
+def _make_html_outputs(outputs: Iterable[OutputSpec]) -> Iterator[str]:
+    """Create the outputs table as HTML."""
+    yield "## Outputs"
+    yield ""
+    yield RAW_HTML + _html_table(
+        ("Output", "Description"),
+        ((html.escape(output.name), html.escape(output.description)) for output in outputs),
+    )
+    yield ""
+
+
+def _make_html_usage(
+    owner: str, action_file: str, version: str, inputs: Sequence[InputSpec]
+) -> Iterator[str]:
+    """Create the usage example as HTML, like the output of the `fenced_code` extension."""
+    yield "## Usage"
+    yield ""
+    example = "\n".join(_make_usage_example(owner, action_file, version, inputs))
+    yield f'{RAW_HTML}<pre><code class="language-yaml">{html.escape(example)}\n</code></pre>'
+    yield ""
+
+
+def _make_html_workflow_usage(steps: Iterable[WorkflowStep]) -> Iterator[str]:
+    """Create usage examples from workflow steps as HTML."""
+    yield "## Usage"
+    yield ""
+    for step in steps:
+        example = html.escape(f"# {step.workflow}, job {step.job}\n{step.snippet}")
+        yield f'{RAW_HTML}<pre><code class="language-yaml">{example}\n</code></pre>'
+        yield ""
+
+
+def _make_index_table(title: str, index: ActionIndex, key: str, count: int) -> Iterator[str]:
+    """Create a placeholder that the script of the `index` output fills from the JSON index."""
+    yield f"## {title}"
+    yield ""
+    yield (
+        f'{RAW_HTML}<div class="actionyml-index" data-index="{index.name}" data-section="{key}">'
+        f"<noscript>{count} {key}, listed in {index.name}.</noscript></div>"
+    )
+    yield ""
+
 
-    return f"| {name} | {description} |"
+def _html_table(header: Iterable[str], rows: Iterable[Iterable[str]]) -> str:
+    parts = ["<table>\n<thead>\n<tr>\n"]
+    parts.extend(f"<th>{cell}</th>\n" for cell in header)
+    parts.append("</tr>\n</thead>\n<tbody>\n")
+    for row in rows:
+        parts.append("<tr>\n")
+        parts.extend(f"<td>{cell}</td>\n" for cell in row)
+        parts.append("</tr>\n")
+    parts.append("</tbody>\n</table>")
+    return "".join(parts)
@@ -2,3 +2,9 @@ class MkDocsActionYmlException(Exception):
     """
     Generic exception class for mkdocs-click errors.
     """
+
+
+class LimitExceeded(MkDocsActionYmlException):
+    """
+    An action file, or the rendering of a block, exceeds one of the configured resource limits.
+    """
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import atexit
+import os
+import subprocess
+import threading
+from typing import IO, NamedTuple
+
+from . import _cache
+from ._exceptions import MkDocsActionYmlException
+
+
+class ObjectInfo(NamedTuple):
+    oid: str
+    type: str
+    size: int
+
+
+_TYPES = ("blob", "tree", "commit", "tag")
+
+
+class Repository:
+    """
+    Read objects of a git repository through two long-lived processes: `git cat-file
+    --batch-check` resolves `<ref>:<path>` names to object ids, and `git cat-file --batch` reads
+    blobs. Both are started on first use, and again in a forked child process.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._pid = 0
+        self._check: subprocess.Popen | None = None
+        self._batch: subprocess.Popen | None = None
+
+    def _process(self, mode: str) -> subprocess.Popen:
+        if self._pid != os.getpid():
+            # Pipes inherited from a parent process must not be shared with it.
+            self._check = self._batch = None
+            self._pid = os.getpid()
+        process = self._check if mode == "batch-check" else self._batch
+        if process is None or process.poll() is not None:
+            try:
+                process = subprocess.Popen(
+                    ["git", "cat-file", f"--{mode}"],
+                    cwd=self.root,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+            except OSError as e:
+                raise MkDocsActionYmlException(f"Can't run git: {e}") from e
+            if mode == "batch-check":
+                self._check = process
+            else:
+                self._batch = process
+        return process
+
+    def _request(self, mode: str, name: str) -> tuple[bytes, IO[bytes]]:
+        process = self._process(mode)
+        assert process.stdin is not None and process.stdout is not None
+        process.stdin.write(name.encode("utf-8") + b"\n")
+        process.stdin.flush()
+        return process.stdout.readline(), process.stdout
+
+    def info(self, ref: str, path: str) -> ObjectInfo | None:
+        """Return the object at `path`, relative to the root of the repository, in `ref`."""
+        name = f"{ref}:{path}"
+        if "\n" in name:
+            raise MkDocsActionYmlException(f"Invalid git object name {name!r}")
+        with self._lock:
+            header, _ = self._request("batch-check", name)
+        reply = header.decode("utf-8", "replace").rstrip("\n")
+        # The name is echoed back, spaces included, when it doesn't resolve to a single object.
+        if reply.endswith((" missing", " ambiguous")):
+            return None
+        fields = reply.split(" ")
+        if len(fields) != 3 or fields[1] not in _TYPES or not fields[2].isdigit():
+            raise MkDocsActionYmlException(f"Unexpected reply of git for {name!r}: {reply!r}")
+        return ObjectInfo(fields[0], fields[1], int(fields[2]))
+
+    def read(self, oid: str) -> bytes:
+        with self._lock:
+            header, stdout = self._request("batch", oid)
+            fields = header.split()
+            if len(fields) != 3:
+                raise MkDocsActionYmlException(f"Git object {oid} not found in {self.root}")
+            data = stdout.read(int(fields[2]))
+            stdout.read(1)
+        return data
+
+    def close(self) -> None:
+        with self._lock:
+            for process in (self._check, self._batch):
+                if process is not None and self._pid == os.getpid():
+                    assert process.stdin is not None and process.stdout is not None
+                    process.stdin.close()
+                    process.wait()
+                    process.stdout.close()
+            self._check = self._batch = None
+
+
+_repositories: dict[str, Repository] = {}
+_roots: dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def find_root(directory: str) -> str:
+    """Return the root of the working tree containing `directory`."""
+    directory = os.path.abspath(directory)
+    root = _roots.get(directory)
+    if root is None:
+        candidate = directory
+        while not os.path.exists(os.path.join(candidate, ".git")):
+            parent = os.path.dirname(candidate)
+            if parent == candidate:
+                raise MkDocsActionYmlException(f"{directory} is not in a git repository")
+            candidate = parent
+        root = _roots[directory] = candidate
+    return root
+
+
+def repository(path: str) -> tuple[Repository, str]:
+    """Return the repository of a file, shared by the whole process, and the file's path in it."""
+    root = find_root(os.path.dirname(os.path.abspath(path)))
+    with _lock:
+        repo = _repositories.get(root)
+        if repo is None:
+            repo = _repositories[root] = Repository(root)
+    relative = os.path.relpath(os.path.abspath(path), root)
+    return repo, relative.replace(os.sep, "/")
+
+
+def object_info(path: str, ref: str) -> ObjectInfo | None:
+    repo, name = repository(path)
+    return repo.info(ref, name)
+
+
+def object_id(path: str, ref: str) -> str:
+    """Return the id of the blob of a file in `ref`."""
+    info = object_info(path, ref)
+    if info is None or info.type != "blob":
+        raise MkDocsActionYmlException(f"{path} not found in git ref {ref!r}")
+    return info.oid
+
+
+def read_blob(path: str, oid: str) -> bytes:
+    """Return the contents of a blob of the repository of `path`, cached on its id."""
+
+    def read() -> tuple[bytes, int]:
+        repo, _ = repository(path)
+        data = repo.read(oid)
+        return data, len(data)
+
+    data: bytes = _cache.blobs.get_or_create(oid, read)[0]
+    return data
+
+
+def tags(path: str) -> list[str]:
+    """
+    Return the tags of the repository of `path`.
+
+    Like glob matches, tags are cached until `clear_cache()` is called; the MkDocs plugin clears
+    them at the start of every build.
+    """
+    root = find_root(os.path.dirname(os.path.abspath(path)))
+    key = ("git-tags", root)
+
+    def list_tags() -> tuple[list[str], int]:
+        try:
+            result = subprocess.run(
+                ["git", "for-each-ref", "--format=%(refname:short)", "refs/tags"],
+                cwd=root,
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise MkDocsActionYmlException(f"Can't list the tags of {root}: {e}") from e
+        names = result.stdout.split()
+        return names, sum(map(len, names))
+
+    return list(_cache.discovered.get_or_create(key, list_tags)[0])
+
+
+def close_all() -> None:
+    """Stop the git processes of every repository."""
+    with _lock:
+        repos = list(_repositories.values())
+        _repositories.clear()
+    for repo in repos:
+        repo.close()
+
+
+atexit.register(close_all)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from ._spec import ActionSpec
+
+# Directory of the site where the `index` output expects its JSON files and script.
+INDEX_DIR = "assets/mkdocs-action-yml"
+SCRIPT = "actionyml-index.js"
+
+
+class ActionIndex(NamedTuple):
+    """Compact JSON index of the inputs and outputs of an action, and its file name."""
+
+    name: str
+    data: bytes
+
+
+def build_index(action: ActionSpec) -> ActionIndex:
+    """
+    Build the JSON index of an action.
+
+    Inputs are `[name, description, required, default]` rows, and outputs `[name, description]`
+    rows. The file is named after a hash of its contents, so every page embedding the same action
+    shares one file, and browsers may cache it for good.
+    """
+    index = {
+        "name": action.name,
+        "inputs": [list(input) for input in action.inputs or ()],
+        "outputs": [[output.name, output.description] for output in action.outputs or ()],
+    }
+    data = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return ActionIndex(f"{hashlib.sha256(data).hexdigest()[:16]}.json", data)
+
+
+def script_path() -> str:
+    """Path of the script rendering the tables of the `index` output in the browser."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", SCRIPT)
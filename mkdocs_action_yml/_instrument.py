@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, ContextManager, Iterable, Iterator
+
+# Source path of the page being converted, set by the MkDocs plugin.
+current_page: ContextVar[str | None] = ContextVar("current_page", default=None)
+
+
+class _Measure:
+    def __init__(self, recorder: Recorder, record: dict[str, Any]) -> None:
+        self.recorder = recorder
+        self.record = record
+
+    def __enter__(self) -> dict[str, Any]:
+        self.start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.record["seconds"] = time.perf_counter() - self.start
+        self.recorder._add(self.record)
+
+
+class Recorder:
+    """
+    Collects timings and counters of block rendering.
+
+    Disabled by default, in which case every method is a cheap no-op. Enable it with `enable()`,
+    or with the `report` option of the MkDocs plugin, then read the data with `report()`,
+    `write_report()` and `summary()`.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.trace_memory = False
+        self._lock = threading.Lock()
+        self.records: list[dict[str, Any]] = []
+        self.counters: Counter[str] = Counter()
+        self._peak_memory = 0
+
+    def enable(self, trace_memory: bool = False) -> None:
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            self._peak_memory = max(self._peak_memory, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        self.trace_memory = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records = []
+            self.counters = Counter()
+            self._peak_memory = 0
+
+    def measure(self, stage: str, **labels: Any) -> ContextManager[dict[str, Any]]:
+        """
+        Time the body of a `with` statement as one record of `stage`.
+
+        The context value is the record itself, so further metrics can be added to it.
+        """
+        if not self.enabled:
+            return contextlib.nullcontext({})
+        record = {"stage": stage, "page": current_page.get(), **labels}
+        return _Measure(self, record)
+
+    def lines(self, stage: str, lines: Iterable[str], **labels: Any) -> Iterable[str]:
+        """Time the iteration of a line generator, and count the lines it emits."""
+        if not self.enabled:
+            return lines
+        return self._timed_lines(stage, lines, labels)
+
+    def _timed_lines(self, stage: str, lines: Iterable[str], labels: dict) -> Iterator[str]:
+        record = {"stage": stage, "page": current_page.get(), **labels}
+        seconds = 0.0
+        count = 0
+        iterator = iter(lines)
+        while True:
+            start = time.perf_counter()
+            try:
+                line = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                seconds += time.perf_counter() - start
+            count += 1
+            yield line
+        record["seconds"] = seconds
+        record["lines"] = count
+        self._add(record)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += n
+
+    def _add(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def peak_memory(self) -> int:
+        """Peak memory traced by `tracemalloc` so far, or 0 when memory is not traced."""
+        if self.trace_memory and tracemalloc.is_tracing():
+            return max(self._peak_memory, tracemalloc.get_traced_memory()[1])
+        return self._peak_memory
+
+    def report(self) -> dict[str, Any]:
+        """Return every record, plus totals per stage, the counters and the memory peak."""
+        with self._lock:
+            records = list(self.records)
+            counters = dict(self.counters)
+        stages: dict[str, dict[str, float]] = {}
+        for record in records:
+            stage = stages.setdefault(
+                record["stage"], {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            stage["count"] += 1
+            stage["total_seconds"] += record["seconds"]
+            stage["max_seconds"] = max(stage["max_seconds"], record["seconds"])
+        return {
+            "stages": stages,
+            "counters": counters,
+            "peak_memory_bytes": self.peak_memory(),
+            "records": records,
+        }
+
+    def write_report(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2, default=str)
+            f.write("\n")
+
+    def summary(self, top: int = 10) -> list[str]:
+        """Return a human readable summary with the `top` slowest blocks and pages."""
+        report = self.report()
+        lines = ["Stage totals:"]
+        for name, stage in sorted(report["stages"].items(), key=lambda s: -s[1]["total_seconds"]):
+            lines.append(
+                f"  {name}: {stage['count']} x, {stage['total_seconds'] * 1e3:.1f} ms total, "
+                f"{stage['max_seconds'] * 1e3:.1f} ms max"
+            )
+        for stage, label in (("block", "path"), ("page", "page")):
+            records = [r for r in report["records"] if r["stage"] == stage]
+            if not records:
+                continue
+            lines.append(f"Slowest {stage}s:")
+            for record in sorted(records, key=lambda r: -r["seconds"])[:top]:
+                lines.append(f"  {record['seconds'] * 1e3:8.1f} ms  {record.get(label)}")
+        if report["counters"]:
+            lines.append("Counters:")
+            for name, value in sorted(report["counters"].items()):
+                lines.append(f"  {name}: {value}")
+        if report["peak_memory_bytes"]:
+            lines.append(f"Peak traced memory: {report['peak_memory_bytes'] / 1024:.0f} KiB")
+        return lines
+
+
+recorder = Recorder()
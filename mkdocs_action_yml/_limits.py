@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from ._exceptions import LimitExceeded
+
+
+class Limits(NamedTuple):
+    """Bounds on the resources used by an action file, and by the rendering of a block."""
+
+    # Size of an action file, in bytes.
+    max_bytes: int = 0
+    # Nodes of the parsed document, counting every use of an alias again.
+    max_nodes: int = 0
+    # Uses of aliases of mappings and sequences, e.g. `*defaults`.
+    max_aliases: int = 0
+    # Wall-clock time to render a block, in seconds.
+    timeout: float = 0
+
+
+class Usage(NamedTuple):
+    """The resources used by an action file: see `Limits`."""
+
+    bytes: int
+    nodes: int
+    aliases: int
+
+
+def measure(size: int, raw: Any) -> Usage:
+    """
+    Count the nodes and aliases of a parsed document of `size` bytes.
+
+    YAML loaders share the object an alias refers to, so that loading stays cheap however many
+    times aliases are nested, as in the "billion laughs" attack. Whatever walks the result, such as
+    validation or rendering, would expand them though, so nodes are counted as if expanded. Each
+    container is only visited once, which keeps counting cheap as well.
+    """
+    if not isinstance(raw, (dict, list)):
+        return Usage(size, 1, 0)
+    # Expanded node count of every container, 1 while its contents are being counted.
+    sizes: dict[int, int] = {}
+    aliases = 0
+    stack: list[tuple[Any, list | None]] = [(raw, None)]
+    while stack:
+        value, children = stack.pop()
+        key = id(value)
+        if children is not None:
+            # Keys and scalars are one node each.
+            total = 1 + (2 * len(value) if isinstance(value, dict) else len(value))
+            sizes[key] = total + sum(sizes[id(child)] - 1 for child in children)
+            continue
+        if key in sizes:
+            # A recursive alias is not expanded, it is only counted once more.
+            aliases += 1
+            continue
+        sizes[key] = 1
+        items = value.values() if isinstance(value, dict) else value
+        children = [item for item in items if isinstance(item, (dict, list))]
+        stack.append((value, children))
+        stack.extend((child, None) for child in children)
+    return Usage(size, sizes[id(raw)], aliases)
+
+
+def check_size(path: str, size: int, limits: Limits | None) -> None:
+    """Raise `LimitExceeded` if a file of `size` bytes is too large to be read."""
+    if limits is not None and limits.max_bytes and size > limits.max_bytes:
+        raise LimitExceeded(
+            f"{path} is {size} bytes, over the limit of {limits.max_bytes} (max_bytes)"
+        )
+
+
+def check(path: str, usage: Usage, limits: Limits | None) -> None:
+    """Raise `LimitExceeded` if an action file uses more resources than allowed."""
+    if limits is None:
+        return
+    check_size(path, usage.bytes, limits)
+    if limits.max_nodes and usage.nodes > limits.max_nodes:
+        raise LimitExceeded(
+            f"{path} has {usage.nodes} nodes with aliases expanded, "
+            f"over the limit of {limits.max_nodes} (max_nodes)"
+        )
+    if limits.max_aliases and usage.aliases > limits.max_aliases:
+        raise LimitExceeded(
+            f"{path} uses {usage.aliases} aliases, over the limit of {limits.max_aliases} "
+            "(max_aliases)"
+        )
+
+
+def within_budget(lines: Iterable[str], label: str, timeout: float) -> Iterator[str]:
+    """
+    Yield `lines`, raising `LimitExceeded` once producing them took more than `timeout` seconds.
+
+    Python can't interrupt a thread, so the budget is checked as every line is produced; the other
+    limits bound the time spent producing a single line, such as parsing a file.
+    """
+    if not timeout:
+        yield from lines
+        return
+    deadline = time.monotonic() + timeout
+    for line in lines:
+        if time.monotonic() > deadline:
+            raise LimitExceeded(f"{label} took more than {timeout:g}s to render (timeout)")
+        yield line
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import functools
+import json
+import re
+from typing import Any, Callable, Pattern
+
+import yaml
+
+from ._exceptions import MkDocsActionYmlException
+
+Loader = Callable[[bytes], Any]
+
+# The end of the header line of a block scalar, quick to search for, and the whole header line,
+# e.g. `  - run: |`, `key: >-` or `- |`, checked from the start of the line.
+_BLOCK_INDICATOR = re.compile(rb"[|>][-+0-9]*[ ]*(?:#[^\n]*)?\r?$", re.MULTILINE)
+_BLOCK_HEADER = re.compile(
+    rb"(?P<prefix>[ ]*(?:-[ ]+)*)"
+    rb"(?:(?P<key>[^\s#'\"\-:][^\n:#]*?|\"[^\"\n]*\"|'[^'\n]*')[ ]*:[ ]+)?"
+    rb"(?P<properties>(?:[!&][^\s]*[ ]+)*)(?P<style>[|>])[-+0-9]*[ ]*(?:#[^\n]*)?\r?$",
+    re.MULTILINE,
+)
+
+
+def _load_libyaml(data: bytes) -> Any:
+    return yaml.load(data, Loader=yaml.CSafeLoader)
+
+
+def _load_python(data: bytes) -> Any:
+    return yaml.load(data, Loader=yaml.SafeLoader)
+
+
+def _load_json(data: bytes) -> Any:
+    return json.loads(data)
+
+
+def _load_ruamel(data: bytes) -> Any:
+    try:
+        from ruamel.yaml import YAML
+    except ImportError:
+        raise MkDocsActionYmlException(
+            "The 'ruamel' loader requires ruamel.yaml to be installed"
+        ) from None
+    # YAML instances are not thread-safe, so don't share one.
+    return YAML(typ="safe").load(data)
+
+
+def _load_selective(data: bytes) -> Any:
+    loader = yaml.CSafeLoader if default_loader() == "libyaml" else yaml.SafeLoader
+    _, node = _strip_steps(data, loader)
+    if node is not None:
+        return loader(b"").construct_document(node)
+    # Report errors, with their line numbers, as a full load does.
+    return yaml.load(data, Loader=loader)
+
+
+def strip_run_scripts(data: bytes) -> bytes:
+    """
+    Replace the contents of the `run:` block scalars of composite steps by empty strings.
+
+    Composite actions only need to know that a step runs a script, yet the scripts are often most
+    of the file, and scanning text is most of the cost of parsing YAML. Block scalars are found
+    with regular expressions, and the contents of the other ones are never searched. Scripts with
+    an anchor are kept, since they may be referenced elsewhere. Returns `data` itself when nothing
+    was stripped.
+    """
+    loader = yaml.CSafeLoader if default_loader() == "libyaml" else yaml.SafeLoader
+    return _strip_steps(data, loader)[0]
+
+
+def _strip_steps(data: bytes, loader: type) -> tuple[bytes, yaml.Node | None]:
+    """
+    Strip the scripts of `data`, and compose the result to make sure that only `runs.steps[*].run`
+    keys were stripped: a header found in other text, e.g. a quoted multi-line description, or a
+    `run` key elsewhere, is kept and the document stripped again. Returns the stripped document
+    and its node, or `data` and None when nothing could be stripped.
+    """
+    keep: set[int] = set()
+    while True:
+        stripped, lines = _strip(data, keep)
+        if not lines:
+            return data, None
+        try:
+            node = yaml.compose(stripped, Loader=loader)
+        except yaml.YAMLError:
+            return data, None
+        misplaced = lines - _script_lines(node)
+        if not misplaced:
+            return stripped, node
+        keep |= misplaced
+
+
+def _strip(data: bytes, keep: set[int]) -> tuple[bytes, set[int]]:
+    """Strip the `run:` block scalars whose header isn't on a line of `keep`; return their lines."""
+    if b"run:" not in data:
+        return data, set()
+    parts = []
+    position = 0
+    stripped: set[int] = set()
+    # Lines are counted up to `counted`, only for the headers of scripts.
+    line = counted = 0
+    while True:
+        indicator = _BLOCK_INDICATOR.search(data, position)
+        if indicator is None:
+            break
+        match = _BLOCK_HEADER.match(data, data.rfind(b"\n", 0, indicator.start()) + 1)
+        column = -1
+        if match is not None and match.end() == indicator.end():
+            key = match.group("key")
+            prefix = match.group("prefix").rstrip()
+            if key is not None:
+                column = match.start("key") - match.start()
+            elif prefix.endswith(b"-"):
+                column = len(prefix) - 1
+        if match is None or column < 0:
+            # Not a header, e.g. `a: b |` or a lone `|`, which are plain text.
+            parts.append(data[position : indicator.end()])
+            position = indicator.end()
+            continue
+        end = _block_end(column).search(data, match.end())
+        body_end = end.start() + 1 if end is not None else len(data)
+        script = key in (b"run", b'"run"', b"'run'") and b"&" not in match.group("properties")
+        if script:
+            line += data.count(b"\n", counted, match.start())
+            counted = match.start()
+        if script and line not in keep:
+            # Keep the line count, so that the marks of later nodes are unchanged.
+            parts.append(data[position : match.start("style")])
+            parts.append(b"''" + b"\n" * data.count(b"\n", match.end(), body_end))
+            stripped.add(line)
+        else:
+            parts.append(data[position:body_end])
+        position = body_end
+    if not stripped:
+        return data, stripped
+    parts.append(data[position:])
+    return b"".join(parts), stripped
+
+
+def _script_lines(node: yaml.Node) -> set[int]:
+    """Lines of the `run` keys of the steps of a composed action: the only ones to strip."""
+    lines = set()
+    steps = _item(_item(node, "runs"), "steps")
+    if isinstance(steps, yaml.SequenceNode):
+        for step in steps.value:
+            if isinstance(step, yaml.MappingNode):
+                lines.update(key.start_mark.line for key, _ in step.value if key.value == "run")
+    return lines
+
+
+def _item(node: yaml.Node | None, key: str) -> yaml.Node | None:
+    if isinstance(node, yaml.MappingNode):
+        for key_node, value in node.value:
+            if key_node.value == key:
+                return value
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _block_end(column: int) -> Pattern[bytes]:
+    """Find the end of a block scalar whose key or item is at `column`: a less indented line."""
+    # Starting with a newline lets the regex engine jump from line to line.
+    return re.compile(rb"\n(?![ ]{%d})(?=[ \t]*[^ \t\r\n])" % (column + 1))
+
+
+LOADERS: dict[str, Loader] = {
+    "libyaml": _load_libyaml,
+    "python": _load_python,
+    "selective": _load_selective,
+    "json": _load_json,
+    "ruamel": _load_ruamel,
+}
+
+
+def default_loader() -> str:
+    """Name of the fastest YAML loader available in this PyYAML build."""
+    return "libyaml" if getattr(yaml, "__with_libyaml__", False) else "python"
+
+
+def resolve_loader(name: str, path: str) -> str:
+    """
+    Turn a configured loader name into a concrete one.
+
+    `auto` picks the libyaml-based `CSafeLoader` when PyYAML was built with it and the pure-Python
+    `SafeLoader` otherwise, except for `.json` files, which are loaded as JSON metadata.
+    `selective` uses the same loader, after cutting the `run:` scripts of composite steps.
+    """
+    if name == "auto":
+        return "json" if path.endswith(".json") else default_loader()
+    if name not in LOADERS:
+        choices = ", ".join(["auto", *LOADERS])
+        raise MkDocsActionYmlException(f"Unknown loader {name!r}, expected one of: {choices}")
+    if name == "libyaml" and default_loader() != "libyaml":
+        raise MkDocsActionYmlException("The 'libyaml' loader requires PyYAML built with libyaml")
+    return name
+
+
+def load(data: bytes, loader: str) -> Any:
+    """Parse the contents of an action file with a resolved loader."""
+    return LOADERS[loader](data)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+from contextvars import ContextVar
+
+from . import _cache
+
+# Directories that relative paths are looked up in first, set by the MkDocs plugin for the page
+# being converted: the directory of the page, then the docs directory.
+search_dirs: ContextVar[tuple[str, ...]] = ContextVar("search_dirs", default=())
+
+
+def resolve_path(path: str, base_dir: str = "") -> str:
+    """
+    Resolve the relative path of an action file against the directory of the current page and the
+    docs directory, in that order, or else against `base_dir`, the working directory by default.
+
+    Whether a file exists in a directory is cached per directory and path, apart from glob matches,
+    until `clear_cache()` is called; the MkDocs plugin clears them at the start of every build.
+    """
+    if os.path.isabs(path):
+        return path
+    for directory in search_dirs.get():
+        candidate = _find(directory, path)
+        if candidate is not None:
+            return candidate
+    return os.path.join(base_dir, path) if base_dir else path
+
+
+def page_dirs(docs_dir: str, src_path: str) -> tuple[str, ...]:
+    """Return the `search_dirs` of a page, given its path relative to `docs_dir`."""
+    return (os.path.join(docs_dir, os.path.dirname(src_path)), docs_dir)
+
+
+def _find(directory: str, path: str) -> str | None:
+    def find() -> tuple[str | None, int]:
+        candidate = os.path.normpath(os.path.join(directory, path))
+        return (candidate if os.path.isfile(candidate) else None), len(candidate)
+
+    found: str | None = _cache.resolved.get_or_create((directory, path), find)[0]
+    return found
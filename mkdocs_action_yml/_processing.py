@@ -1,7 +1,162 @@
 from __future__ import annotations
 
+import functools
 import re
-from typing import Callable, Iterable, Iterator
+import shlex
+from typing import Callable, Iterable, Iterator, Mapping, Pattern, Sequence, Tuple, Union
+
+MARKER = ":::"
+
+_OPTION_RE = re.compile(r"^(?P<indent>\s+):(?P<key>[^:]+):(?:\s+(?P<value>.*))?")
+# The first line of a container whose content is indented: an admonition, a collapsible block, a
+# content tab or a list item.
+_CONTAINER_RE = re.compile(r"^[ \t]*(?:!!!|\?\?\?\+?|===[!+]?|[-*+]|\d+[.)])(?:[ \t]|$)")
+# Content is indented by a tab stop in its container, and a code block by another one.
+_TAB_LENGTH = 4
+
+Value = Union[str, bool, Tuple[str, ...]]
+
+
+def parse_value(text: str) -> Value:
+    """
+    Parse the value of an option line.
+
+    `true` and `false` are booleans, `[a, "b, c"]` is a tuple of strings, a quoted value is the
+    string between the quotes, and anything else is the rest of the line, spaces included.
+    """
+    text = text.strip()
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    try:
+        if text.startswith("[") and text.endswith("]"):
+            lexer = shlex.shlex(text[1:-1], posix=True)
+            lexer.whitespace = ","
+            lexer.whitespace_split = True
+            return tuple(item.strip() for item in lexer if item.strip())
+        if text[:1] in ("'", '"') and text[-1:] == text[:1]:
+            words = shlex.split(text)
+            if len(words) == 1:
+                return words[0]
+    except ValueError:
+        # Unbalanced quotes: keep the value as written.
+        pass
+    return text
+
+
+@functools.lru_cache(maxsize=None)
+def _header_pattern(titles: tuple[str, ...]) -> Pattern[str]:
+    # Longest first, so that a title is never shadowed by one of its prefixes.
+    alternatives = "|".join(re.escape(title) for title in sorted(titles, key=len, reverse=True))
+    return re.compile(rf"^(?P<indent>[ \t]*){MARKER} (?P<title>{alternatives})(?:\s|$)")
+
+
+class BlockScanner:
+    """
+    Find blocks of lines in the form of:
+
+    ::: <title>
+        :<key1>: <value>
+        :<key2>:
+        ...
+
+    for any of the registered titles, and replace them with the lines returned by the matching
+    handler, called as `handler(key1="<value1>", key2="", ...)`.
+
+    Blocks may be indented inside an admonition, a content tab or a list item. Their options must
+    then be indented further than the header, and the replacement lines are indented like the
+    header. An indented header anywhere else, e.g. in an indented code block showing how to write
+    a block, is left alone.
+    """
+
+    def __init__(self, handlers: Mapping[str, Callable[..., Iterable[str]]]) -> None:
+        self.handlers = dict(handlers)
+        self._header = _header_pattern(tuple(self.handlers))
+        self._markers = tuple(f"{MARKER} {title}" for title in self.handlers)
+
+    def has_marker(self, text: str) -> bool:
+        """Whether `text` may hold a block: most pages have none, and are not looked at further."""
+        return any(marker in text for marker in self._markers)
+
+    def process(self, lines: list[str]) -> list[str]:
+        """Replace the blocks of a page, returning `lines` itself when there is none."""
+        if not self.has_marker("\n".join(lines)):
+            return lines
+        return list(self._scan(lines))
+
+    def scan(self, lines: Iterable[str]) -> Iterator[str]:
+        if not isinstance(lines, (list, tuple)):
+            lines = list(lines)
+        if not self.has_marker("\n".join(lines)):
+            return iter(lines)
+        return self._scan(lines)
+
+    def _scan(self, lines: Sequence[str]) -> Iterator[str]:
+        header_match = self._header.match
+        option_match = _OPTION_RE.match
+        handler: Callable[..., Iterable[str]] | None = None
+        indent = ""
+        options: dict[str, Value] = {}
+
+        for index, line in enumerate(lines):
+            if handler is not None:
+                match = option_match(line)
+                if match is not None and _is_nested(match.group("indent"), indent):
+                    # New ':key:' or ':key: value' line, ingest it.
+                    options[match.group("key")] = parse_value(match.group("value") or "")
+                    continue
+
+                # Block is finished, flush it.
+                yield from _indented(handler(**options), indent)
+                handler = None
+
+            match = header_match(line) if MARKER in line else None
+            if match is not None and match.group("indent") and not _in_container(lines, index):
+                match = None
+            if match is not None:
+                # Block header, ingest it.
+                handler = self.handlers[match.group("title")]
+                indent = match.group("indent")
+                options = {}
+            else:
+                yield line
+
+        if handler is not None:
+            yield from _indented(handler(**options), indent)
+
+
+def _in_container(lines: Sequence[str], index: int) -> bool:
+    """
+    Whether the indented line `lines[index]` is content of a container rather than code: the
+    closest line above it that is indented less must start a container, one tab stop less.
+    """
+    width = _width(lines[index])
+    for previous in range(index - 1, -1, -1):
+        line = lines[previous]
+        if not line.strip():
+            continue
+        opener = _width(line)
+        if opener < width:
+            return (
+                _CONTAINER_RE.match(line) is not None
+                and opener + _TAB_LENGTH <= width < opener + 2 * _TAB_LENGTH
+            )
+    return False
+
+
+def _width(line: str) -> int:
+    """Return the width of the indentation of a line, tabs included."""
+    expanded = line.expandtabs(_TAB_LENGTH)
+    return len(expanded) - len(expanded.lstrip(" "))
+
+
+def _is_nested(option_indent: str, header_indent: str) -> bool:
+    return len(option_indent) > len(header_indent) and option_indent.startswith(header_indent)
+
+
+def _indented(lines: Iterable[str], indent: str) -> Iterable[str]:
+    if not indent:
+        return lines
+    return (indent + line if line else line for line in lines)
 
 
 def replace_blocks(
@@ -17,35 +172,16 @@ def replace_blocks(
 
     And replace them with the lines returned by `replace(key1="<value1>", key2="", ...)`.
     """
+    return BlockScanner({title: replace}).scan(lines)
 
-    options = {}
-    in_block_section = False
 
-    for line in lines:
-        if in_block_section:
-            match = re.search(r"^\s+:(?P<key>.+):(?:\s+(?P<value>\S+))?", line)
-            if match is not None:
-                # New ':key:' or ':key: value' line, ingest it.
-                key = match.group("key")
-                value = match.group("value") or ""
-                if value.lower() in ["true", "false"]:
-                    value = value.lower() == "true"
-                options[key] = value
-                continue
-
-            # Block is finished, flush it.
-            in_block_section = False
-            yield from replace(**options)
-            yield line
-            continue
+def find_blocks(lines: list[str], title: str) -> list[dict[str, Value]]:
+    """Return the options of every `::: <title>` block of a page, without rendering them."""
+    blocks: list[dict[str, Value]] = []
 
-        match = re.search(rf"^::: {title}", line)
-        if match is not None:
-            # Block header, ingest it.
-            in_block_section = True
-            options = {}
-        else:
-            yield line
+    def collect(**options: Value) -> list[str]:
+        blocks.append(options)
+        return []
 
-    if in_block_section:
-        yield from replace(**options)
+    BlockScanner({title: collect}).process(lines)
+    return blocks
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import functools
+import re
+from typing import Any, Callable, List, Tuple, Union
+
+import yaml
+
+from . import _loaders
+
+Path = Tuple[Union[str, int], ...]
+Errors = List[Tuple[Path, str]]
+Check = Callable[[Any, Path, Errors], None]
+
+_STRING: dict = {"type": "string"}
+_NODE_RUNS: dict = {
+    "type": "mapping",
+    "required": ["using", "main"],
+    "properties": {
+        "using": _STRING,
+        "main": _STRING,
+        "pre": _STRING,
+        "pre-if": _STRING,
+        "post": _STRING,
+        "post-if": _STRING,
+    },
+}
+
+# The GitHub action metadata syntax:
+# https://docs.github.com/en/actions/creating-actions/metadata-syntax-for-github-actions
+SCHEMA: dict = {
+    "type": "mapping",
+    "required": ["name", "description", "runs"],
+    "properties": {
+        "name": _STRING,
+        "author": _STRING,
+        "description": _STRING,
+        "inputs": {
+            "type": "mapping",
+            "values": {
+                "type": "mapping",
+                "properties": {
+                    "description": _STRING,
+                    "required": {"type": "boolean"},
+                    "default": {"type": "scalar"},
+                    "deprecationMessage": _STRING,
+                },
+            },
+        },
+        "outputs": {
+            "type": "mapping",
+            "values": {
+                "type": "mapping",
+                "properties": {"description": _STRING, "value": _STRING},
+            },
+        },
+        "runs": {
+            "type": "switch",
+            "key": "using",
+            "cases": {
+                r"node\d+": _NODE_RUNS,
+                "docker": {
+                    "type": "mapping",
+                    "required": ["using", "image"],
+                    "properties": {
+                        "using": _STRING,
+                        "image": _STRING,
+                        "args": {"type": "list", "items": {"type": "scalar"}},
+                        "entrypoint": _STRING,
+                        "env": {"type": "mapping", "values": {"type": "scalar"}},
+                        "pre-entrypoint": _STRING,
+                        "pre-if": _STRING,
+                        "post-entrypoint": _STRING,
+                        "post-if": _STRING,
+                    },
+                },
+                "composite": {
+                    "type": "mapping",
+                    "required": ["using", "steps"],
+                    "properties": {
+                        "using": _STRING,
+                        "steps": {
+                            "type": "list",
+                            "items": {
+                                "type": "mapping",
+                                "one_of": ["run", "uses"],
+                                "properties": {
+                                    "run": _STRING,
+                                    "uses": _STRING,
+                                    "shell": _STRING,
+                                    "name": _STRING,
+                                    "id": _STRING,
+                                    "if": {"type": "scalar"},
+                                    "with": {"type": "mapping", "values": {"type": "scalar"}},
+                                    "env": {"type": "mapping", "values": {"type": "scalar"}},
+                                    "working-directory": _STRING,
+                                    "continue-on-error": {"type": "scalar"},
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+        "branding": {
+            "type": "mapping",
+            "properties": {"icon": _STRING, "color": _STRING},
+        },
+    },
+}
+
+
+def _describe(value: Any) -> str:
+    if value is None:
+        return "nothing"
+    if isinstance(value, dict):
+        return "a mapping"
+    if isinstance(value, list):
+        return "a list"
+    return f"{type(value).__name__} {value!r}"
+
+
+def _compile(schema: dict, strict: bool) -> Check:
+    kind = schema["type"]
+
+    if kind in ("string", "boolean", "scalar"):
+        types: tuple = {
+            "string": (str,),
+            "boolean": (bool,),
+            "scalar": (str, int, float, bool, type(None)),
+        }[kind]
+        expected = {"string": "a string", "boolean": "a boolean", "scalar": "a scalar"}[kind]
+
+        def check_value(value: Any, path: Path, errors: Errors) -> None:
+            if not isinstance(value, types):
+                errors.append((path, f"expected {expected}, got {_describe(value)}"))
+
+        return check_value
+
+    if kind == "list":
+        check_item = _compile(schema["items"], strict)
+
+        def check_list(value: Any, path: Path, errors: Errors) -> None:
+            if not isinstance(value, list):
+                errors.append((path, f"expected a list, got {_describe(value)}"))
+                return
+            for index, item in enumerate(value):
+                check_item(item, (*path, index), errors)
+
+        return check_list
+
+    if kind == "switch":
+        key = schema["key"]
+        cases = [
+            (re.compile(rf"{pattern}\Z"), _compile(case, strict))
+            for pattern, case in schema["cases"].items()
+        ]
+        names = ", ".join(schema["cases"]).replace(r"node\d+", "node20")
+
+        def check_switch(value: Any, path: Path, errors: Errors) -> None:
+            if not isinstance(value, dict):
+                errors.append((path, f"expected a mapping, got {_describe(value)}"))
+                return
+            if key not in value:
+                errors.append((path, f"missing required key {key!r}"))
+                return
+            for pattern, check_case in cases:
+                if isinstance(value[key], str) and pattern.match(value[key]):
+                    check_case(value, path, errors)
+                    return
+            errors.append(((*path, key), f"expected one of {names}, got {_describe(value[key])}"))
+
+        return check_switch
+
+    properties = {
+        name: _compile(item, strict) for name, item in schema.get("properties", {}).items()
+    }
+    check_values = _compile(schema["values"], strict) if "values" in schema else None
+    required = tuple(schema.get("required", ()))
+    one_of = tuple(schema.get("one_of", ()))
+
+    def check_mapping(value: Any, path: Path, errors: Errors) -> None:
+        if not isinstance(value, dict):
+            errors.append((path, f"expected a mapping, got {_describe(value)}"))
+            return
+        for name in required:
+            if name not in value:
+                errors.append((path, f"missing required key {name!r}"))
+        if one_of and sum(name in value for name in one_of) != 1:
+            errors.append((path, f"expected exactly one of {', '.join(map(repr, one_of))}"))
+        for name, item in value.items():
+            check_property = properties.get(name, check_values)
+            if check_property is not None:
+                check_property(item, (*path, name), errors)
+            elif strict:
+                errors.append(((*path, name), f"unknown key {name!r}"))
+
+    return check_mapping
+
+
+@functools.lru_cache(maxsize=None)
+def validator(strict: bool = False) -> Check:
+    """
+    Return the validator of action metadata, compiled once from `SCHEMA`.
+
+    The strict validator also reports unknown keys.
+    """
+    return _compile(SCHEMA, strict)
+
+
+def validate(action: Any, strict: bool = False) -> Errors:
+    """Return the `(path, message)` of every error of loaded action metadata."""
+    errors: Errors = []
+    validator(strict)(action, (), errors)
+    return errors
+
+
+def _lines(data: bytes, wanted: set[Path]) -> dict[Path, int]:
+    """
+    Map the `wanted` paths of the nodes of a YAML (or JSON) document to their line numbers.
+
+    Only nodes on the way to a wanted path are visited, so aliased subtrees aren't expanded.
+    """
+    loader = yaml.CSafeLoader if _loaders.default_loader() == "libyaml" else yaml.SafeLoader
+    lines: dict[Path, int] = {}
+    try:
+        root = yaml.compose(data, Loader=loader)
+    except yaml.YAMLError:
+        return lines
+    stack: list[tuple[Path, Any]] = [((), root)]
+    while stack:
+        path, node = stack.pop()
+        if node is None or path not in wanted:
+            continue
+        lines[path] = node.start_mark.line + 1
+        if isinstance(node, yaml.MappingNode):
+            stack.extend(((*path, key.value), value) for key, value in node.value)
+        elif isinstance(node, yaml.SequenceNode):
+            stack.extend(((*path, index), item) for index, item in enumerate(node.value))
+    return lines
+
+
+def _format_path(path: Path) -> str:
+    text = ""
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else f".{part}" if text else str(part)
+    return text
+
+
+def format_errors(path: str, data: bytes, errors: Errors) -> list[str]:
+    """Format errors as `file:line: key.path: message`; lines are looked up only when needed."""
+    if not errors:
+        return []
+    lines = _lines(data, {path[:n] for path, _ in errors for n in range(len(path) + 1)})
+    messages = []
+    for error_path, message in errors:
+        line = next(
+            (
+                lines[error_path[:n]]
+                for n in range(len(error_path), -1, -1)
+                if error_path[:n] in lines
+            ),
+            None,
+        )
+        location = f"{path}:{line}" if line is not None else path
+        key = _format_path(error_path)
+        messages.append(f"{location}: {key}: {message}" if key else f"{location}: {message}")
+    return messages
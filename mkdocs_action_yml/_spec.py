@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import sys
+from typing import Any, NamedTuple, Sequence
+
+
+def _text(value: Any) -> str:
+    return sys.intern(f"{value}")
+
+
+class InputSpec(NamedTuple):
+    name: str
+    description: str
+    required: bool
+    default: str
+
+
+class OutputSpec(NamedTuple):
+    name: str
+    description: str
+    value: str
+
+
+class StepSpec(NamedTuple):
+    name: str
+    uses: str
+    run: bool
+    shell: str
+
+
+class ActionSpec(NamedTuple):
+    """
+    Normalized, immutable model of an action file.
+
+    Specs are built once per file by `from_dict()` and shared by every renderer. They are nested
+    tuples of interned strings and booleans, so they stay small when thousands of actions are kept
+    in memory, and `json`, `pickle` or `marshal` can store them as is; `from_data()` rebuilds a
+    spec from such a plain form. `inputs`, `outputs` and the `steps` of composite actions are
+    `None` when the action file doesn't have the key at all.
+    """
+
+    name: str
+    description: str
+    using: str
+    inputs: tuple[InputSpec, ...] | None
+    outputs: tuple[OutputSpec, ...] | None
+    steps: tuple[StepSpec, ...] | None = None
+
+    @classmethod
+    def from_dict(cls, action: dict) -> ActionSpec:
+        """Build a spec from a loaded action file."""
+        inputs = None
+        if "inputs" in action:
+            inputs = tuple(
+                InputSpec(
+                    _text(name),
+                    _text(input.get("description", "")),
+                    bool(input.get("required", False)),
+                    _text(input.get("default", "")),
+                )
+                for name, input in (action["inputs"] or {}).items()
+            )
+        outputs = None
+        if "outputs" in action:
+            outputs = tuple(
+                OutputSpec(
+                    _text(name),
+                    _text(output.get("description", "")),
+                    _text(output.get("value", "")),
+                )
+                for name, output in (action["outputs"] or {}).items()
+            )
+        runs = action["runs"]
+        steps = None
+        if "steps" in runs:
+            steps = tuple(
+                StepSpec(
+                    _text(step.get("name") or step.get("id") or ""),
+                    _text(step.get("uses", "")),
+                    "run" in step,
+                    _text(step.get("shell", "")),
+                )
+                for step in runs["steps"] or ()
+            )
+        return cls(
+            _text(action["name"]),
+            _text(action["description"]),
+            _text(runs.get("using", "")),
+            inputs,
+            outputs,
+            steps,
+        )
+
+    @classmethod
+    def from_data(cls, data: Sequence[Any]) -> ActionSpec:
+        """Rebuild a spec from its plain form, e.g. `json.loads(json.dumps(spec))`."""
+        name, description, using, inputs, outputs, *rest = data
+        steps = rest[0] if rest else None
+        return cls(
+            _text(name),
+            _text(description),
+            _text(using),
+            None if inputs is None else tuple(InputSpec(*map(_field, i)) for i in inputs),
+            None if outputs is None else tuple(OutputSpec(*map(_field, o)) for o in outputs),
+            None if steps is None else tuple(StepSpec(*map(_field, s)) for s in steps),
+        )
+
+
+def _field(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
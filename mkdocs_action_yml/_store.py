@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any
+
+from .__version__ import __version__
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rendered (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    atime REAL NOT NULL
+)
+"""
+
+
+def render_key(source: bytes, owner: str, version: str, options: dict[str, Any]) -> str:
+    """Content address of a rendered block: the action bytes and everything shaping the output."""
+    digest = hashlib.sha256()
+    header = json.dumps([__version__, owner, version, options], sort_keys=True, default=str)
+    digest.update(header.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(source)
+    return digest.hexdigest()
+
+
+class RenderStore:
+    """
+    Persistent, content-addressed store of rendered blocks backed by SQLite, holding any value
+    that can be serialized to JSON.
+
+    The database lives in `cache_dir` and can be shared by several processes at once: SQLite's
+    write-ahead log lets readers proceed while a writer holds the lock, and writers wait up to
+    `timeout` seconds for each other. Least recently used entries are evicted once the stored
+    (compressed) payloads exceed `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024, timeout: float = 30.0):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "mkdocs-action-yml.sqlite3")
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        self._pid = os.getpid()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # Connections inherited from a parent process must not be used by the child: SQLite
+            # locks and caches belong to the process that opened them.
+            self._local = threading.local()
+            self._pid = os.getpid()
+        # sqlite3 connections may not be shared between threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any:
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM rendered WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            conn.execute("UPDATE rendered SET atime = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.OperationalError:
+            # Refreshing the access time is best effort; a busy database must not fail a build.
+            pass
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, data: Any) -> None:
+        value = zlib.compress(json.dumps(data).encode("utf-8"))
+        if len(value) > self.max_bytes:
+            return
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO rendered (key, value, size, atime) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()),
+            )
+            self._evict(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM rendered").fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        for key, size in conn.execute("SELECT key, size FROM rendered ORDER BY atime").fetchall():
+            conn.execute("DELETE FROM rendered WHERE key = ?", (key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM rendered")
+
+    def __len__(self) -> int:
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM rendered").fetchone()
+        return int(count)
+
+
+_stores: dict[tuple[str, int], RenderStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(cache_dir: str, max_bytes: int) -> RenderStore:
+    """Return the process-wide store for `cache_dir`, opening it on first use."""
+    key = (os.path.abspath(cache_dir), max_bytes)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = RenderStore(key[0], max_bytes=max_bytes)
+        return store
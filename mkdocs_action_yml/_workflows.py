@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import os
+import posixpath
+from typing import Iterator, NamedTuple
+
+import yaml
+
+from . import _cache, _loaders
+from ._exceptions import MkDocsActionYmlException
+from ._git import find_root
+
+WORKFLOWS = os.path.join(".github", "workflows")
+
+
+class WorkflowStep(NamedTuple):
+    """A step of a workflow that uses an action, with its source."""
+
+    workflow: str
+    job: str
+    uses: str
+    snippet: str
+
+
+class WorkflowIndex(NamedTuple):
+    """The steps of the workflows of a repository, by normalized `uses:` target."""
+
+    identity: tuple
+    steps: dict[str, tuple[WorkflowStep, ...]]
+
+
+def workflow_root(path: str) -> str:
+    """Return the root of the repository of an action file, or the working directory."""
+    try:
+        return find_root(os.path.dirname(os.path.abspath(path)))
+    except MkDocsActionYmlException:
+        return os.getcwd()
+
+
+def workflow_files(root: str) -> list[str]:
+    """
+    Return the workflow files of a repository.
+
+    Like glob matches, the list is cached until `clear_cache()` is called; the MkDocs plugin
+    clears it at the start of every build.
+    """
+    directory = os.path.join(root, WORKFLOWS)
+
+    def list_files() -> tuple[list[str], int]:
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            names = []
+        paths = [
+            os.path.join(directory, name) for name in names if name.endswith((".yml", ".yaml"))
+        ]
+        return paths, sum(map(len, paths))
+
+    return list(_cache.discovered.get_or_create(("workflows", root), list_files)[0])
+
+
+def workflow_index(root: str) -> WorkflowIndex:
+    """
+    Index the steps of every workflow of a repository on the action they use.
+
+    The index is built once per build, like the list of workflow files, and shared by every block.
+    The steps of each file are cached while the file is unchanged, so building the index again
+    only reads the files modified since.
+    """
+
+    def build() -> tuple[WorkflowIndex, int]:
+        identity = []
+        steps: dict[str, list[WorkflowStep]] = {}
+        for path in workflow_files(root):
+            try:
+                key = _cache.file_key(path)
+            except OSError:
+                continue
+            identity.append(key)
+            for step in _scan_file(path, root, key):
+                steps.setdefault(normalize_uses(step.uses), []).append(step)
+        index = WorkflowIndex(tuple(identity), {k: tuple(v) for k, v in steps.items()})
+        return index, sum(len(step.snippet) for found in steps.values() for step in found)
+
+    index: WorkflowIndex = _cache.discovered.get_or_create(("workflow-index", root), build)[0]
+    return index
+
+
+def workflow_identity(path: str) -> tuple:
+    """Identify the workflows of the repository of an action file, as last indexed."""
+    return workflow_index(workflow_root(path)).identity
+
+
+def normalize_uses(uses: str) -> str:
+    """
+    Normalize a `uses:` target for lookups: the `@ref` is dropped, local paths are normalized, and
+    the owner and repository of remote actions are lowercased, since GitHub ignores their case.
+    """
+    if uses.startswith("./"):
+        return "./" + posixpath.normpath(uses)
+    parts = uses.partition("@")[0].split("/", 2)
+    parts[:2] = [part.lower() for part in parts[:2]]
+    return "/".join(parts)
+
+
+def find_examples(path: str, owner: str, limit: int) -> list[WorkflowStep]:
+    """
+    Return up to `limit` workflow steps of the repository of an action file that use it, either as
+    a local action (`./path/to/action`) or as a remote action of `owner`.
+
+    `owner` may be `user` or `user/repo`; with only a user, any repository of the user matches.
+    """
+    root = workflow_root(path)
+    directory = os.path.relpath(os.path.dirname(os.path.abspath(path)), root)
+    directory = posixpath.normpath(directory.replace(os.sep, "/"))
+    subpath = "" if directory == "." else directory
+    owner = owner.lower().strip("/")
+
+    found: list[WorkflowStep] = []
+    for target, steps in workflow_index(root).steps.items():
+        if target == f"./{directory}" or _is_remote_match(target, owner, subpath):
+            found.extend(steps)
+    found.sort(key=lambda step: step.workflow)
+    return found[:limit]
+
+
+def _is_remote_match(target: str, owner: str, subpath: str) -> bool:
+    if target.startswith("./"):
+        return False
+    parts = target.split("/", 2)
+    if len(parts) < 2:
+        return False
+    name = "/".join(parts[:2]) if "/" in owner else parts[0]
+    return name == owner and (parts[2] if len(parts) > 2 else "") == subpath
+
+
+def _scan_file(path: str, root: str, key: tuple) -> tuple[WorkflowStep, ...]:
+    """Return the steps of a workflow file that use an action, cached while it is unchanged."""
+
+    def scan() -> tuple[tuple[WorkflowStep, ...], int]:
+        with open(path, "rb") as f:
+            data = f.read()
+        name = os.path.relpath(path, root).replace(os.sep, "/")
+        return tuple(_steps(name, data.decode("utf-8", "replace"))), len(data)
+
+    steps: tuple[WorkflowStep, ...] = _cache.workflows.get_or_create((*key, root), scan)[0]
+    return steps
+
+
+def _steps(name: str, text: str) -> Iterator[WorkflowStep]:
+    loader = yaml.CSafeLoader if _loaders.default_loader() == "libyaml" else yaml.SafeLoader
+    try:
+        document = yaml.compose(text, Loader=loader)
+    except yaml.YAMLError:
+        return
+    jobs = _get(document, "jobs")
+    if not isinstance(jobs, yaml.MappingNode):
+        return
+    lines = text.splitlines()
+    for job_key, job in jobs.value:
+        steps = _get(job, "steps")
+        if not isinstance(steps, yaml.SequenceNode):
+            continue
+        for step in steps.value:
+            uses = _get(step, "uses")
+            if isinstance(uses, yaml.ScalarNode) and not uses.value.startswith("docker://"):
+                yield WorkflowStep(name, job_key.value, uses.value, _snippet(lines, step))
+
+
+def _get(node: yaml.Node | None, key: str) -> yaml.Node | None:
+    if isinstance(node, yaml.MappingNode):
+        for key_node, value in node.value:
+            if key_node.value == key:
+                return value
+    return None
+
+
+def _snippet(lines: list[str], node: yaml.Node) -> str:
+    """Return the source of a step as a list item, dedented."""
+    start, column = node.start_mark.line, node.start_mark.column
+    end = node.end_mark.line
+    # A block mapping ends where the next token starts, usually the `-` of the next step.
+    if end < len(lines) and lines[end][: node.end_mark.column].strip():
+        end += 1
+    body = [lines[start][column:]]
+    body.extend(
+        line[column:] if not line[:column].strip() else line for line in lines[start + 1 : end]
+    )
+    while len(body) > 1 and (not body[-1].strip() or body[-1].lstrip().startswith("#")):
+        body.pop()
+    return "\n".join(["- " + body[0], *("  " + line if line else line for line in body[1:])])
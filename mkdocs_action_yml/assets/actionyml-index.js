@@ -0,0 +1,121 @@
+// Render the inputs and outputs tables of the `index` output of mkdocs-action-yml from the JSON
+// index of each action, which lives next to this script. Rows are added in batches, and can be
+// filtered, so that actions with hundreds of inputs stay light.
+(function () {
+  "use strict";
+
+  var BATCH = 100;
+  var HEADERS = {
+    inputs: ["Input", "Description", "Default"],
+    outputs: ["Output", "Description"],
+  };
+  var script = document.currentScript;
+  var base = script ? script.src : document.baseURI;
+  var indexes = {};
+
+  function load(name) {
+    var url = new URL(name, base).href;
+    if (!indexes[url]) {
+      indexes[url] = fetch(url).then(function (response) {
+        if (!response.ok) {
+          throw new Error(response.status + " " + response.statusText);
+        }
+        return response.json();
+      });
+    }
+    return indexes[url];
+  }
+
+  function cells(section, row) {
+    if (section === "inputs") {
+      return [row[0], "[" + (row[2] ? "required" : "optional") + "] " + row[1], row[3]];
+    }
+    return [row[0], row[1]];
+  }
+
+  function render(element, index) {
+    var section = element.getAttribute("data-section");
+    var rows = index[section].map(function (row) {
+      return cells(section, row);
+    });
+    var matches = rows;
+    var shown = 0;
+
+    var filter = document.createElement("input");
+    filter.type = "search";
+    filter.className = "actionyml-filter";
+    filter.placeholder = "Filter " + rows.length + " " + section;
+    var table = document.createElement("table");
+    var header = table.createTHead().insertRow();
+    HEADERS[section].forEach(function (text) {
+      var cell = document.createElement("th");
+      cell.textContent = text;
+      header.appendChild(cell);
+    });
+    var body = table.createTBody();
+    var more = document.createElement("button");
+    more.type = "button";
+    more.className = "actionyml-more";
+
+    function show() {
+      matches.slice(shown, shown + BATCH).forEach(function (row) {
+        var tr = body.insertRow();
+        row.forEach(function (text, column) {
+          var cell = tr.insertCell();
+          if (section === "inputs" && column === 2) {
+            var code = document.createElement("code");
+            code.textContent = text;
+            cell.appendChild(code);
+          } else {
+            cell.textContent = text;
+          }
+        });
+      });
+      shown = Math.min(shown + BATCH, matches.length);
+      more.hidden = shown >= matches.length;
+      more.textContent = "Show more (" + (matches.length - shown) + " left)";
+    }
+
+    filter.addEventListener("input", function () {
+      var query = filter.value.toLowerCase();
+      matches = rows.filter(function (row) {
+        return row.join("\n").toLowerCase().indexOf(query) !== -1;
+      });
+      body.textContent = "";
+      shown = 0;
+      show();
+    });
+    more.addEventListener("click", show);
+
+    element.textContent = "";
+    element.appendChild(filter);
+    element.appendChild(table);
+    element.appendChild(more);
+    show();
+  }
+
+  function init() {
+    var elements = document.querySelectorAll(".actionyml-index:not([data-loaded])");
+    Array.prototype.forEach.call(elements, function (element) {
+      var name = element.getAttribute("data-index");
+      element.setAttribute("data-loaded", "");
+      load(name).then(
+        function (index) {
+          render(element, index);
+        },
+        function (error) {
+          element.textContent = "Can't load " + name + ": " + error.message;
+        }
+      );
+    });
+  }
+
+  if (window.document$ && window.document$.subscribe) {
+    // Material for MkDocs replaces the page content without reloading the scripts.
+    window.document$.subscribe(init);
+  } else if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", init);
+  } else {
+    init();
+  }
+})();
@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Iterable
+
+from mkdocs.config import config_options
+from mkdocs.exceptions import PluginError
+from mkdocs.plugins import BasePlugin
+from mkdocs.structure.files import File
+
+from . import _cache
+from ._bulk import _write_if_changed, expand_paths, output_name
+from ._docs import check_files, load_index
+from ._index import INDEX_DIR, SCRIPT, script_path
+from ._instrument import current_page, recorder
+from ._paths import page_dirs, search_dirs
+from ._processing import find_blocks
+from ._workflows import workflow_files, workflow_root
+from .plugin import (
+    ActionYmlExtension,
+    FileErrors,
+    RenderedBlock,
+    block_key,
+    block_label,
+    block_limits,
+    block_paths,
+    block_ref,
+    is_current,
+    render_block,
+    rendered_block,
+    rendered_files,
+    resolve_options,
+)
+
+log = logging.getLogger(f"mkdocs.plugins.{__name__}")
+
+TITLE = "mkdocs-action-yml"
+# Names under which the Markdown extension may be listed in `markdown_extensions`.
+EXTENSION_NAMES = ("mkdocs-action-yml", "mkdocs_action_yml", "mkdocs_action_yml.plugin")
+
+
+class ActionYmlPlugin(BasePlugin):
+    """
+    Pre-render every `mkdocs-action-yml` block of the site in parallel before pages are built.
+
+    The Markdown extension then finds the rendered blocks in the process-wide cache, instead of
+    parsing and rendering them one page at a time as MkDocs reaches each page.
+
+    Relative paths of blocks are resolved against the directory of their page, then the docs
+    directory, and only then against the `base_dir` of the extension or the working directory.
+
+    The plugin also records which pages embed which action files. During `mkdocs serve`, the
+    action files are watched, so that editing one triggers a rebuild in which only the pages that
+    embed it render their blocks again.
+
+    Every action file is validated against the action metadata schema before any page is built.
+    In `strict` mode, all errors are reported at once and stop the build; in `lenient` mode they
+    are logged as warnings.
+
+    The workflow files that usage examples are taken from are watched too. They are indexed once
+    per build, and only the files modified since the last build are read again.
+
+    With the `index` output of the extension, the JSON index of every documented action and the
+    script that renders their tables are written to the site at the end of the build.
+
+    With `pages`, a virtual page is added to the site for every action file matching the patterns,
+    unless the docs already have a page with the same name. Its content is a single block, so the
+    action is only loaded and rendered when MkDocs builds the page; these blocks are neither
+    pre-rendered nor validated up front.
+    """
+
+    config_scheme = (
+        ("workers", config_options.Type(int, default=0)),
+        ("executor", config_options.Choice(("thread", "process"), default="thread")),
+        ("report", config_options.Type(str, default="")),
+        ("report_top", config_options.Type(int, default=10)),
+        ("trace_memory", config_options.Type(bool, default=False)),
+        ("validate", config_options.Choice(("strict", "lenient", "off"), default="lenient")),
+        ("pages", config_options.Type(list, default=[])),
+        ("pages_dir", config_options.Type(str, default="actions")),
+        ("pages_owner", config_options.Type(str, default="")),
+        ("pages_version", config_options.Type(str, default="main")),
+        ("pages_nav", config_options.Type(str, default="")),
+    )
+
+    def __init__(self) -> None:
+        self.dependents: dict[str, set[str]] = {}
+        self._server: Any = None
+        self._watched: set[str] = set()
+        self._indexed: dict[tuple[str, str | None], None] = {}
+
+    def on_startup(self, command: str, dirty: bool) -> None:
+        # Keep the plugin, and its dependency graph, across the rebuilds of `mkdocs serve`.
+        pass
+
+    def on_config(self, config: Any) -> Any:
+        if self.config["pages"]:
+            if not self.config["pages_owner"]:
+                raise PluginError("Option 'pages_owner' is required to generate pages")
+            if not hasattr(File, "generated"):
+                # Pages that aren't read from the docs directory came with MkDocs 1.6.
+                raise PluginError("Option 'pages' requires MkDocs 1.6 or later")
+            if not any(_is_extension(entry) for entry in config["markdown_extensions"]):
+                # The generated pages are made of blocks.
+                config["markdown_extensions"].append(ActionYmlExtension())
+        self.extension_config = extension_config(config)
+        # Glob matches and resolved paths are cached for one build, files may have been added since
+        # the last one.
+        _cache.discovered.clear()
+        _cache.resolved.clear()
+        if self.extension_config["output"] == "index":
+            script = f"{INDEX_DIR}/{SCRIPT}"
+            if script not in config["extra_javascript"]:
+                config["extra_javascript"].append(script)
+        if self.config["report"]:
+            recorder.reset()
+            recorder.enable(trace_memory=self.config["trace_memory"])
+        return config
+
+    def on_files(self, files: Any, config: Any) -> Any:
+        blocks = []
+        pages: list[tuple[str, dict[str, Any]]] = []
+        for file in files.documentation_pages():
+            # Resolve paths as the Markdown extension does when the page is converted.
+            token = search_dirs.set(page_dirs(config["docs_dir"], file.src_path))
+            try:
+                base_dir = self.extension_config["base_dir"]
+                page_blocks = [resolve_options(options, base_dir) for options in _read_blocks(file)]
+            finally:
+                search_dirs.reset(token)
+            blocks.extend(page_blocks)
+            pages.extend((file.src_path, options) for options in page_blocks)
+        generated = self._generate_pages(files, config)
+        # Action files are parsed by the workers; the local actions of composite actions are only
+        # known once their blocks are rendered.
+        prerender(
+            self.extension_config,
+            blocks,
+            workers=self.config["workers"] or None,
+            executor=self.config["executor"],
+        )
+
+        dependents: dict[str, set[str]] = defaultdict(set)
+        # The errors of the files of rendered blocks come with them; the others are parsed again.
+        to_validate: dict[str, FileErrors | None] = {}
+        indexed: dict[tuple[str, str | None], None] = {}
+        for src_path, options in pages:
+            if "path" not in options and "glob" not in options:
+                continue
+            paths = rendered_files(self.extension_config, options)
+            watched = list(paths)
+            if options.get("examples", False) is not False:
+                for root in {workflow_root(path) for path in paths}:
+                    watched.extend(workflow_files(root))
+            for path in watched:
+                dependents[os.path.abspath(path)].add(src_path)
+            if "ref" not in options:
+                block = rendered_block(self.extension_config, options)
+                for errors in block.errors if block is not None else ():
+                    to_validate[errors[0]] = errors
+                for path in paths:
+                    to_validate.setdefault(path, None)
+            if self.extension_config["output"] == "index":
+                indexed.update(dict.fromkeys(_indexed_files(options)))
+        for path, file in generated:
+            dependents[os.path.abspath(path)].add(file.src_path)
+            if self.extension_config["output"] == "index":
+                # The block of the page documents the working tree file.
+                indexed[(os.path.abspath(path), None)] = None
+        self.dependents = dict(dependents)
+        self._indexed = indexed
+        self._watch()
+        self._validate(list(to_validate.items()))
+        return files
+
+    def _generate_pages(self, files: Any, config: Any) -> list[tuple[str, ActionPageFile]]:
+        """Add a virtual page to `files` for every action file matching the `pages` patterns."""
+        generated = []
+        for path in expand_paths(self.config["pages"]):
+            src_uri = f"{self.config['pages_dir'].strip('/')}/{output_name(path)}".lstrip("/")
+            src_uri = src_uri.replace(os.sep, "/")
+            if files.get_file_from_path(src_uri) is not None:
+                log.debug(f"Not generating {src_uri}, which already exists")
+                continue
+            file = ActionPageFile.for_action(config, src_uri, path, self._page_content(path))
+            files.append(file)
+            generated.append((path, file))
+        if generated and self.config["pages_nav"] and config["nav"] is not None:
+            section = {self.config["pages_nav"]: [file.src_uri for _, file in generated]}
+            config["nav"] = [*config["nav"], section]
+        return generated
+
+    def _page_content(self, path: str) -> str:
+        options = {
+            "path": os.path.abspath(path),
+            "owner": self.config["pages_owner"],
+            "version": self.config["pages_version"],
+        }
+        return "\n".join([f"::: {TITLE}", *(f"    :{k}: {v}" for k, v in options.items()), ""])
+
+    def _validate(self, paths: list[tuple[str, FileErrors | None]]) -> None:
+        mode = self.config["validate"]
+        if mode == "off" or not paths:
+            return
+        start = time.perf_counter()
+        with recorder.measure("validate") as record:
+            loader = self.extension_config["loader"]
+            limits = block_limits(self.extension_config)
+            strict = mode == "strict"
+            messages = []
+            for path, errors in paths:
+                if errors is None:
+                    messages.extend(check_files([path], loader, strict, limits))
+                else:
+                    messages.extend(path + message for message in errors[2 if strict else 1])
+            record["files"] = len(paths)
+            record["parsed"] = sum(errors is None for _, errors in paths)
+        log.debug(f"Validated {len(paths)} action files in {time.perf_counter() - start:.2f}s")
+        if messages and mode == "strict":
+            raise PluginError("Invalid action files:\n" + "\n".join(messages))
+        for message in messages:
+            log.warning(message)
+
+    def on_page_markdown(self, markdown: str, page: Any, config: Any, files: Any) -> str:
+        current_page.set(page.file.src_path)
+        search_dirs.set(page_dirs(config["docs_dir"], page.file.src_path))
+        return markdown
+
+    def on_post_build(self, config: Any) -> None:
+        current_page.set(None)
+        search_dirs.set(())
+        if self.extension_config["output"] == "index":
+            self._write_indexes(config["site_dir"])
+        if not self.config["report"]:
+            return
+        recorder.write_report(self.config["report"])
+        log.info(f"mkdocs-action-yml report written to {self.config['report']}")
+        for line in recorder.summary(self.config["report_top"]):
+            log.info(line)
+        recorder.disable()
+
+    def _write_indexes(self, site_dir: str) -> None:
+        directory = os.path.join(site_dir, *INDEX_DIR.split("/"))
+        with open(script_path(), "rb") as f:
+            _write_if_changed(os.path.join(directory, SCRIPT), f.read())
+        written = 0
+        for path, ref in self._indexed:
+            try:
+                index = load_index(
+                    path, self.extension_config["loader"], ref, block_limits(self.extension_config)
+                )
+            except Exception:
+                # The page build already reported the error.
+                continue
+            if _write_if_changed(os.path.join(directory, index.name), index.data):
+                written += 1
+        log.debug(f"Wrote {written} of {len(self._indexed)} action indexes to {directory}")
+
+    def on_serve(self, server: Any, config: Any, builder: Any) -> Any:
+        self._server = server
+        self._watch()
+        return server
+
+    def _watch(self) -> None:
+        if self._server is None:
+            return
+        for path in self.dependents.keys() - self._watched:
+            if os.path.exists(path):
+                self._server.watch(path)
+                self._watched.add(path)
+
+
+class ActionPageFile(File):
+    """
+    A virtual page documenting an action file.
+
+    The page is only modified when the action file is, so that dirty builds skip the pages of
+    unchanged actions.
+    """
+
+    action_path: str
+
+    @classmethod
+    def for_action(cls, config: Any, src_uri: str, path: str, content: str) -> ActionPageFile:
+        file = cls.generated(config, src_uri, content=content)
+        assert isinstance(file, ActionPageFile)
+        file.action_path = path
+        return file
+
+    def is_modified(self) -> bool:
+        try:
+            return os.path.getmtime(self.abs_dest_path) < os.path.getmtime(self.action_path)
+        except OSError:
+            return True
+
+
+def extension_config(config: Any) -> dict[str, Any]:
+    """Return the settings of the Markdown extension as configured in `mkdocs.yml`."""
+    mdx_configs = config["mdx_configs"]
+    for name in EXTENSION_NAMES:
+        if name in mdx_configs:
+            return ActionYmlExtension(**mdx_configs[name]).getConfigs()
+    return ActionYmlExtension().getConfigs()
+
+
+def _is_extension(entry: Any) -> bool:
+    return entry in EXTENSION_NAMES or isinstance(entry, ActionYmlExtension)
+
+
+def _indexed_files(options: dict[str, Any]) -> list[tuple[str, str | None]]:
+    """Return the action files, and git refs, whose JSON index a block refers to."""
+    try:
+        ref = block_ref(options)
+        return [(path, ref) for path in block_paths(options)]
+    except Exception:
+        return []
+
+
+def _read_blocks(file: File) -> list[dict[str, Any]]:
+    if file.abs_src_path is None:
+        # Generated by another plugin.
+        return find_blocks(file.content_string.splitlines(), TITLE)
+    with open(file.abs_src_path, encoding="utf-8-sig", errors="replace") as f:
+        return find_blocks(f.read().splitlines(), TITLE)
+
+
+def _render_blocks(
+    config: dict[str, Any], blocks: list[dict[str, Any]]
+) -> list[tuple[dict[str, Any], RenderedBlock]]:
+    results = []
+    for options in blocks:
+        with recorder.measure("block", path=block_label(options), prerendered=True) as record:
+            block = render_block(config, **options)
+            record["lines"] = len(block.lines)
+        results.append((options, block))
+    return results
+
+
+def prerender(
+    config: dict[str, Any],
+    blocks: Iterable[dict[str, Any]],
+    workers: int | None = None,
+    executor: str = "thread",
+) -> int:
+    """
+    Render blocks into the process-wide cache with a pool of `workers` threads or processes.
+
+    Blocks are deduplicated and grouped by action file (or set of files, for glob blocks), so each
+    file is parsed by a single worker.
+    Blocks that fail to render are skipped here; the error is raised again, with the page that
+    contains the block, when the page is built. Returns the number of blocks rendered.
+    """
+    start = time.perf_counter()
+    by_file: dict[tuple, list[dict[str, Any]]] = defaultdict(list)
+    seen = set()
+    for options in blocks:
+        if ("path" not in options and "glob" not in options) or "owner" not in options:
+            continue
+        try:
+            key = block_key(config, options)
+            if key in seen or (key in _cache.rendered and _is_rendered(key, options)):
+                continue
+        except Exception:
+            continue
+        seen.add(key)
+        by_file[key[0]].append(options)
+
+    if not by_file:
+        return 0
+
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=workers)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count())
+
+    rendered = 0
+    with pool:
+        futures = [pool.submit(_render_blocks, config, group) for group in by_file.values()]
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                log.debug(f"Pre-rendering failed, deferring to page build: {e}")
+                continue
+            for options, block in results:
+                size = sum(map(len, block.lines))
+                _cache.rendered.put(block_key(config, options), block, size=size)
+                rendered += 1
+
+    log.debug(
+        f"Pre-rendered {rendered} blocks of {len(by_file)} action files "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return rendered
+
+
+def _is_rendered(key: tuple, options: dict[str, Any]) -> bool:
+    block = _cache.rendered.get(key)
+    return block is not None and is_current(block, block_ref(options))
@@ -1,13 +1,66 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Iterable, Iterator
+import functools
+import hashlib
+import logging
+import marshal
+import os
+import zlib
+from contextvars import ContextVar
+from typing import Any, Callable, Hashable, Iterable, Iterator, NamedTuple, Tuple
 
 from markdown.extensions import Extension
 from markdown.preprocessors import Preprocessor
 
-from ._docs import make_action_docs
-from ._exceptions import MkDocsActionYmlException
-from ._processing import replace_blocks
+from . import _cache
+from ._catalog import discover, make_catalog_docs
+from ._changelog import changelog_identity, make_changelog_docs
+from ._composite import local_actions
+from ._docs import (
+    RAW_HTML,
+    file_errors,
+    load_action,
+    make_action_docs,
+    read_source,
+    select_sections,
+    source_key,
+)
+from ._exceptions import LimitExceeded, MkDocsActionYmlException
+from ._instrument import current_page, recorder
+from ._limits import Limits, within_budget
+from ._paths import resolve_path, search_dirs
+from ._processing import BlockScanner
+from ._store import get_store, render_key
+from ._workflows import find_examples, workflow_identity, workflow_index, workflow_root
+
+log = logging.getLogger(f"mkdocs.plugins.{__name__}")
+
+# Number of workflow steps shown by `:examples:` without a value.
+DEFAULT_EXAMPLES = 3
+# Start of the line standing for a block that exceeds a resource limit.
+PLACEHOLDER = "> **This block was not rendered:**"
+# Raw deflate window (4 KiB) and memory level of the memoized pages.
+_MEMO_WBITS = 12
+_MEMO_MEMLEVEL = 2
+
+# Local action files used by the blocks replaced in the current context, collected by
+# `ActionYmlPreprocessor` for its page memo.
+local_files: ContextVar[list[str] | None] = ContextVar("local_files", default=None)
+
+
+# The path of an action file, and the messages of its schema errors, see `file_errors`.
+FileErrors = Tuple[str, Tuple[str, ...], Tuple[str, ...]]
+
+
+class RenderedBlock(NamedTuple):
+    """
+    The lines of a block, the local actions they describe with their identity, and the schema
+    errors of every action file of the block, as returned by `file_errors`.
+    """
+
+    lines: list[str]
+    local: tuple[tuple[str, tuple], ...] = ()
+    errors: tuple[FileErrors, ...] = ()
 
 
 class ActionYmlExtension(Extension):
@@ -19,42 +72,564 @@ class ActionYmlExtension(Extension):
         :owner: athackst
         :version: v0.1.1
 
-    by Markdown documentation generated from the specified action.yml.
+    by Markdown documentation generated from the specified action.yml, and blocks like
+
+    ::: mkdocs-action-yml-changelog
+        :path: action.yml
+        :versions: v1.0.0..v2.0.0
+
+    by a table of the changes of the action between these versions.
     """
 
+    def __init__(self, **kwargs: Any) -> None:
+        self.config = {
+            "base_dir": [
+                "",
+                "Directory that relative paths are resolved against, after the page and docs "
+                "directories; the working directory by default",
+            ],
+            "cache_dir": ["", "Directory of a persistent cache of rendered blocks"],
+            "cache_max_bytes": [256 * 1024 * 1024, "Size limit of the persistent cache in bytes"],
+            "loader": ["auto", "Loader of action files: auto, libyaml, python, json or ruamel"],
+            "output": [
+                "markdown",
+                "Output of tables and usage examples: markdown, html or index",
+            ],
+            "max_bytes": [4 * 1024 * 1024, "Size limit of action files in bytes, 0 for none"],
+            "max_nodes": [
+                500_000,
+                "Limit of the nodes of action files, aliases expanded, 0 for none",
+            ],
+            "max_aliases": [10_000, "Limit of the aliases used by action files, 0 for none"],
+            "timeout": [60.0, "Time limit to render a block in seconds, 0 for none"],
+        }
+        super().__init__(**kwargs)
+
     def extendMarkdown(self, md: Any) -> None:
         md.registerExtension(self)
-        md.preprocessors.register(
-            ActionYmlPreprocessor(md, replace_func=replace_command_docs), "actionyml", 142
+        config = self.getConfigs()
+        replace_func = functools.partial(replace_command_docs, config)
+        preprocessor = ActionYmlPreprocessor(
+            md,
+            replace_func=replace_func,
+            changelog_func=functools.partial(replace_changelog_docs, config),
+            memo_key=repr(sorted(config.items())),
+            raw_html=config["output"] != "markdown",
+            base_dir=config["base_dir"],
         )
+        md.preprocessors.register(preprocessor, "actionyml", 142)
+        if preprocessor.raw_html:
+            # After `normalize_whitespace`, which would strip the placeholders of the stash.
+            md.preprocessors.register(RawHtmlPreprocessor(md, preprocessor), "actionyml_html", 25)
 
 
 class ActionYmlPreprocessor(Preprocessor):
-    def __init__(self, md: Any, replace_func: Callable[..., Iterable[str]]) -> None:
+    """
+    Replace the blocks of a page.
+
+    With a `memo_key`, the output of each page is memoized on its source, on the directories that
+    its relative paths are resolved in, and on the identity of every action file it embeds (and on
+    the files matched by its glob blocks), so that rebuilding an unchanged page costs a few `stat`
+    calls and decompressing its output.
+
+    The local actions used by composite actions are dependencies as well; the rendering of a block
+    reports them through `local_files`, so that no action file is parsed only to list them.
+
+    Relative `:path:` options are resolved with `resolve_path` and `base_dir` before anything else.
+
+    With `raw_html`, the finished HTML lines of the `html` and `index` output modes are set aside,
+    and replaced by tokens that `RawHtmlPreprocessor` later stores in the `htmlStash`.
+    """
+
+    def __init__(
+        self,
+        md: Any,
+        replace_func: Callable[..., Iterable[str]],
+        memo_key: Hashable | None = None,
+        raw_html: bool = False,
+        changelog_func: Callable[..., Iterable[str]] | None = None,
+        base_dir: str = "",
+    ) -> None:
         super().__init__(md)
         self.replace_func = replace_func
+        self.changelog_func = changelog_func
+        self.memo_key = memo_key
+        self.raw_html = raw_html
+        self.base_dir = base_dir
+        self.html_blocks: list[str] = []
+        handlers = {"mkdocs-action-yml": self._replace}
+        if changelog_func is not None:
+            handlers["mkdocs-action-yml-changelog"] = self._replace_changelog
+        self.scanner = BlockScanner(handlers)
+        self._dependencies: list[tuple[Any, ...]] = []
+
+    def _replace(self, **options: Any) -> Iterable[str]:
+        options = resolve_options(options, self.base_dir)
+        if "glob" in options:
+            self._dependencies.append(("glob", options["glob"]))
+        if "path" not in options and "glob" not in options:
+            return self.replace_func(**options)
+        try:
+            ref = block_ref(options)
+        except MkDocsActionYmlException:
+            # Rendering raises the error again, with a better context.
+            ref = None
+        paths = block_paths(options)
+        self._dependencies.extend(("file", path, ref) for path in paths)
+        if options.get("examples", False) is not False:
+            roots = {workflow_root(path) for path in paths}
+            self._dependencies.extend(("workflows", root) for root in roots)
+        local: list[str] = []
+        token = local_files.set(local)
+        try:
+            lines = self.replace_func(**options)
+        finally:
+            local_files.reset(token)
+        self._dependencies.extend(("file", path, ref) for path in local)
+        return lines
+
+    def _replace_changelog(self, **options: Any) -> Iterable[str]:
+        assert self.changelog_func is not None
+        options = resolve_options(options, self.base_dir)
+        if "path" in options:
+            self._dependencies.append(("changelog", options["path"], options.get("versions", "")))
+        return self.changelog_func(**options)
+
+    def run(self, lines: list[str]) -> list[str]:
+        with recorder.measure("page") as record:
+            output = self._run(lines)
+            if self.raw_html:
+                output = self._set_html_aside(output)
+            record["lines"] = len(output)
+        return output
+
+    def _set_html_aside(self, lines: list[str]) -> list[str]:
+        self.html_blocks = []
+        output = []
+        for line in lines:
+            if RAW_HTML in line:
+                indent, _, html = line.partition(RAW_HTML)
+                line = f"{indent}{_HTML_TOKEN}{len(self.html_blocks)}{_HTML_TOKEN}"
+                self.html_blocks.append(html)
+            output.append(line)
+        return output
+
+    def _run(self, lines: list[str]) -> list[str]:
+        if self.memo_key is None:
+            return self._scan(lines)
+        source = "\n".join(lines)
+        if not self.scanner.has_marker(source):
+            return lines
+
+        # Relative paths resolve differently on other pages: the same source may embed other files.
+        digest = hashlib.blake2b(source.encode("utf-8", "surrogatepass")).digest()
+        key = (self.memo_key, search_dirs.get(), self.base_dir, digest)
+        memo = _cache.pages.get(key)
+        if memo is not None and _is_current(memo[0]):
+            recorder.count("pages.hit")
+            output: list[str] = marshal.loads(zlib.decompress(memo[1], -_MEMO_WBITS))
+            return output
+        recorder.count("pages.miss")
+
+        self._dependencies = []
+        output = self._scan(lines)
+        if any(line.startswith(PLACEHOLDER) for line in output):
+            # Let blocks over a limit try again, e.g. after running out of time.
+            return output
+        dependencies = tuple((dep, _identity(*dep)) for dep in set(self._dependencies))
+        # Memoized pages are kept compressed: most of their lines are repeated text, and a single
+        # bytes object per page doesn't delay the garbage collection of a long build. A small
+        # window keeps the compressor's own buffers small too, instead of about 256 KiB per page.
+        packer = zlib.compressobj(1, zlib.DEFLATED, -_MEMO_WBITS, _MEMO_MEMLEVEL)
+        packed = packer.compress(marshal.dumps(output)) + packer.flush()
+        _cache.pages.put(key, (dependencies, packed), size=len(packed))
+        return output
+
+    def _scan(self, lines: list[str]) -> list[str]:
+        with recorder.measure("scan"):
+            return self.scanner.process(lines)
+
+
+_HTML_TOKEN = "\ufdd2actionyml-html\ufdd2"
+
+
+class RawHtmlPreprocessor(Preprocessor):
+    """Store the HTML set aside by an `ActionYmlPreprocessor` in the `htmlStash`."""
+
+    def __init__(self, md: Any, source: ActionYmlPreprocessor) -> None:
+        super().__init__(md)
+        self.source = source
 
     def run(self, lines: list[str]) -> list[str]:
-        return list(
-            replace_blocks(
-                lines,
-                title="mkdocs-action-yml",
-                replace=self.replace_func,
-            )
+        blocks = self.source.html_blocks
+        if not blocks:
+            return lines
+        output = []
+        for line in lines:
+            if _HTML_TOKEN in line:
+                indent, _, rest = line.partition(_HTML_TOKEN)
+                index = int(rest.partition(_HTML_TOKEN)[0])
+                line = indent + self.md.htmlStash.store(blocks[index])
+            output.append(line)
+        self.source.html_blocks = []
+        return output
+
+
+def _identity(kind: str, target: str, ref: Any = None) -> tuple:
+    if kind == "glob":
+        return tuple(discover(target))
+    if kind == "changelog":
+        return changelog_identity(target, ref)
+    if kind == "workflows":
+        return workflow_index(target).identity
+    return source_key(target, ref)
+
+
+def _is_current(dependencies: tuple[tuple[tuple[Any, ...], tuple], ...]) -> bool:
+    try:
+        return all(_identity(*dep) == identity for dep, identity in dependencies)
+    except (OSError, MkDocsActionYmlException):
+        return False
+
+
+def replace_command_docs(config: dict[str, Any] | None = None, **options: Any) -> Iterator[str]:
+    if "path" not in options and "glob" not in options:
+        raise MkDocsActionYmlException("Option 'path' is required")
+    if "owner" not in options:
+        raise MkDocsActionYmlException("Option 'owner' is required")
+
+    config = config or {}
+
+    def render() -> tuple[RenderedBlock, int]:
+        with recorder.measure("block", path=block_label(options)) as record:
+            block = render_block(config, **options)
+            record["lines"] = len(block.lines)
+        return block, sum(map(len, block.lines))
+
+    try:
+        key = block_key(config, options)
+        # Pages converted at the same time by several threads share the rendering of a block.
+        block, created = _cache.rendered.get_or_create(key, render)
+        if not created and not is_current(block, block_ref(options)):
+            block, size = render()
+            _cache.rendered.put(key, block, size=size)
+            created = True
+    except LimitExceeded as e:
+        return _make_placeholder(e)
+    recorder.count("rendered.miss" if created else "rendered.hit")
+    collector = local_files.get()
+    if collector is not None:
+        collector.extend(path for path, _ in block.local)
+    return iter(block.lines)
+
+
+def replace_changelog_docs(config: dict[str, Any] | None = None, **options: Any) -> Iterator[str]:
+    if "path" not in options:
+        raise MkDocsActionYmlException("Option 'path' is required")
+
+    config = config or {}
+    loader = config.get("loader", "auto")
+    limits = block_limits(config)
+    versions = options.get("versions", "")
+    key = (
+        ("changelog", changelog_identity(options["path"], versions)),
+        loader,
+        tuple(sorted(options.items())),
+    )
+
+    def render() -> tuple[list[str], int]:
+        with recorder.measure("block", path=options["path"], changelog=True) as record:
+            changes = make_changelog_docs(options["path"], versions, loader, limits)
+            lines = list(within_budget(changes, options["path"], limits.timeout))
+            record["lines"] = len(lines)
+        return lines, sum(map(len, lines))
+
+    try:
+        lines, created = _cache.rendered.get_or_create(key, render)
+    except LimitExceeded as e:
+        return _make_placeholder(e)
+    recorder.count("rendered.miss" if created else "rendered.hit")
+    return iter(lines)
+
+
+def _make_placeholder(error: LimitExceeded) -> Iterator[str]:
+    """
+    Warn that a block exceeds a limit, and return the lines standing for it on the page.
+
+    Neither the block nor its page is cached, since a block that ran out of time may render in
+    time on the next build.
+    """
+    page = current_page.get()
+    log.warning(f"{page}: {error}" if page else str(error))
+    return iter([f"{PLACEHOLDER} {error}", ""])
+
+
+def block_limits(config: dict[str, Any]) -> Limits:
+    """Return the resource limits of the configuration of the extension, none by default."""
+    return Limits(
+        max_bytes=int(config.get("max_bytes", 0)),
+        max_nodes=int(config.get("max_nodes", 0)),
+        max_aliases=int(config.get("max_aliases", 0)),
+        timeout=float(config.get("timeout", 0)),
+    )
+
+
+def resolve_options(options: dict[str, Any], base_dir: str = "") -> dict[str, Any]:
+    """Return the options of a block with its `path` resolved, see `resolve_path`."""
+    if isinstance(options.get("path"), str):
+        return {**options, "path": resolve_path(options["path"], base_dir)}
+    return options
+
+
+def block_paths(options: dict[str, Any]) -> list[str]:
+    """Return the action files documented by a block."""
+    if "glob" in options:
+        return discover(options["glob"])
+    return [options["path"]]
+
+
+def block_ref(options: dict[str, Any]) -> str | None:
+    """
+    Return the git ref a block reads its action file from, if any: the `ref` option, or the
+    `version` option when `ref` is set without a value.
+    """
+    ref = options.get("ref")
+    if ref is None or ref is False:
+        return None
+    if "glob" in options:
+        raise MkDocsActionYmlException("Option 'ref' can't be combined with 'glob'")
+    if ref == "" or ref is True:
+        return str(options.get("version", "main"))
+    return str(ref)
+
+
+def block_files(
+    options: dict[str, Any],
+    loader: str = "auto",
+    limits: Limits | None = None,
+    base_dir: str = "",
+) -> list[str]:
+    """
+    Return every file the output of a block depends on: its action files, and the local actions
+    used by composite actions, unless their steps are not shown.
+
+    Every action file is loaded; once the block is rendered, they all come from the cache.
+    """
+    paths = block_paths(options)
+    ref = block_ref(options)
+    files = dict.fromkeys(paths)
+    sections = block_sections(options)
+    if sections is not None and "steps" not in sections:
+        return list(files)
+    for path in paths:
+        action = load_action(path, loader, ref, limits)
+        if action.steps:
+            load = functools.partial(load_action, loader=loader, ref=ref, limits=limits)
+            local = local_actions(path, action, load, ref, base_dir)
+            files.update(dict.fromkeys(entry.path for entry in local))
+    return list(files)
+
+
+def block_label(options: dict[str, Any]) -> str:
+    return options["glob"] if "glob" in options else options["path"]
+
+
+def block_key(config: dict[str, Any], options: dict[str, Any]) -> tuple:
+    """
+    Identify the rendered output of a block with the current contents of its action files.
+
+    Only the action files named by the block are looked at, with a `stat` call each, and none is
+    parsed: the local actions of composite actions are checked by `is_current` instead.
+    """
+    ref = block_ref(options)
+    identity: tuple = tuple(source_key(path, ref) for path in block_paths(options))
+    if block_examples(options):
+        identity = (identity, tuple(workflow_identity(path) for path in block_paths(options)))
+    return (
+        identity,
+        config.get("loader", "auto"),
+        config.get("output", "markdown"),
+        # Where local actions are looked up outside of a repository.
+        config.get("base_dir", ""),
+        tuple(sorted(options.items())),
+    )
+
+
+def rendered_files(config: dict[str, Any], options: dict[str, Any]) -> list[str]:
+    """
+    Return the files a block is known to depend on without parsing any: its action files, and the
+    local actions listed by its cached rendering, if any.
+    """
+    paths = block_paths(options)
+    block = rendered_block(config, options)
+    if block is not None:
+        paths.extend(path for path, _ in block.local if path not in paths)
+    return paths
+
+
+def rendered_block(config: dict[str, Any], options: dict[str, Any]) -> RenderedBlock | None:
+    """Return the cached rendering of a block, if any, without rendering it."""
+    try:
+        block: RenderedBlock | None = _cache.rendered.get(block_key(config, options))
+    except (OSError, MkDocsActionYmlException):
+        return None
+    return block
+
+
+def is_current(block: RenderedBlock, ref: str | None = None) -> bool:
+    """Return whether the local actions described by a rendered block are unchanged."""
+    try:
+        return all(source_key(path, ref) == identity for path, identity in block.local)
+    except (OSError, MkDocsActionYmlException):
+        return False
+
+
+def render_block(config: dict[str, Any], **options: Any) -> RenderedBlock:
+    """
+    Render a block, going through the persistent store when one is configured.
+
+    The local actions of composite actions are listed after rendering, from the parsed action
+    cache, and so are the schema errors of the working tree files, which saves validation a parse
+    of its own. The store keys a block on its own action files, and keeps the digest of every
+    local action and the errors of every file next to its lines, so that a hit reads those files
+    but parses none. Paths are keyed relative to `base_dir`, or the working directory, so that
+    builds from checkouts in other directories share the store.
+    """
+    limits = block_limits(config)
+    loader = config.get("loader", "auto")
+    ref = block_ref(options)
+
+    def make() -> tuple[list[str], list[str], list[FileErrors]]:
+        lines = list(
+            within_budget(_make_block_docs(config, options), block_label(options), limits.timeout)
         )
+        paths = set(block_paths(options))
+        files = block_files(options, loader, limits, config.get("base_dir", ""))
+        local = [path for path in files if path not in paths]
+        errors = [] if ref is not None else [(p, *file_errors(p, loader, limits)) for p in files]
+        return lines, local, errors
 
+    def finish(lines: list[str], local: Iterable[str], errors: list[FileErrors]) -> RenderedBlock:
+        identities = tuple((path, source_key(path, ref)) for path in local)
+        return RenderedBlock(lines, identities, tuple(errors))
 
-def replace_command_docs(**options: Any) -> Iterator[str]:
-    for option in ("path", "owner"):
-        if option not in options:
-            raise MkDocsActionYmlException(f"Option {option!r} is required")
+    cache_dir = config.get("cache_dir")
+    if not cache_dir:
+        return finish(*make())
 
-    path = options["path"]
+    store = get_store(cache_dir, int(config["cache_max_bytes"]))
+    root = config.get("base_dir") or os.getcwd()
+    source = b""
+    for path in block_paths(options):
+        source += _relative(path, root).encode("utf-8") + b"\0" + read_source(path, ref) + b"\0"
+    examples = block_examples(options)
+    for path in block_paths(options) if examples else ():
+        for step in find_examples(path, options["owner"], examples):
+            workflow = _relative(step.workflow, root)
+            source += workflow.encode("utf-8") + b"\0" + step.snippet.encode("utf-8") + b"\0"
+    keyed = {**options, "output": config.get("output", "markdown")}
+    if isinstance(options.get("path"), str):
+        keyed["path"] = _relative(options["path"], root)
+    if isinstance(options.get("glob"), str) and os.path.isabs(options["glob"]):
+        keyed["glob"] = _relative(options["glob"], root)
+    key = render_key(source, options["owner"], options.get("version", "main"), keyed)
+    entry = store.get(key)
+    if isinstance(entry, dict) and "errors" in entry:
+        stored = [(os.path.join(root, path), digest) for path, digest in entry["local"]]
+        if all(_digest(path, ref) == digest for path, digest in stored):
+            recorder.count("store.hit")
+            # The files of the block itself are spelled as in its options.
+            spelled = {_relative(path, root): path for path in block_paths(options)}
+            errors = [
+                (spelled.get(path, os.path.join(root, path)), tuple(lenient), tuple(strict))
+                for path, lenient, strict in entry["errors"]
+            ]
+            return finish(entry["lines"], (path for path, _ in stored), errors)
+    recorder.count("store.miss")
+    lines, local, errors = make()
+    store.put(
+        key,
+        {
+            "lines": lines,
+            "local": [[_relative(path, root), _digest(path, ref)] for path in local],
+            "errors": [[_relative(path, root), *messages] for path, *messages in errors],
+        },
+    )
+    return finish(lines, local, errors)
+
+
+def _relative(path: str, root: str) -> str:
+    """Spell `path` relative to `root`, as the same file is found in another checkout."""
+    try:
+        return os.path.relpath(path, root)
+    except ValueError:
+        # On another drive.
+        return path
+
+
+def _digest(path: str, ref: str | None) -> str:
+    try:
+        return hashlib.sha256(read_source(path, ref)).hexdigest()
+    except (OSError, MkDocsActionYmlException):
+        return ""
+
+
+def _make_block_docs(config: dict[str, Any], options: dict[str, Any]) -> Iterator[str]:
     owner = options["owner"]
     version = options.get("version", "main")
+    loader = config.get("loader", "auto")
+    output = config.get("output", "markdown")
+    if "glob" in options:
+        return make_catalog_docs(
+            options["glob"],
+            owner,
+            version,
+            loader=loader,
+            toc=options.get("toc", False) is True,
+            output=output,
+            sections=block_sections(options),
+            examples=block_examples(options),
+            limits=block_limits(config),
+            base_dir=config.get("base_dir", ""),
+        )
+    return make_action_docs(
+        path=options["path"],
+        owner=owner,
+        version=version,
+        loader=loader,
+        output=output,
+        ref=block_ref(options),
+        sections=block_sections(options),
+        examples=block_examples(options),
+        limits=block_limits(config),
+        base_dir=config.get("base_dir", ""),
+    )
+
+
+def block_examples(options: dict[str, Any]) -> int:
+    """
+    Return how many workflow steps the `:examples:` option of a block asks for, 0 for none.
+    """
+    examples = options.get("examples", False)
+    if examples is False or examples is None:
+        return 0
+    if examples is True or examples == "":
+        return DEFAULT_EXAMPLES
+    try:
+        return max(int(examples), 0)
+    except (TypeError, ValueError):
+        raise MkDocsActionYmlException("Option 'examples' needs a number of examples") from None
+
 
-    return make_action_docs(path=path, owner=owner, version=version)
+def block_sections(options: dict[str, Any]) -> tuple[str, ...] | None:
+    """Return the sections selected by the `:sections:` option of a block, `None` for all."""
+    sections = options.get("sections")
+    if sections is None or sections == "":
+        return None
+    if isinstance(sections, bool):
+        raise MkDocsActionYmlException("Option 'sections' needs a list of section names")
+    return select_sections(sections)
 
 
-def makeExtension() -> Extension:
-    return ActionYmlExtension()
+def makeExtension(**kwargs: Any) -> Extension:
+    return ActionYmlExtension(**kwargs)
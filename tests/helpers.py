@@ -0,0 +1,53 @@
+"""Helpers shared by the tests."""
+
+import os
+import subprocess
+import tempfile
+import unittest
+
+from mkdocs_action_yml import _git, clear_cache
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def write_action(path, name, uses=None, using=None):
+    """
+    Write a minimal action file; a composite action whose steps use `uses`, when given, or else a
+    node action.
+    """
+    using = using or ("node20" if uses is None else "composite")
+    content = f"name: {name}\ndescription: About {name}\nruns:\n  using: {using}\n"
+    if using == "composite":
+        content += "  steps:\n    - name: Say hello\n      run: echo hello\n      shell: bash\n"
+        content += "".join(f"    - uses: {target}\n" for target in uses or ())
+    else:
+        content += "  main: index.js\n"
+    write(path, content)
+
+
+def git(*args, cwd):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Run every test in a new temporary working directory, `self.root`, with empty caches."""
+
+    def setUp(self):
+        clear_cache()
+        self.addCleanup(clear_cache)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        # Stop the git processes reading from the directory before it is removed.
+        self.addCleanup(_git.close_all)
+        self.root = os.path.realpath(self.tmpdir.name)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.root)
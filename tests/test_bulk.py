@@ -0,0 +1,84 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+
+from mkdocs_action_yml import MkDocsActionYmlException, render_many
+from mkdocs_action_yml.__main__ import main
+from mkdocs_action_yml._bulk import MANIFEST, expand_paths, output_name
+
+from helpers import TempDirTestCase, write_action
+
+
+class TestRenderMany(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        for name in ("alpha", "beta"):
+            write_action(os.path.join("actions", name, "action.yml"), name)
+
+    def test_output_name(self):
+        self.assertEqual(
+            output_name("actions/build/action.yml"), os.path.join("actions", "build.md")
+        )
+        self.assertEqual(output_name("action.yml"), "action.md")
+        self.assertEqual(output_name("ci/lint.yaml"), os.path.join("ci", "lint.md"))
+
+    def test_expand_paths(self):
+        alpha = os.path.join("actions", "alpha", "action.yml")
+        self.assertEqual(
+            expand_paths(["actions/*/action.yml", alpha]),
+            [alpha, os.path.join("actions", "beta", "action.yml")],
+        )
+
+    def test_unchanged_outputs_are_not_rewritten(self):
+        alpha = os.path.join("docs", "actions", "alpha.md")
+        result = render_many(["actions/*/action.yml"], "docs", "me", workers=2)
+        self.assertEqual(
+            result.written,
+            [os.path.join("actions", "alpha.md"), os.path.join("actions", "beta.md")],
+        )
+        self.assertTrue(os.path.exists(os.path.join("docs", MANIFEST)))
+        with open(alpha) as f:
+            self.assertIn("# alpha", f.read())
+        os.utime(alpha, ns=(0, 0))
+
+        result = render_many(["actions/*/action.yml"], "docs", "me", workers=1)
+        self.assertEqual(result.written, [])
+        self.assertEqual(len(result.unchanged), 2)
+        self.assertEqual(os.stat(alpha).st_mtime_ns, 0)
+
+        # Only the edited action is rendered and written again.
+        write_action(os.path.join("actions", "beta", "action.yml"), "gamma")
+        result = render_many(["actions/*/action.yml"], "docs", "me")
+        self.assertEqual(result.written, [os.path.join("actions", "beta.md")])
+        self.assertEqual(os.stat(alpha).st_mtime_ns, 0)
+
+        # --force renders everything again, but rewrites nothing whose content is the same.
+        result = render_many(["actions/*/action.yml"], "docs", "me", force=True)
+        self.assertEqual(result.written, [])
+
+    def test_changed_local_action(self):
+        write_action("sub/action.yml", "Sub one")
+        write_action(os.path.join("actions", "alpha", "action.yml"), "alpha", uses=["./sub"])
+        render_many(["actions/*/action.yml"], "docs", "me", workers=1)
+        write_action("sub/action.yml", "Sub two")
+        result = render_many(["actions/*/action.yml"], "docs", "me", workers=1)
+        self.assertEqual(result.written, [os.path.join("actions", "alpha.md")])
+        with open(os.path.join("docs", "actions", "alpha.md")) as f:
+            self.assertIn("### Sub two", f.read())
+
+    def test_collision(self):
+        write_action(os.path.join("actions", "alpha.yml"), "other")
+        with self.assertRaises(MkDocsActionYmlException):
+            render_many(["actions/alpha.yml", "actions/alpha/action.yml"], "docs", "me")
+
+    def test_main(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            code = main(["actions/*/action.yml", "-o", "docs", "--owner", "me", "-j", "1"])
+        self.assertEqual(code, 0)
+        self.assertIn("2 written, 0 unchanged", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import yaml
+from markdown import Markdown
+
+from mkdocs_action_yml import ActionYmlExtension, cache_info, clear_cache
+from mkdocs_action_yml._cache import LRUCache
+from mkdocs_action_yml._docs import load_action
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used_entry(self):
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_evicts_by_bytes(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", 1, size=6)
+        cache.put("b", 2, size=6)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+        self.assertEqual(cache.info().bytes, 6)
+
+    def test_skips_oversized_entry(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", 1, size=11)
+        self.assertEqual(len(cache), 0)
+
+    def test_counters(self):
+        cache = LRUCache()
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual(cache.info(), (1, 1, 1, 0))
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 0, 0))
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_misses_create_once(self):
+        cache = LRUCache()
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def create():
+            calls.append(1)
+            time.sleep(0.05)
+            return object(), 1
+
+        def get():
+            barrier.wait()
+            return cache.get_or_create("a", create)
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: get(), range(8)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(value) for value, _ in results}), 1)
+        self.assertEqual(sum(created for _, created in results), 1)
+        self.assertEqual(cache.info()[:3], (7, 1, 1))
+
+    def test_error_is_shared_and_not_stored(self):
+        cache = LRUCache()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail():
+            started.set()
+            release.wait()
+            raise ValueError("broken")
+
+        with ThreadPoolExecutor(2) as pool:
+            leader = pool.submit(cache.get_or_create, "a", fail)
+            started.wait()
+            follower = pool.submit(cache.get_or_create, "a", lambda: (2, 1))
+            time.sleep(0.05)
+            release.set()
+            for future in (leader, follower):
+                with self.assertRaisesRegex(ValueError, "broken"):
+                    future.result()
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.get_or_create("a", lambda: (3, 1)), (3, True))
+
+    def test_reentrant_create(self):
+        cache = LRUCache()
+        value = cache.get_or_create("a", lambda: (cache.get_or_create("a", lambda: (1, 1))[0], 1))
+        self.assertEqual(value, (1, True))
+
+
+class TestConcurrentConversion(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(6):
+            path = os.path.join(self.tmpdir.name, f"action{i}.yml")
+            with open(path, "w") as f:
+                f.write(
+                    f"name: Action {i}\ndescription: d\n"
+                    "inputs:\n  token:\n    description: t\nruns:\n  using: node20\n"
+                )
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def test_stress(self):
+        rng = random.Random(42)
+        pages = []
+        for _ in range(200):
+            blocks = rng.sample(self.paths, rng.randrange(1, 4))
+            pages.append(
+                "\n".join(
+                    f"::: mkdocs-action-yml\n    :path: {path}\n    :owner: me\n" for path in blocks
+                )
+            )
+
+        lock = threading.Lock()
+        parsed = []
+        original = yaml.load
+
+        def slow_load(*args, **kwargs):
+            with lock:
+                parsed.append(1)
+            # Widen the window in which other threads could parse the same file.
+            time.sleep(0.01)
+            return original(*args, **kwargs)
+
+        def convert(page):
+            return Markdown(extensions=[ActionYmlExtension()]).convert(page)
+
+        with patch.object(yaml, "load", slow_load):
+            with ThreadPoolExecutor(16) as pool:
+                results = list(pool.map(convert, pages))
+        self.assertEqual(len(parsed), len(self.paths))
+        self.assertEqual(cache_info().misses, len(self.paths))
+
+        clear_cache()
+        self.assertEqual(results, [convert(page) for page in pages])
+
+
+class TestLoadAction(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "action.yml")
+        with open(self.path, "w") as f:
+            f.write("name: Cached\ndescription: d\nruns:\n  using: node20\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def test_parses_once(self):
+        with patch.object(yaml, "load", wraps=yaml.load) as yaml_load:
+            first = load_action(self.path)
+            second = load_action(os.path.join(self.tmpdir.name, ".", "action.yml"))
+        self.assertIs(first, second)
+        self.assertEqual(yaml_load.call_count, 1)
+        self.assertEqual(cache_info().hits, 1)
+        self.assertEqual(cache_info().misses, 1)
+
+    def test_reloads_modified_file(self):
+        self.assertEqual(load_action(self.path).name, "Cached")
+        with open(self.path, "w") as f:
+            f.write("name: Changed\ndescription: d\nruns:\n  using: node20\n")
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        self.assertEqual(load_action(self.path).name, "Changed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from markdown import Markdown
+
+from mkdocs_action_yml import ActionYmlExtension, MkDocsActionYmlException, _cache
+from mkdocs_action_yml._catalog import discover, make_catalog_docs
+
+from helpers import TempDirTestCase, write_action
+
+
+class TestCatalog(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        for name in ("zeta", "alpha", "nested/beta"):
+            write_action(os.path.join("actions", name, "action.yml"), name.split("/")[-1])
+
+    def test_discover_is_sorted_and_cached(self):
+        expected = [
+            os.path.join("actions", "alpha", "action.yml"),
+            os.path.join("actions", "nested", "beta", "action.yml"),
+            os.path.join("actions", "zeta", "action.yml"),
+        ]
+        self.assertEqual(discover("actions/**/action.yml"), expected)
+        with patch("glob.glob") as glob:
+            self.assertEqual(discover("actions/**/action.yml"), expected)
+        glob.assert_not_called()
+
+    def test_make_catalog_docs(self):
+        lines = list(make_catalog_docs("actions/**/action.yml", "me", "v1", toc=True))
+        self.assertEqual(
+            lines[:6],
+            [
+                "| Action | Description |",
+                "| ------ | ----------- |",
+                "| [alpha](#alpha) | About alpha |",
+                "| [beta](#beta) | About beta |",
+                "| [zeta](#zeta) | About zeta |",
+                "",
+            ],
+        )
+        self.assertEqual(
+            [line for line in lines if line.startswith("# ")], ["# alpha", "# beta", "# zeta"]
+        )
+
+    def test_no_match(self):
+        with self.assertRaises(MkDocsActionYmlException):
+            list(make_catalog_docs("missing/**/action.yml", "me"))
+
+    def test_glob_block(self):
+        source = "::: mkdocs-action-yml\n    :glob: actions/**/action.yml\n    :owner: me\n"
+        html = Markdown(extensions=[ActionYmlExtension()]).convert(source)
+        self.assertIn("<h1>beta</h1>", html)
+
+        # New files show up once the glob cache is cleared, e.g. by the next MkDocs build.
+        write_action(os.path.join("actions", "gamma", "action.yml"), "gamma")
+        _cache.discovered.clear()
+        html = Markdown(extensions=[ActionYmlExtension()]).convert(source)
+        self.assertIn("<h1>gamma</h1>", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import shutil
+import unittest
+from unittest.mock import patch
+
+from markdown import Markdown
+
+from mkdocs_action_yml import ActionYmlExtension, _cache
+from mkdocs_action_yml._changelog import (
+    diff_actions,
+    expand_versions,
+    make_changelog_docs,
+    version_key,
+)
+from mkdocs_action_yml._spec import ActionSpec, InputSpec, OutputSpec
+
+from helpers import TempDirTestCase, git
+
+VERSIONS = {
+    "v1.0.0": "inputs:\n  token:\n    default: a\n",
+    "v1.1.0": "inputs:\n  token:\n    default: b\n  level:\n    required: true\n",
+    "v1.2.0": "inputs:\n  token:\n    default: b\n  level:\n    required: true\n",
+    "v2.0.0": "inputs:\n  level:\n    required: true\noutputs:\n  id:\n    description: Id\n",
+}
+
+
+class TestVersions(unittest.TestCase):
+    def test_version_key(self):
+        versions = ["v1.10.0", "v1.2.0", "1.2.0-rc2", "v1.2.0-rc10", "v0.9"]
+        self.assertEqual(
+            sorted(versions, key=version_key),
+            ["v0.9", "1.2.0-rc2", "v1.2.0-rc10", "v1.2.0", "v1.10.0"],
+        )
+
+    def test_diff_actions(self):
+        old = ActionSpec(
+            "a",
+            "b",
+            "node16",
+            (InputSpec("x", "X", False, "1"), InputSpec("y", "Y", False, "")),
+            (OutputSpec("o", "O", ""),),
+        )
+        new = ActionSpec(
+            "a",
+            "b",
+            "node20",
+            (InputSpec("x", "X", True, "2"), InputSpec("z", "Z", False, "")),
+            None,
+        )
+        self.assertEqual(
+            diff_actions(old, new),
+            [
+                "Input `x` is now required",
+                "Input `x` default changed from `1` to `2`",
+                "Added optional input `z`",
+                "Removed input `y`",
+                "Removed output `o`",
+                "`runs.using` changed from `node16` to `node20`",
+            ],
+        )
+        self.assertEqual(diff_actions(old, old), [])
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class TestChangelog(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        git("init", "-q", cwd=self.root)
+        with open("README.md", "w") as f:
+            f.write("Before the action existed\n")
+        git("add", ".", cwd=self.root)
+        git("commit", "-q", "-m", "init", cwd=self.root)
+        git("tag", "v0.1.0", cwd=self.root)
+        for version, body in VERSIONS.items():
+            with open("action.yml", "w") as f:
+                f.write(f"name: Test\ndescription: About\n{body}runs:\n  using: node20\n")
+            git("add", ".", cwd=self.root)
+            git("commit", "-q", "--allow-empty", "-m", version, cwd=self.root)
+            git("tag", version, cwd=self.root)
+        git("tag", "latest", cwd=self.root)
+
+    def test_expand_versions(self):
+        self.assertEqual(expand_versions("action.yml", ""), (["v0.1.0", *VERSIONS], False))
+        self.assertEqual(
+            expand_versions("action.yml", "v1.1.0..v1.2.0"), (["v1.1.0", "v1.2.0"], False)
+        )
+        self.assertEqual(
+            expand_versions("action.yml", "v2.0.0,v1.0.0"), (["v1.0.0", "v2.0.0"], True)
+        )
+
+    def test_listed_refs_that_are_not_versions_come_last(self):
+        self.assertEqual(
+            expand_versions("action.yml", "main,v2.0.0,latest,v1.0.0"),
+            (["v1.0.0", "v2.0.0", "main", "latest"], True),
+        )
+
+    def test_make_changelog_docs(self):
+        self.assertEqual(
+            list(make_changelog_docs("action.yml")),
+            [
+                "| Version | Changes |",
+                "| ------- | ------- |",
+                "| v2.0.0 | Removed input `token` |",
+                "| | Added output `id` |",
+                "| v1.2.0 | No changes |",
+                "| v1.1.0 | Input `token` default changed from `a` to `b` |",
+                "| | Added required input `level` |",
+                "| v1.0.0 | First version |",
+                "",
+            ],
+        )
+
+    def test_diffs_are_incremental(self):
+        list(make_changelog_docs("action.yml", "..v1.2.0"))
+        with patch("mkdocs_action_yml._changelog.diff_actions", wraps=diff_actions) as diff:
+            list(make_changelog_docs("action.yml"))
+        # Only v1.2.0 -> v2.0.0 is new; v1.1.0 and v1.2.0 share a blob and aren't diffed.
+        self.assertEqual(diff.call_count, 1)
+
+    def test_changelog_block(self):
+        source = "::: mkdocs-action-yml-changelog\n    :path: action.yml\n    :versions: v1.1.0..\n"
+        html = Markdown(extensions=[ActionYmlExtension(), "tables"]).convert(source)
+        self.assertIn("<td>v2.0.0</td>", html)
+        self.assertNotIn("<td>v1.0.0</td>", html)
+
+        # New tags show up once the tags are listed again, e.g. by the next MkDocs build.
+        git("tag", "v3.0.0", cwd=self.root)
+        _cache.discovered.clear()
+        html = Markdown(extensions=[ActionYmlExtension(), "tables"]).convert(source)
+        self.assertIn("<td>v3.0.0</td>", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
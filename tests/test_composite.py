@@ -0,0 +1,143 @@
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from markdown import Markdown
+
+from mkdocs_action_yml import (
+    ActionYmlExtension,
+    MkDocsActionYmlException,
+    _loaders,
+    clear_cache,
+    plugin,
+)
+from mkdocs_action_yml._composite import local_actions, resolve_local
+from mkdocs_action_yml._docs import load_action, make_action_docs
+from mkdocs_action_yml.mkdocs_plugin import prerender
+
+from helpers import TempDirTestCase, git, write_action
+
+
+class TestCompositeActions(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        # A diamond: top uses left and right, which both use leaf.
+        write_action("actions/leaf/action.yml", "Leaf", using="node20")
+        write_action("actions/left/action.yml", "Left", uses=["./actions/leaf"])
+        write_action("actions/right/action.yaml", "Right", uses=["./actions/leaf/action.yml"])
+        write_action(
+            "action.yml", "Top", uses=["./actions/left", "./actions/right", "actions/checkout@v4"]
+        )
+
+    def test_resolve_local(self):
+        self.assertEqual(
+            resolve_local("./actions/left"), os.path.join("actions", "left", "action.yml")
+        )
+        self.assertEqual(
+            resolve_local("./actions/right"), os.path.join("actions", "right", "action.yaml")
+        )
+        with self.assertRaises(MkDocsActionYmlException):
+            resolve_local("./actions/missing")
+
+    def test_shared_actions_are_loaded_once(self):
+        with patch.object(_loaders, "load", wraps=_loaders.load) as load:
+            found = local_actions("action.yml", load_action("action.yml"), load_action)
+        self.assertEqual([a.action.name for a in found], ["Left", "Leaf", "Right"])
+        self.assertEqual(load.call_count, 4)
+
+    def test_cycle(self):
+        write_action("actions/leaf/action.yml", "Leaf", uses=["./"])
+        with self.assertRaisesRegex(MkDocsActionYmlException, "Cycle in local actions"):
+            list(make_action_docs("action.yml", "me"))
+
+    def test_make_action_docs(self):
+        lines = list(make_action_docs("action.yml", "me"))
+        steps = lines.index("## Steps")
+        self.assertEqual(
+            lines[steps : steps + 6],
+            [
+                "## Steps",
+                "",
+                "1. Say hello: `run` (bash)",
+                "2. Step 2: `./actions/left` (Left)",
+                "3. Step 3: `./actions/right` (Right)",
+                "4. Step 4: `actions/checkout@v4`",
+            ],
+        )
+        local = lines[lines.index("## Local actions") :]
+        self.assertEqual(
+            [line for line in local if line.startswith("### ")],
+            ["### Left", "### Leaf", "### Right"],
+        )
+        self.assertIn("This action is a node20 action.", local)
+
+    def test_unresolved_local_action_is_listed_as_is(self):
+        write_action("action.yml", "Top", uses=["./actions/left", "./checked-out/later"])
+        lines = list(make_action_docs("action.yml", "me"))
+        self.assertIn("3. Step 3: `./checked-out/later`", lines)
+        self.assertIn("### Left", lines)
+
+    def test_from_a_subdirectory_of_the_repository(self):
+        git("init", "-q", cwd=self.root)
+        git("add", ".", cwd=self.root)
+        git("commit", "-q", "-m", "Add actions", cwd=self.root)
+        os.mkdir("docs")
+        os.chdir("docs")
+        for ref in (None, "HEAD"):
+            lines = list(make_action_docs("../action.yml", "me", ref=ref))
+            self.assertIn("2. Step 2: `./actions/left` (Left)", lines)
+            self.assertIn("### Leaf", lines)
+
+    def test_outside_of_a_repository_from_base_dir(self):
+        os.mkdir("docs")
+        os.chdir("docs")
+        source = "::: mkdocs-action-yml\n    :path: action.yml\n    :owner: me\n"
+        html = Markdown(extensions=[ActionYmlExtension(base_dir=self.root)]).convert(source)
+        self.assertIn("<h3>Leaf</h3>", html)
+
+    def test_changed_local_action_invalidates_page(self):
+        source = "::: mkdocs-action-yml\n    :path: action.yml\n    :owner: me\n"
+        html = Markdown(extensions=[ActionYmlExtension()]).convert(source)
+        self.assertIn("<h3>Leaf</h3>", html)
+        write_action("actions/leaf/action.yml", "Renamed leaf", using="node20")
+        html = Markdown(extensions=[ActionYmlExtension()]).convert(source)
+        self.assertIn("<h3>Renamed leaf</h3>", html)
+
+    def test_block_key_parses_nothing(self):
+        with patch.object(_loaders, "load") as load:
+            plugin.block_key({}, {"path": "action.yml", "owner": "me"})
+            plugin.block_key({}, {"glob": "actions/*/action.yml", "owner": "me"})
+        load.assert_not_called()
+
+    def test_store_hit_parses_nothing(self):
+        config = {"cache_dir": "cache", "cache_max_bytes": 2**20}
+        first = list(plugin.replace_command_docs(config, path="action.yml", owner="me"))
+        clear_cache()
+        with patch.object(_loaders, "load", wraps=_loaders.load) as load:
+            second = list(plugin.replace_command_docs(config, path="action.yml", owner="me"))
+        load.assert_not_called()
+        self.assertEqual(first, second)
+
+        clear_cache()
+        write_action("actions/leaf/action.yml", "Renamed leaf", using="node20")
+        lines = list(plugin.replace_command_docs(config, path="action.yml", owner="me"))
+        self.assertIn("### Renamed leaf", lines)
+
+    def test_prerender_parses_in_workers(self):
+        threads = []
+        real_load = _loaders.load
+
+        def load(*args):
+            threads.append(threading.current_thread())
+            return real_load(*args)
+
+        with patch.object(_loaders, "load", load):
+            blocks = [{"path": "action.yml", "owner": "me"}, {"glob": "actions/*/*", "owner": "me"}]
+            prerender({}, blocks, workers=2)
+        self.assertEqual(len(threads), 4)
+        self.assertNotIn(threading.main_thread(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,12 @@
+import io
+import json
 import os
+import sys
+import tempfile
 import unittest
+from unittest.mock import patch
 
+from mkdocs_action_yml import MkDocsActionYmlException, clear_cache
 from mkdocs_action_yml._docs import (
     _format_table_inputs_row,
     _format_table_outputs_row,
@@ -12,7 +18,10 @@ from mkdocs_action_yml._docs import (
     _make_title,
     _make_usage,
     make_action_docs,
+    select_sections,
+    write_action_docs,
 )
+from mkdocs_action_yml._spec import ActionSpec, InputSpec, OutputSpec
 
 
 class TestDocsUtils(unittest.TestCase):
@@ -25,21 +34,21 @@ class TestDocsUtils(unittest.TestCase):
         self.assertEqual(list(description), ["This is a test action.", ""])
 
     def test_make_runs(self):
-        description = _make_runs({"using": "composite"})
+        description = _make_runs("composite")
         self.assertEqual(list(description), ["This action is a composite action.", ""])
 
     def test_format_usage_row_required(self):
-        input_data = {"required": True, "default": "default_value"}
-        usage_row = _format_usage_row("input_name", input_data)
+        input_data = InputSpec("input_name", "", True, "default_value")
+        usage_row = _format_usage_row(input_data)
         self.assertEqual(usage_row, "           input_name: default_value")
 
     def test_format_usage_row_optional(self):
-        input_data = {"required": False, "default": "default_value"}
-        usage_row = _format_usage_row("input_name", input_data)
+        input_data = InputSpec("input_name", "", False, "default_value")
+        usage_row = _format_usage_row(input_data)
         self.assertEqual(usage_row, "           input_name: default_value # optional")
 
     def test_make_table_inputs(self):
-        inputs = {"input1": {"required": True, "default": "value1", "description": "Description1"}}
+        inputs = [InputSpec("input1", "Description1", True, "value1")]
         table = _make_table_inputs(inputs)
         expected_table = [
             "## Inputs",
@@ -52,12 +61,12 @@ class TestDocsUtils(unittest.TestCase):
         self.assertEqual(list(table), expected_table)
 
     def test_format_table_inputs_row(self):
-        input_data = {"required": True, "default": "value1", "description": "Description1"}
-        row = _format_table_inputs_row("input1", input_data)
+        input_data = InputSpec("input1", "Description1", True, "value1")
+        row = _format_table_inputs_row(input_data)
         self.assertEqual(row, "| input1 | [required] Description1 | `value1` |")
 
     def test_make_table_outputs(self):
-        outputs = {"output1": {"description": "Output Description", "value": "output_value"}}
+        outputs = [OutputSpec("output1", "Output Description", "output_value")]
         table = _make_table_outputs(outputs)
         expected_table = [
             "## Outputs",
@@ -70,15 +79,15 @@ class TestDocsUtils(unittest.TestCase):
         self.assertEqual(list(table), expected_table)
 
     def test_format_table_outputs_row(self):
-        output_data = {"description": "Output Description", "value": "output_value"}
-        row = _format_table_outputs_row("output1", output_data)
+        output_data = OutputSpec("output1", "Output Description", "output_value")
+        row = _format_table_outputs_row(output_data)
         self.assertEqual(row, "| output1 | Output Description |")
 
     def test_make_usage(self):
         action_file = "test_action.yml"
         owner = "test_owner"
         version = "v1"
-        inputs = {"input1": {"required": True, "default": "value1"}}
+        inputs = [InputSpec("input1", "", True, "value1")]
         usage = _make_usage(owner, action_file, version, inputs)
         expected_usage = [
             "## Usage",
@@ -99,6 +108,41 @@ class TestDocsUtils(unittest.TestCase):
         self.assertEqual(list(usage), expected_usage)
 
 
+class TestActionSpec(unittest.TestCase):
+    def test_from_dict(self):
+        spec = ActionSpec.from_dict(
+            {
+                "name": "My Action",
+                "description": "About",
+                "inputs": {"token": {"required": True}, "level": {"default": 3}},
+                "runs": {"using": "node20"},
+            }
+        )
+        self.assertEqual(spec.name, "My Action")
+        self.assertEqual(spec.using, "node20")
+        self.assertEqual(
+            spec.inputs, (InputSpec("token", "", True, ""), InputSpec("level", "", False, "3"))
+        )
+        self.assertIsNone(spec.outputs)
+
+    def test_empty_sections(self):
+        spec = ActionSpec.from_dict(
+            {"name": "a", "description": "b", "inputs": None, "outputs": {}, "runs": {}}
+        )
+        self.assertEqual(spec.inputs, ())
+        self.assertEqual(spec.outputs, ())
+        self.assertEqual(spec.using, "")
+
+    def test_serialization(self):
+        spec = ActionSpec(
+            "a", "b", "composite", (InputSpec("x", "y", True, "z"),), (OutputSpec("o", "d", "v"),)
+        )
+        copy = ActionSpec.from_data(json.loads(json.dumps(spec)))
+        self.assertEqual(copy, spec)
+        self.assertIsInstance(copy.inputs[0], InputSpec)
+        self.assertIs(copy.inputs[0].name, sys.intern("x"))
+
+
 class TestActionDocs(unittest.TestCase):
     def test_make_action_docs(self):
         action_file = "tests/test_action.yml"
@@ -421,5 +465,88 @@ class TestActionDocs(unittest.TestCase):
         os.remove(action_file)
 
 
+class TestSections(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.action_file = os.path.join(self.tmpdir.name, "action.yml")
+        with open(self.action_file, "w") as f:
+            f.write(
+                "name: Steps\n"
+                "description: A composite action\n"
+                "inputs:\n"
+                "  input1:\n"
+                "    description: Input description\n"
+                "outputs:\n"
+                "  output1:\n"
+                "    description: Output description\n"
+                "runs:\n"
+                "  using: composite\n"
+                "  steps:\n"
+                "    - run: echo\n"
+                "      shell: bash\n"
+            )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def test_select_sections(self):
+        self.assertEqual(select_sections("outputs, inputs"), ("inputs", "outputs"))
+        self.assertEqual(select_sections(("usage", "title")), ("title", "usage"))
+        with self.assertRaises(MkDocsActionYmlException):
+            select_sections("inputs,examples")
+
+    def test_only_requested_sections(self):
+        result = list(make_action_docs(self.action_file, "me", sections="inputs,outputs"))
+        self.assertEqual(
+            [line for line in result if line.startswith("#")], ["## Inputs", "## Outputs"]
+        )
+
+    def test_skipped_sections_are_not_built(self):
+        with patch("mkdocs_action_yml._docs.local_actions", return_value=[]) as resolve:
+            list(make_action_docs(self.action_file, "me", sections=["title", "usage"]))
+            resolve.assert_not_called()
+            result = list(make_action_docs(self.action_file, "me"))
+            resolve.assert_called_once()
+        self.assertIn("## Steps", result)
+
+
+class TestWriteActionDocs(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.action_file = os.path.join(self.tmpdir.name, "action.yml")
+        with open(self.action_file, "w") as f:
+            f.write("name: Big Action\ndescription: Many inputs\ninputs:\n")
+            for i in range(500):
+                f.write(f"  input{i}:\n    description: Input {i}\n    default: '{i}'\n")
+            f.write("runs:\n  using: composite\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_matches_make_action_docs(self):
+        sink = io.StringIO()
+        written = write_action_docs(sink, self.action_file, "test_owner", "v1")
+        expected = "".join(
+            f"{line}\n" for line in make_action_docs(self.action_file, "test_owner", "v1")
+        )
+        self.assertEqual(sink.getvalue(), expected)
+        self.assertEqual(written, len(expected))
+
+    def test_writes_bounded_chunks(self):
+        chunks = []
+
+        class Sink:
+            def write(self, text):
+                chunks.append(text)
+
+        write_action_docs(Sink(), self.action_file, "test_owner", chunk_size=1024)
+        self.assertGreater(len(chunks), 10)
+        # A chunk is flushed as soon as it reaches the limit, so it never exceeds it by a line.
+        longest_line = max(len(line) + 1 for line in "".join(chunks).splitlines())
+        self.assertLessEqual(max(map(len, chunks)), 1024 + longest_line)
+
+
 if __name__ == "__main__":
     unittest.main()
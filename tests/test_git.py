@@ -0,0 +1,89 @@
+import os
+import shutil
+import subprocess
+import unittest
+from unittest.mock import patch
+
+from markdown import Markdown
+
+from mkdocs_action_yml import ActionYmlExtension, MkDocsActionYmlException, _git
+from mkdocs_action_yml._docs import load_action
+
+from helpers import TempDirTestCase, git
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class TestGitSource(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        git("init", "-q", cwd=self.root)
+        for version in ("v1", "v2"):
+            self.write("actions/build/action.yml", f"Build {version}")
+            git("add", ".", cwd=self.root)
+            git("commit", "-q", "-m", version, cwd=self.root)
+            git("tag", version, cwd=self.root)
+        self.write("actions/build/action.yml", "Build work in progress")
+
+    def write(self, path, name):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(f"name: {name}\ndescription: About\nruns:\n  using: node20\n")
+
+    def test_load_action_at_ref(self):
+        path = "actions/build/action.yml"
+        with patch("subprocess.Popen", wraps=subprocess.Popen) as popen:
+            self.assertEqual(load_action(path, ref="v1").name, "Build v1")
+            self.assertEqual(load_action(path, ref="v2").name, "Build v2")
+            self.assertEqual(load_action(path, ref="v1").name, "Build v1")
+        # One process resolves names, and another reads blobs, for the whole repository.
+        self.assertEqual(popen.call_count, 2)
+        self.assertEqual(load_action(path).name, "Build work in progress")
+
+    def test_missing(self):
+        with self.assertRaises(MkDocsActionYmlException):
+            load_action("actions/build/action.yml", ref="v3")
+        with self.assertRaises(MkDocsActionYmlException):
+            load_action("actions/missing.yml", ref="v1")
+
+    def test_missing_path_with_spaces(self):
+        repo, name = _git.repository("actions/build/action.yml")
+        self.assertIsNone(repo.info("v1", "my dir/action.yml"))
+        self.write("my dir/action.yml", "Spaced")
+        git("add", ".", cwd=self.root)
+        git("commit", "-q", "-m", "v3", cwd=self.root)
+        info = repo.info("HEAD", "my dir/action.yml")
+        self.assertEqual(info.type, "blob")
+
+    def test_ref_block(self):
+        source = (
+            "::: mkdocs-action-yml\n"
+            "    :path: actions/build/action.yml\n"
+            "    :owner: me\n"
+            "    :version: v1\n"
+            "    :ref:\n"
+        )
+        html = Markdown(extensions=[ActionYmlExtension()]).convert(source)
+        self.assertIn("<h1>Build v1</h1>", html)
+        self.assertIn("me/action@v1", html)
+
+        # Moving the tag invalidates the page.
+        git("tag", "-f", "v1", "v2", cwd=self.root)
+        html = Markdown(extensions=[ActionYmlExtension()]).convert(source)
+        self.assertIn("<h1>Build v2</h1>", html)
+
+    def test_forked_child_starts_its_own_processes(self):
+        repo, name = _git.repository("actions/build/action.yml")
+        self.assertEqual(name, "actions/build/action.yml")
+        self.assertIsNotNone(repo.info("v1", name))
+        parent = repo._check
+        with patch("os.getpid", return_value=-1):
+            self.assertIsNotNone(repo.info("v2", name))
+            self.assertIsNot(repo._check, parent)
+            repo.close()
+        parent.stdin.close()
+        parent.wait()
+        parent.stdout.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from markdown import Markdown
+from mkdocs.config import load_config
+from mkdocs.structure.files import get_files
+
+from mkdocs_action_yml import ActionYmlExtension, clear_cache
+from mkdocs_action_yml._docs import load_action, load_index, make_action_docs
+from mkdocs_action_yml._index import INDEX_DIR, SCRIPT, build_index
+
+from helpers import TempDirTestCase
+
+ACTION = """\
+name: Big
+description: Many inputs
+inputs:
+  token:
+    description: The token
+    required: true
+  level:
+    description: The level
+    default: 3
+outputs:
+  result:
+    description: The result
+runs:
+  using: node20
+  main: index.js
+"""
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "action.yml")
+        with open(self.path, "w") as f:
+            f.write(ACTION)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def test_build_index(self):
+        index = build_index(load_action(self.path))
+        self.assertEqual(
+            json.loads(index.data),
+            {
+                "name": "Big",
+                "inputs": [["token", "The token", True, ""], ["level", "The level", False, "3"]],
+                "outputs": [["result", "The result"]],
+            },
+        )
+        self.assertNotIn(b", ", index.data)
+        self.assertRegex(index.name, r"^[0-9a-f]{16}\.json$")
+
+    def test_built_once(self):
+        with patch("mkdocs_action_yml._docs.build_index", wraps=build_index) as build:
+            first = load_index(self.path)
+            self.assertIs(load_index(self.path), first)
+        build.assert_called_once()
+
+    def test_index_output(self):
+        lines = list(make_action_docs(self.path, "me", output="index"))
+        name = load_index(self.path).name
+        self.assertIn("## Inputs", lines)
+        placeholders = [line for line in lines if "actionyml-index" in line]
+        self.assertEqual(len(placeholders), 2)
+        self.assertIn(f'data-index="{name}" data-section="inputs"', placeholders[0])
+        self.assertIn("2 inputs", placeholders[0])
+        self.assertNotIn("The token", "\n".join(lines))
+
+    def test_markdown_output_is_raw_html(self):
+        source = f"::: mkdocs-action-yml\n    :path: {self.path}\n    :owner: me\n"
+        html = Markdown(extensions=[ActionYmlExtension(output="index")]).convert(source)
+        self.assertIn('<div class="actionyml-index"', html)
+        self.assertIn("<h2>Outputs</h2>", html)
+
+
+class TestPluginIndexes(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        with open("mkdocs.yml", "w") as f:
+            f.write(
+                "site_name: Test\n"
+                "markdown_extensions:\n  - mkdocs-action-yml:\n      output: index\n"
+                "plugins:\n  - mkdocs-action-yml\n"
+            )
+        os.makedirs("docs")
+        with open("action.yml", "w") as f:
+            f.write(ACTION)
+        for name in ("a", "b"):
+            with open(f"docs/{name}.md", "w") as f:
+                f.write("::: mkdocs-action-yml\n    :path: action.yml\n    :owner: me\n")
+
+    def test_writes_indexes_and_script(self):
+        config = load_config("mkdocs.yml")
+        action_plugin = config["plugins"]["mkdocs-action-yml"]
+        action_plugin.on_config(config)
+        self.assertIn(f"{INDEX_DIR}/{SCRIPT}", config["extra_javascript"])
+        action_plugin.on_files(get_files(config), config=config)
+        action_plugin.on_post_build(config)
+
+        directory = os.path.join(config["site_dir"], *INDEX_DIR.split("/"))
+        index = load_index("action.yml")
+        self.assertEqual(sorted(os.listdir(directory)), sorted([SCRIPT, index.name]))
+        with open(os.path.join(directory, index.name), "rb") as f:
+            self.assertEqual(f.read(), index.data)
+
+    def test_writes_indexes_of_generated_pages(self):
+        with open("mkdocs.yml", "w") as f:
+            f.write(
+                "site_name: Test\n"
+                "markdown_extensions:\n  - mkdocs-action-yml:\n      output: index\n"
+                "plugins:\n  - mkdocs-action-yml:\n      pages: ['action.yml']\n"
+                "      pages_owner: me\n"
+            )
+        for name in ("a", "b"):
+            os.remove(f"docs/{name}.md")
+        with open("docs/index.md", "w") as f:
+            f.write("# Home\n")
+        config = load_config("mkdocs.yml")
+        action_plugin = config["plugins"]["mkdocs-action-yml"]
+        config = config["plugins"].on_config(config)
+        action_plugin.on_files(get_files(config), config=config)
+        action_plugin.on_post_build(config)
+
+        directory = os.path.join(config["site_dir"], *INDEX_DIR.split("/"))
+        index = load_index(os.path.abspath("action.yml"))
+        self.assertEqual(sorted(os.listdir(directory)), sorted([SCRIPT, index.name]))
+
+
+if __name__ == "__main__":
+    unittest.main()
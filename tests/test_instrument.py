@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import unittest
+
+from markdown import Markdown
+
+from mkdocs_action_yml import ActionYmlExtension, Recorder, clear_cache, recorder
+from mkdocs_action_yml._instrument import current_page
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ACTION = os.path.join(SCRIPT_DIR, "fixtures", "action.yml")
+
+
+class TestRecorder(unittest.TestCase):
+    def test_disabled_is_a_no_op(self):
+        rec = Recorder()
+        lines = ["a", "b"]
+        self.assertIs(rec.lines("section", lines), lines)
+        with rec.measure("stage") as record:
+            record["ignored"] = True
+        rec.count("hits")
+        self.assertEqual(rec.report()["records"], [])
+        self.assertEqual(rec.report()["counters"], {})
+
+    def test_measures_and_counts(self):
+        rec = Recorder()
+        rec.enable(trace_memory=True)
+        try:
+            token = current_page.set("index.md")
+            with rec.measure("block", path="action.yml") as record:
+                record["lines"] = 3
+            current_page.reset(token)
+            self.assertEqual(
+                list(rec.lines("section", iter(["a", "b"]), section="title")), ["a", "b"]
+            )
+            rec.count("hits", 2)
+        finally:
+            rec.disable()
+
+        report = rec.report()
+        block, section = report["records"]
+        self.assertEqual(block["page"], "index.md")
+        self.assertEqual(block["lines"], 3)
+        self.assertEqual(section["lines"], 2)
+        self.assertEqual(section["section"], "title")
+        self.assertEqual(report["stages"]["block"]["count"], 1)
+        self.assertEqual(report["counters"], {"hits": 2})
+        self.assertGreater(report["peak_memory_bytes"], 0)
+        self.assertIn("Slowest blocks:", rec.summary())
+
+
+class TestInstrumentedConversion(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        recorder.reset()
+        recorder.enable()
+
+    def tearDown(self):
+        recorder.disable()
+        recorder.reset()
+        clear_cache()
+
+    def test_conversion_is_recorded(self):
+        source = f"::: mkdocs-action-yml\n    :path: {ACTION}\n    :owner: me\n"
+        Markdown(extensions=[ActionYmlExtension()]).convert(source)
+        Markdown(extensions=[ActionYmlExtension()]).convert(source)
+
+        report = recorder.report()
+        self.assertEqual(report["stages"]["page"]["count"], 2)
+        self.assertEqual(report["stages"]["block"]["count"], 1)
+        self.assertEqual(report["stages"]["load"]["count"], 1)
+        self.assertEqual(
+            {r["section"] for r in report["records"] if r["stage"] == "section"},
+            {"title", "description", "runs", "inputs", "outputs", "usage"},
+        )
+        self.assertEqual(report["counters"]["pages.hit"], 1)
+        self.assertEqual(report["counters"]["bytes_read"], os.path.getsize(ACTION))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "report.json")
+            recorder.write_report(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)["counters"], report["counters"])
+
+
+if __name__ == "__main__":
+    unittest.main()
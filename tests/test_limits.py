@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import yaml
+from markdown import Markdown
+
+from mkdocs_action_yml import ActionYmlExtension, LimitExceeded, clear_cache
+from mkdocs_action_yml._docs import check_file, load_action
+from mkdocs_action_yml._limits import Limits, measure, within_budget
+
+ACTION = """\
+name: Test Action
+description: Test description
+inputs:
+  input1: &input
+    description: Input description
+  input2: *input
+  input3: *input
+runs:
+  using: node20
+  main: index.js
+"""
+
+# Every level refers 9 times to the previous one: 9 ** 9 strings once expanded.
+LAUGHS = "".join(
+    [
+        "name: Laughs\ndescription: d\nruns:\n  using: node20\n  main: index.js\n",
+        "a: &a [lol, lol, lol, lol, lol, lol, lol, lol, lol]\n",
+        *(f"{c}: &{c} [{', '.join(['*' + p] * 9)}]\n" for p, c in zip("abcdefgh", "bcdefghi")),
+    ]
+)
+
+
+class TestMeasure(unittest.TestCase):
+    def test_counts_expanded_nodes(self):
+        usage = measure(10, yaml.safe_load("a: [1, 2, {b: 3}]"))
+        self.assertEqual((usage.bytes, usage.nodes, usage.aliases), (10, 8, 0))
+        self.assertEqual(measure(3, "abc").nodes, 1)
+
+    def test_aliases(self):
+        usage = measure(len(LAUGHS), yaml.safe_load(LAUGHS))
+        self.assertGreater(usage.nodes, 9**9)
+        self.assertEqual(usage.aliases, 8 * 8 + 8)
+
+    def test_recursive_alias(self):
+        usage = measure(0, yaml.safe_load("a: &a [1, *a]"))
+        self.assertEqual((usage.nodes, usage.aliases), (5, 1))
+
+
+class TestLoadActionLimits(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "action.yml")
+        self.write(ACTION)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def write(self, content):
+        with open(self.path, "w") as f:
+            f.write(content)
+
+    def test_max_bytes_skips_reading(self):
+        with patch("builtins.open") as open_:
+            with self.assertRaisesRegex(LimitExceeded, r"over the limit of 100 \(max_bytes\)"):
+                load_action(self.path, limits=Limits(max_bytes=100))
+        open_.assert_not_called()
+        self.assertEqual(load_action(self.path, limits=Limits(max_bytes=1000)).name, "Test Action")
+
+    def test_max_nodes(self):
+        self.write(LAUGHS)
+        with patch("mkdocs_action_yml._docs._from_data") as from_data:
+            with self.assertRaisesRegex(LimitExceeded, r"\(max_nodes\)"):
+                load_action(self.path, limits=Limits(max_nodes=1000))
+        from_data.assert_not_called()
+
+    def test_max_aliases(self):
+        with self.assertRaisesRegex(LimitExceeded, r"uses 2 aliases.*\(max_aliases\)"):
+            load_action(self.path, limits=Limits(max_nodes=100, max_aliases=1))
+        self.assertEqual(load_action(self.path, limits=Limits(max_aliases=2)).name, "Test Action")
+
+    def test_usage_is_cached(self):
+        self.write(LAUGHS)
+        with patch.object(yaml, "load", wraps=yaml.load) as yaml_load:
+            for _ in range(2):
+                with self.assertRaises(LimitExceeded):
+                    load_action(self.path, limits=Limits(max_nodes=1000))
+            self.assertEqual(yaml_load.call_count, 1)
+            # Without limits, the document is converted after all.
+            self.assertEqual(load_action(self.path).name, "Laughs")
+            self.assertEqual(yaml_load.call_count, 2)
+            with self.assertRaises(LimitExceeded):
+                load_action(self.path, limits=Limits(max_nodes=1000))
+
+    def test_check_file(self):
+        self.write(LAUGHS)
+        (message,) = check_file(self.path, limits=Limits(max_nodes=1000))
+        self.assertIn("(max_nodes)", message)
+
+
+class TestBudget(unittest.TestCase):
+    def test_within_budget(self):
+        self.assertEqual(list(within_budget(["a", "b"], "action.yml", 0)), ["a", "b"])
+        with patch("mkdocs_action_yml._limits.time.monotonic", side_effect=[0, 1, 3]):
+            lines = within_budget(["a", "b"], "action.yml", 2)
+            self.assertEqual(next(lines), "a")
+            with self.assertRaisesRegex(LimitExceeded, r"action.yml took more than 2s"):
+                next(lines)
+
+
+class TestPlaceholder(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "action.yml")
+        with open(self.path, "w") as f:
+            f.write(LAUGHS)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def convert(self, **config):
+        source = f"::: mkdocs-action-yml\n    :path: {self.path}\n    :owner: me\n"
+        return Markdown(extensions=[ActionYmlExtension(**config)]).convert(source)
+
+    def test_block_over_limit(self):
+        with self.assertLogs("mkdocs.plugins.mkdocs_action_yml.plugin", "WARNING") as logs:
+            html = self.convert()
+        self.assertIn("This block was not rendered", html)
+        self.assertIn("(max_nodes)", html)
+        self.assertIn("(max_nodes)", logs.output[0])
+        self.assertIn("<h1>Laughs</h1>", self.convert(max_nodes=0))
+
+    def test_block_out_of_time(self):
+        with patch("mkdocs_action_yml._limits.time.monotonic", side_effect=[0] + [100] * 10):
+            with self.assertLogs("mkdocs.plugins.mkdocs_action_yml.plugin", "WARNING"):
+                html = self.convert(max_nodes=0, timeout=1)
+        self.assertIn("took more than 1s to render (timeout)", html)
+        # The next conversion of the page tries again.
+        self.assertIn("<h1>Laughs</h1>", self.convert(max_nodes=0, timeout=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
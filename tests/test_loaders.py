@@ -0,0 +1,172 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from mkdocs_action_yml import MkDocsActionYmlException, clear_cache
+from mkdocs_action_yml._docs import load_action
+from mkdocs_action_yml._loaders import (
+    default_loader,
+    load,
+    resolve_loader,
+    strip_run_scripts,
+)
+
+ACTION = """\
+name: Test Action
+description: Test description
+inputs:
+  input1:
+    description: Input 1 description
+    required: true
+    default: 'on'
+runs:
+  using: composite
+  steps:
+    - run: |
+        echo "hello"
+      shell: bash
+"""
+
+
+class TestLoaders(unittest.TestCase):
+    def test_resolve_auto(self):
+        self.assertEqual(resolve_loader("auto", "action.yml"), default_loader())
+        self.assertEqual(resolve_loader("auto", "action.json"), "json")
+        self.assertEqual(resolve_loader("python", "action.json"), "python")
+
+    def test_resolve_unknown(self):
+        with self.assertRaises(MkDocsActionYmlException):
+            resolve_loader("toml", "action.yml")
+
+    def test_default_without_libyaml(self):
+        with patch.object(yaml, "__with_libyaml__", False):
+            self.assertEqual(resolve_loader("auto", "action.yml"), "python")
+            with self.assertRaises(MkDocsActionYmlException):
+                resolve_loader("libyaml", "action.yml")
+
+    def test_backends_agree(self):
+        expected = yaml.safe_load(ACTION)
+        self.assertEqual(load(ACTION.encode(), "python"), expected)
+        self.assertEqual(load(json.dumps(expected).encode(), "json"), expected)
+        if default_loader() == "libyaml":
+            self.assertEqual(load(ACTION.encode(), "libyaml"), expected)
+
+
+class TestSelectiveLoader(unittest.TestCase):
+    def test_strip_run_scripts(self):
+        source = b"""\
+description: |
+  - run: |
+      kept
+runs:
+  using: composite
+  steps:
+    - run: |
+        echo "a: b"
+          - run: |
+      shell: bash
+    - name: folded
+      run: >-
+        echo b
+
+    - run: echo c
+    - run: &script |
+        echo d
+    - run: *script
+"""
+        self.assertEqual(
+            strip_run_scripts(source),
+            b"""\
+description: |
+  - run: |
+      kept
+runs:
+  using: composite
+  steps:
+    - run: ''
+
+
+      shell: bash
+    - name: folded
+      run: ''
+
+
+    - run: echo c
+    - run: &script |
+        echo d
+    - run: *script
+""",
+        )
+
+    def test_only_steps_are_stripped(self):
+        source = b"""\
+name: a
+description: "multi
+  run: |
+  line"
+inputs:
+  run: |
+    kept
+runs:
+  using: composite
+  steps:
+    - run: |
+        echo
+"""
+        expected = yaml.safe_load(source)
+        self.assertEqual(expected["description"], "multi run: | line")
+        expected["runs"]["steps"][0]["run"] = ""
+        self.assertEqual(load(source, "selective"), expected)
+        self.assertEqual(load(source, "selective")["inputs"], {"run": "kept\n"})
+
+    def test_nothing_to_strip(self):
+        source = b"name: a\ndescription: |\n  run: |\n"
+        self.assertIs(strip_run_scripts(source), source)
+
+    def test_same_action(self):
+        self.assertEqual(resolve_loader("selective", "action.yml"), "selective")
+        expected = yaml.safe_load(ACTION)
+        expected["runs"]["steps"][0]["run"] = ""
+        self.assertEqual(load(ACTION.encode(), "selective"), expected)
+
+    def test_errors_come_from_a_full_load(self):
+        source = b"runs:\n  steps:\n    - run: |\n        echo\n    bad: [\n"
+        with self.assertRaises(yaml.YAMLError) as selective:
+            load(source, "selective")
+        with self.assertRaises(yaml.YAMLError) as full:
+            load(source, default_loader())
+        self.assertEqual(str(selective.exception), str(full.exception))
+
+
+class TestLoadActionWithLoader(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def test_json_metadata(self):
+        path = os.path.join(self.tmpdir.name, "action.json")
+        with open(path, "w") as f:
+            json.dump(yaml.safe_load(ACTION), f)
+        with patch.object(json, "loads", wraps=json.loads) as json_loads:
+            self.assertEqual(load_action(path).name, "Test Action")
+        json_loads.assert_called_once()
+
+    def test_configured_loader(self):
+        path = os.path.join(self.tmpdir.name, "action.yml")
+        with open(path, "w") as f:
+            f.write(ACTION)
+        with patch.object(yaml, "load", wraps=yaml.load) as yaml_load:
+            load_action(path, loader="python")
+        self.assertIs(yaml_load.call_args.kwargs["Loader"], yaml.SafeLoader)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from markdown import Markdown
+from mkdocs.commands.build import build
+from mkdocs.config import load_config
+from mkdocs.exceptions import PluginError
+from mkdocs.structure.files import get_files
+
+from mkdocs_action_yml import ActionYmlExtension, _cache, clear_cache, mkdocs_plugin, plugin
+from mkdocs_action_yml.mkdocs_plugin import prerender
+
+from helpers import TempDirTestCase, write, write_action
+
+MKDOCS_YML = """\
+site_name: Test
+markdown_extensions:
+  - mkdocs-action-yml:
+      loader: python
+plugins:
+  - mkdocs-action-yml:
+      workers: 2
+"""
+
+
+class TestActionYmlPlugin(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        write("mkdocs.yml", MKDOCS_YML)
+        for i in range(3):
+            write(
+                f"actions/a{i}/action.yml",
+                f"name: Action {i}\ndescription: d\nruns:\n  using: node20\n  main: index.js\n",
+            )
+        for i in range(6):
+            write(
+                f"docs/page{i}.md",
+                f"# Page {i}\n\n::: mkdocs-action-yml\n    :path: actions/a{i % 3}/action.yml\n"
+                "    :owner: me\n",
+            )
+        write("docs/index.md", "# No blocks here\n")
+
+    def test_on_files_prerenders_blocks(self):
+        config = load_config("mkdocs.yml")
+        action_plugin = config["plugins"]["mkdocs-action-yml"]
+        action_plugin.on_config(config)
+        self.assertEqual(action_plugin.extension_config["loader"], "python")
+
+        action_plugin.on_files(get_files(config), config=config)
+        self.assertEqual(len(_cache.rendered), 3)
+
+        # Converting the pages doesn't render anything anymore.
+        with patch.object(plugin, "make_action_docs") as make_action_docs:
+            md = Markdown(extensions=[ActionYmlExtension(loader="python")])
+            with open("docs/page4.md") as f:
+                html = md.convert(f.read())
+        make_action_docs.assert_not_called()
+        self.assertIn("<h1>Action 1</h1>", html)
+
+    def test_watches_action_files(self):
+        config = load_config("mkdocs.yml")
+        action_plugin = config["plugins"]["mkdocs-action-yml"]
+        action_plugin.on_config(config)
+        action_plugin.on_files(get_files(config), config=config)
+        self.assertEqual(
+            action_plugin.dependents[os.path.abspath("actions/a1/action.yml")],
+            {"page1.md", "page4.md"},
+        )
+
+        server = Mock()
+        action_plugin.on_serve(server, config=config, builder=None)
+        watched = sorted(c.args[0] for c in server.watch.call_args_list)
+        self.assertEqual(watched, [os.path.abspath(f"actions/a{i}/action.yml") for i in range(3)])
+
+        # Rebuilds only watch files that are new.
+        write_action("actions/a3/action.yml", "Action 3")
+        write("docs/page6.md", "::: mkdocs-action-yml\n    :path: actions/a3/action.yml\n")
+        action_plugin.on_files(get_files(config), config=config)
+        self.assertEqual(server.watch.call_count, 4)
+
+
+class TestPrerender(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "action.yml")
+        write(self.path, "name: Action\ndescription: d\nruns:\n  using: node20\n  main: index.js\n")
+        self.config = ActionYmlExtension().getConfigs()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def test_deduplicates_blocks(self):
+        blocks = [{"path": self.path, "owner": "me"}] * 5 + [
+            {"path": self.path, "owner": "me", "version": "v1"}
+        ]
+        self.assertEqual(prerender(self.config, blocks, workers=2), 2)
+        self.assertEqual(prerender(self.config, blocks, workers=2), 0)
+
+    def test_skips_broken_blocks(self):
+        blocks = [
+            {"path": os.path.join(self.tmpdir.name, "missing.yml"), "owner": "me"},
+            {"path": self.path},
+            {"path": self.path, "owner": "me"},
+        ]
+        self.assertEqual(prerender(self.config, blocks), 1)
+
+    def test_process_pool(self):
+        blocks = [{"path": self.path, "owner": "me"}]
+        self.assertEqual(prerender(self.config, blocks, workers=1, executor="process"), 1)
+        lines = list(plugin.replace_command_docs(self.config, path=self.path, owner="me"))
+        self.assertEqual(lines[0], "# Action")
+
+
+class TestGeneratedPages(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            write(
+                f"actions/a{i}/action.yml",
+                f"name: Action {i}\ndescription: d\nruns:\n  using: node20\n  main: index.js\n",
+            )
+        write("docs/index.md", "# Home\n")
+        write("docs/reference/actions/a2.md", "# Hand-written\n")
+
+    def load_config(self, extra=""):
+        write(
+            "mkdocs.yml",
+            "site_name: Test\n"
+            "plugins:\n"
+            "  - mkdocs-action-yml:\n"
+            "      pages: ['actions/*/action.yml']\n"
+            "      pages_dir: reference\n"
+            "      pages_owner: me\n" + extra,
+        )
+        return load_config("mkdocs.yml")
+
+    def test_generates_pages_lazily(self):
+        config = self.load_config()
+        action_plugin = config["plugins"]["mkdocs-action-yml"]
+        # Through the plugin collection, which tells generated files their plugin.
+        config = config["plugins"].on_config(config)
+        files = config["plugins"].on_files(get_files(config), config=config)
+        file = files.get_file_from_path("reference/actions/a0.md")
+        self.assertIn(f":path: {os.path.abspath('actions/a0/action.yml')}", file.content_string)
+        self.assertEqual(file.generated_by, "mkdocs-action-yml")
+        # The hand-written page wins.
+        self.assertIsNone(files.get_file_from_path("reference/actions/a2.md").generated_by)
+        self.assertEqual(
+            action_plugin.dependents[os.path.abspath("actions/a1/action.yml")],
+            {"reference/actions/a1.md"},
+        )
+        # Nothing is rendered before the pages are built.
+        self.assertEqual(len(_cache.rendered), 0)
+
+    def test_build(self):
+        build(self.load_config())
+        with open("site/reference/actions/a1/index.html") as f:
+            self.assertIn('<h1 id="action-1">Action 1</h1>', f.read())
+
+    def test_is_modified(self):
+        config = self.load_config()
+        build(config)
+        files = config["plugins"].on_files(get_files(config), config=config)
+        file = files.get_file_from_path("reference/actions/a0.md")
+        self.assertFalse(file.is_modified())
+        st = os.stat(file.abs_dest_path)
+        os.utime("actions/a0/action.yml", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertTrue(file.is_modified())
+
+    def test_nav(self):
+        config = self.load_config("      pages_nav: Actions\nnav:\n  - index.md\n")
+        config = config["plugins"].on_config(config)
+        config["plugins"].on_files(get_files(config), config=config)
+        self.assertEqual(
+            config["nav"],
+            [
+                "index.md",
+                {"Actions": ["reference/actions/a0.md", "reference/actions/a1.md"]},
+            ],
+        )
+
+    def test_owner_is_required(self):
+        config = self.load_config()
+        config["plugins"]["mkdocs-action-yml"].config["pages_owner"] = ""
+        with self.assertRaises(PluginError):
+            config["plugins"]["mkdocs-action-yml"].on_config(config)
+
+    def test_requires_mkdocs_1_6(self):
+        config = self.load_config()
+        # Files of MkDocs before 1.6 can't be generated.
+        with patch.object(mkdocs_plugin, "File", type("File", (), {})):
+            with self.assertRaisesRegex(PluginError, "requires MkDocs 1.6"):
+                config["plugins"]["mkdocs-action-yml"].on_config(config)
+
+
+if __name__ == "__main__":
+    unittest.main()
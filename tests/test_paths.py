@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import yaml
+from markdown import Markdown
+from mkdocs.commands.build import build
+from mkdocs.config import load_config
+from mkdocs.structure.files import get_files
+
+from mkdocs_action_yml import ActionYmlExtension, _cache, clear_cache, plugin
+from mkdocs_action_yml._cache import file_key
+from mkdocs_action_yml._docs import load_action
+from mkdocs_action_yml._paths import page_dirs, resolve_path, search_dirs
+
+from helpers import TempDirTestCase, write_action
+
+
+class TestResolvePath(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        self.docs = os.path.join(self.root, "docs")
+        write_action(os.path.join(self.docs, "guide", "action.yml"), "Page")
+        write_action(os.path.join(self.docs, "action.yml"), "Docs")
+        write_action(os.path.join(self.docs, "other.yml"), "Other")
+        token = search_dirs.set(page_dirs(self.docs, os.path.join("guide", "index.md")))
+        self.addCleanup(search_dirs.reset, token)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def test_page_then_docs_then_base_dir(self):
+        self.assertEqual(resolve_path("action.yml"), os.path.join(self.docs, "guide", "action.yml"))
+        self.assertEqual(resolve_path("../other.yml"), os.path.join(self.docs, "other.yml"))
+        self.assertEqual(resolve_path("other.yml"), os.path.join(self.docs, "other.yml"))
+        self.assertEqual(resolve_path("missing.yml"), "missing.yml")
+        self.assertEqual(resolve_path("missing.yml", "/base"), os.path.join("/base", "missing.yml"))
+        self.assertEqual(resolve_path("/abs/action.yml"), "/abs/action.yml")
+
+    def test_cached_per_directory_and_path(self):
+        with patch("os.path.isfile", wraps=os.path.isfile) as isfile:
+            for _ in range(3):
+                resolve_path("other.yml")
+        self.assertEqual(isfile.call_count, 2)
+
+    def test_cached_apart_from_glob_matches(self):
+        _cache.discovered.put("glob", ["action.yml"])
+        for i in range(_cache.discovered.max_entries + 1):
+            resolve_path(f"missing{i}.yml")
+        self.assertEqual(_cache.discovered.get("glob"), ["action.yml"])
+
+
+class TestFileIdentity(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "shared", "action.yml")
+        write_action(self.path, "Shared")
+        self.link = os.path.join(self.tmpdir.name, "linked")
+        os.symlink(os.path.dirname(self.path), self.link)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def test_same_file_same_key(self):
+        other = os.path.join(self.link, "..", "linked", "action.yml")
+        self.assertEqual(file_key(self.path), file_key(other))
+
+    def test_loaded_once_whatever_the_path(self):
+        paths = [
+            self.path,
+            os.path.join(self.link, "action.yml"),
+            os.path.join(self.tmpdir.name, "shared", "..", "shared", "action.yml"),
+            os.path.relpath(self.path),
+        ]
+        with patch.object(yaml, "load", wraps=yaml.load) as yaml_load:
+            names = {load_action(path).name for path in paths}
+        self.assertEqual(names, {"Shared"})
+        yaml_load.assert_called_once()
+
+
+class TestBlockPaths(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        with open("mkdocs.yml", "w") as f:
+            f.write("site_name: Test\nplugins:\n  - mkdocs-action-yml\n")
+        write_action("docs/guide/action.yml", "Page")
+        write_action("actions/build/action.yml", "Build")
+        with open("docs/guide/index.md", "w") as f:
+            f.write("::: mkdocs-action-yml\n    :path: action.yml\n    :owner: me\n")
+
+    def test_base_dir(self):
+        os.chdir("docs")
+        source = "::: mkdocs-action-yml\n    :path: actions/build/action.yml\n    :owner: me\n"
+        extension = ActionYmlExtension(base_dir=self.tmpdir.name)
+        self.assertIn("<h1>Build</h1>", Markdown(extensions=[extension]).convert(source))
+
+    def test_plugin_prerenders_page_relative_paths(self):
+        config = load_config("mkdocs.yml")
+        action_plugin = config["plugins"]["mkdocs-action-yml"]
+        action_plugin.on_config(config)
+        files = action_plugin.on_files(get_files(config), config=config)
+        self.assertEqual(
+            list(action_plugin.dependents),
+            [os.path.join(config["docs_dir"], "guide", "action.yml")],
+        )
+
+        page = Mock(file=files.get_file_from_path("guide/index.md"))
+        action_plugin.on_page_markdown("", page=page, config=config, files=files)
+        with patch.object(plugin, "make_action_docs") as make_action_docs:
+            with open("docs/guide/index.md") as f:
+                html = Markdown(extensions=[ActionYmlExtension()]).convert(f.read())
+        action_plugin.on_post_build(config)
+        make_action_docs.assert_not_called()
+        self.assertIn("<h1>Page</h1>", html)
+
+    def test_identical_pages_embed_their_own_files(self):
+        with open("mkdocs.yml", "a") as f:
+            f.write("markdown_extensions:\n  - mkdocs-action-yml\n")
+        for name in ("a", "b"):
+            write_action(f"docs/{name}/action.yml", f"Action {name.upper()}")
+            with open(f"docs/{name}/index.md", "w") as f:
+                f.write("::: mkdocs-action-yml\n    :path: action.yml\n    :owner: me\n")
+        build(load_config("mkdocs.yml"))
+        for name in ("a", "b"):
+            with open(f"site/{name}/index.html") as f:
+                self.assertIn(f"Action {name.upper()}</h1>", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
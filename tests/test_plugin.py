@@ -1,9 +1,12 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
 
 from markdown import Markdown
 from markdown.extensions.attr_list import AttrListExtension
 
+from mkdocs_action_yml import clear_cache
 from mkdocs_action_yml.plugin import ActionYmlExtension, ActionYmlPreprocessor
 
 
@@ -53,5 +56,97 @@ class TestActionYmlPreprocessor(unittest.TestCase):
                 mock_replace_func.assert_called_once()
 
 
+class TestActionYmlPreprocessorMemo(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name in ("a", "b"):
+            path = os.path.join(self.tmpdir.name, f"{name}.yml")
+            with open(path, "w") as f:
+                f.write(f"name: {name}\n")
+            self.paths.append(path)
+        self.replace_func = Mock(side_effect=lambda **options: [options["path"]])
+        self.preprocessor = ActionYmlPreprocessor(
+            Markdown(), replace_func=self.replace_func, memo_key="test"
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def page(self, path):
+        return ["# Page", "::: mkdocs-action-yml", f"    :path: {path}", "    :owner: me"]
+
+    def test_unchanged_page_is_not_rendered_again(self):
+        first = self.preprocessor.run(self.page(self.paths[0]))
+        second = self.preprocessor.run(self.page(self.paths[0]))
+        self.assertEqual(first, second)
+        self.assertEqual(self.replace_func.call_count, 1)
+
+    def test_only_pages_embedding_a_changed_action_are_rendered_again(self):
+        self.preprocessor.run(self.page(self.paths[0]))
+        self.preprocessor.run(self.page(self.paths[1]))
+        with open(self.paths[0], "a") as f:
+            f.write("description: changed\n")
+        self.preprocessor.run(self.page(self.paths[0]))
+        self.preprocessor.run(self.page(self.paths[1]))
+        rendered = [c.kwargs["path"] for c in self.replace_func.call_args_list]
+        self.assertEqual(rendered, [self.paths[0], self.paths[1], self.paths[0]])
+
+
+class TestHtmlOutput(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "action.yml")
+        with open(self.path, "w") as f:
+            f.write(
+                "name: Test\n"
+                "description: About\n"
+                "inputs:\n"
+                "  token:\n"
+                "    description: A <secret> & more\n"
+                "    default: '|'\n"
+                "runs:\n"
+                "  using: node20\n"
+            )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def convert(self, source, **config):
+        extensions = [ActionYmlExtension(**config), "tables", "fenced_code", "admonition"]
+        return Markdown(extensions=extensions).convert(source)
+
+    def test_html_tables_and_usage(self):
+        source = f"::: mkdocs-action-yml\n    :path: {self.path}\n    :owner: me\n"
+        html = self.convert(source, output="html")
+        self.assertIn("<h2>Inputs</h2>", html)
+        self.assertIn("<td>[optional] A &lt;secret&gt; &amp; more</td>", html)
+        self.assertIn("<td><code>|</code></td>", html)
+        self.assertIn('<pre><code class="language-yaml">name: Example usage', html)
+        self.assertNotIn("<p>", html.split("<h2>Inputs</h2>")[1])
+        # The cached page must be stashed again in every new Markdown instance.
+        self.assertEqual(self.convert(source, output="html"), html)
+        self.assertIn("<td>[optional] A <secret> &amp; more</td>", self.convert(source))
+
+    def test_sections_option(self):
+        source = (
+            f"::: mkdocs-action-yml\n    :path: {self.path}\n    :owner: me\n"
+            "    :sections: [inputs]\n"
+        )
+        html = self.convert(source)
+        self.assertIn("<h2>Inputs</h2>", html)
+        self.assertNotIn("<h1>", html)
+        self.assertNotIn("Usage", html)
+
+    def test_indented_block(self):
+        source = f"!!! note\n\n    ::: mkdocs-action-yml\n        :path: {self.path}\n        :owner: me\n"
+        html = self.convert(source, output="html")
+        self.assertIn("<table>", html.split('<div class="admonition note">')[1])
+
+
 if __name__ == "__main__":
     unittest.main()
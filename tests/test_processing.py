@@ -1,7 +1,70 @@
+import random
+import re
 import unittest
 from textwrap import dedent
 
-from mkdocs_action_yml._processing import replace_blocks
+from mkdocs_action_yml._processing import BlockScanner, parse_value, replace_blocks
+
+
+def legacy_replace_blocks(lines, title, replace):
+    """
+    The per-line regex implementation that `BlockScanner` replaced, kept as a reference.
+
+    Option lines follow the current syntax: the value is the rest of the line, parsed by
+    `parse_value()`.
+    """
+    options = {}
+    in_block_section = False
+
+    for line in lines:
+        if in_block_section:
+            match = re.search(r"^\s+:(?P<key>[^:]+):(?:\s+(?P<value>.*))?", line)
+            if match is not None:
+                options[match.group("key")] = parse_value(match.group("value") or "")
+                continue
+
+            in_block_section = False
+            yield from replace(**options)
+            yield line
+            continue
+
+        match = re.search(rf"^::: {title}", line)
+        if match is not None:
+            in_block_section = True
+            options = {}
+        else:
+            yield line
+
+    if in_block_section:
+        yield from replace(**options)
+
+
+def random_page(rng, n_segments):
+    lines = []
+    for _ in range(n_segments):
+        kind = rng.random()
+        if kind < 0.6:
+            lines.append(
+                rng.choice(
+                    ["", "# Heading", "text ::: inline", "    code", "> quote", "    ::: target"]
+                )
+            )
+        elif kind < 0.8:
+            lines.append(rng.choice(["::: target", "::: plugin", "::: target  "]))
+            for i in range(rng.randrange(4)):
+                lines.append(
+                    rng.choice(["    ", "\t", "  "])
+                    + f":key{i}:"
+                    + rng.choice(
+                        ["", " value", " True", "  spaced value", " a:b", ' "quoted"', " [a, b]"]
+                    )
+                )
+            # The legacy scanner passes a header that directly ends a block through verbatim. Pages
+            # have no container, where indented headers would be blocks rather than code.
+            lines.append("after block")
+        else:
+            lines.append("    :stray: option")
+    return lines
 
 
 class TestReplaceOptions(unittest.TestCase):
@@ -93,5 +156,156 @@ class TestReplaceOptions(unittest.TestCase):
         self.assertEqual(output, expected.splitlines())
 
 
+class TestOptionValues(unittest.TestCase):
+    def test_parse_value(self):
+        self.assertEqual(parse_value(""), "")
+        self.assertEqual(parse_value("value"), "value")
+        self.assertEqual(parse_value("  several words  "), "several words")
+        self.assertEqual(parse_value("a:b"), "a:b")
+        self.assertIs(parse_value("True"), True)
+        self.assertIs(parse_value("false"), False)
+        self.assertEqual(parse_value('"true"'), "true")
+        self.assertEqual(parse_value("'it is'"), "it is")
+        self.assertEqual(parse_value('"unbalanced'), '"unbalanced')
+        self.assertEqual(parse_value("[inputs, outputs]"), ("inputs", "outputs"))
+        self.assertEqual(parse_value("[a, \"b, c\", 'd e']"), ("a", "b, c", "d e"))
+        self.assertEqual(parse_value("[]"), ())
+
+    def test_block_options(self):
+        source = dedent(
+            """
+            ::: target
+                :title: My action
+                :quoted: "  padded  "
+                :sections: [inputs, usage]
+                :flag: true
+            """
+        ).strip()
+
+        blocks = []
+        BlockScanner({"target": lambda **options: blocks.append(options) or []}).process(
+            source.splitlines()
+        )
+        self.assertEqual(
+            blocks,
+            [
+                {
+                    "title": "My action",
+                    "quoted": "  padded  ",
+                    "sections": ("inputs", "usage"),
+                    "flag": True,
+                }
+            ],
+        )
+
+
+class TestBlockScanner(unittest.TestCase):
+    def test_matches_legacy_implementation(self):
+        rng = random.Random(1234)
+        replace = lambda **options: [f"> {sorted(options.items())}", ""]
+        for _ in range(300):
+            page = random_page(rng, rng.randrange(1, 40))
+            self.assertEqual(
+                list(replace_blocks(page, title="target", replace=replace)),
+                list(legacy_replace_blocks(page, title="target", replace=replace)),
+                page,
+            )
+
+    def test_page_without_marker_is_passed_through(self):
+        calls = []
+        scanner = BlockScanner({"target": lambda **options: calls.append(options) or []})
+        lines = ["# Title", "    :not: an option"]
+        self.assertEqual(list(scanner.scan(lines)), lines)
+        self.assertEqual(calls, [])
+
+    def test_nested_block(self):
+        source = dedent(
+            """
+            !!! note
+                Some text
+                ::: target
+                    :path: action.yml
+                    :flag: true
+                :outdented: value
+            """
+        ).strip()
+
+        expected = dedent(
+            """
+            !!! note
+                Some text
+                {'path': 'action.yml', 'flag': True}
+
+                :outdented: value
+            """
+        ).strip()
+
+        scanner = BlockScanner({"target": lambda **options: [str(options), ""]})
+        self.assertEqual(list(scanner.scan(source.splitlines())), expected.splitlines())
+
+    def test_indented_code_block_unchanged(self):
+        source = dedent(
+            """
+            Write a block like this:
+
+                ::: target
+                    :path: action.yml
+
+            !!! note
+                Some text
+
+                    ::: target
+            """
+        ).strip()
+
+        scanner = BlockScanner({"target": lambda **options: [str(options)]})
+        self.assertEqual(list(scanner.scan(source.splitlines())), source.splitlines())
+
+    def test_block_in_list_item(self):
+        source = dedent(
+            """
+            1. First
+
+                ::: target
+                    :path: action.yml
+            2. Second
+            """
+        ).strip()
+
+        scanner = BlockScanner({"target": lambda **options: [str(options)]})
+        self.assertEqual(
+            list(scanner.scan(source.splitlines())),
+            ["1. First", "", "    {'path': 'action.yml'}", "2. Second"],
+        )
+
+    def test_other_marker_is_passed_through(self):
+        scanner = BlockScanner({"target": lambda **options: []})
+        lines = ["# API", "::: package.module"]
+        self.assertFalse(scanner.has_marker("\n".join(lines)))
+        self.assertIs(scanner.process(lines), lines)
+
+    def test_multiple_titles(self):
+        source = dedent(
+            """
+            ::: first
+                :a: 1
+            ::: second
+                :b: 2
+            ::: first-not-registered
+            """
+        ).strip()
+
+        scanner = BlockScanner(
+            {
+                "first": lambda **options: [f"first {options}"],
+                "second": lambda **options: [f"second {options}"],
+            }
+        )
+        self.assertEqual(
+            list(scanner.scan(source.splitlines())),
+            ["first {'a': '1'}", "second {'b': '2'}", "::: first-not-registered"],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
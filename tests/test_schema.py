@@ -0,0 +1,160 @@
+import os
+import unittest
+from unittest.mock import patch
+
+import yaml
+from mkdocs.config import load_config
+from mkdocs.exceptions import PluginError
+from mkdocs.structure.files import get_files
+
+from mkdocs_action_yml import MkDocsActionYmlException, _loaders, clear_cache
+from mkdocs_action_yml._docs import check_file, load_action
+from mkdocs_action_yml._schema import validate
+
+from helpers import TempDirTestCase, write
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ACTION = os.path.join(SCRIPT_DIR, "fixtures", "action.yml")
+
+INVALID = """\
+name: Broken
+inputs:
+  token:
+    required: maybe
+    default: [1, 2]
+  level: 3
+runs:
+  using: composite
+  steps:
+    - name: Neither run nor uses
+    - run: echo hello
+      shell: bash
+      colour: red
+"""
+
+WARNED = """\
+name: Warned
+description: Renders in spite of its errors
+inputs:
+  token:
+    required: maybe
+    colour: red
+runs:
+  using: node20
+  main: index.js
+"""
+
+
+class TestValidate(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        write("invalid.yml", INVALID)
+
+    def test_valid(self):
+        with open(ACTION) as f:
+            self.assertEqual(validate(yaml.safe_load(f), strict=True), [])
+
+    def test_every_error_is_reported_with_its_line(self):
+        self.assertEqual(
+            check_file("invalid.yml"),
+            [
+                "invalid.yml:1: missing required key 'description'",
+                "invalid.yml:4: inputs.token.required: expected a boolean, got str 'maybe'",
+                "invalid.yml:5: inputs.token.default: expected a scalar, got a list",
+                "invalid.yml:6: inputs.level: expected a mapping, got int 3",
+                "invalid.yml:10: runs.steps[0]: expected exactly one of 'run', 'uses'",
+            ],
+        )
+
+    def test_strict_reports_unknown_keys(self):
+        self.assertIn(
+            "invalid.yml:13: runs.steps[1].colour: unknown key 'colour'",
+            check_file("invalid.yml", strict=True),
+        )
+
+    def test_shares_the_parse_of_load_action(self):
+        write("valid.yml", "name: n\ndescription: d\nruns:\n  using: node20\n  main: index.js\n")
+        load_action("valid.yml")
+        with patch.object(yaml, "load", wraps=yaml.load) as yaml_load:
+            self.assertEqual(check_file("valid.yml", strict=True), [])
+        yaml_load.assert_not_called()
+
+    def test_parse_error(self):
+        write("unparsable.yml", "name: [\n")
+        (message,) = check_file("unparsable.yml")
+        self.assertTrue(message.startswith("unparsable.yml: can't be parsed"))
+
+    def test_load_action_explains_invalid_files(self):
+        write("nameless.yml", "description: d\nruns:\n  using: node20\n  main: index.js\n")
+        with self.assertRaisesRegex(
+            MkDocsActionYmlException, "nameless.yml:1: missing required key 'name'"
+        ):
+            load_action("nameless.yml")
+
+
+class TestPluginValidation(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        write("invalid.yml", INVALID)
+        write("nameless.yml", "description: d\nruns:\n  using: node20\n  main: index.js\n")
+        for i, path in enumerate(("invalid.yml", "nameless.yml")):
+            write(f"docs/page{i}.md", f"::: mkdocs-action-yml\n    :path: {path}\n    :owner: me\n")
+
+    def on_files(self, mode, extension="", plugin=""):
+        write(
+            "mkdocs.yml",
+            "site_name: Test\n"
+            f"markdown_extensions:\n  - mkdocs-action-yml{extension}\n"
+            f"plugins:\n  - mkdocs-action-yml:\n      validate: {mode}\n{plugin}",
+        )
+        config = load_config("mkdocs.yml")
+        action_plugin = config["plugins"]["mkdocs-action-yml"]
+        action_plugin.on_config(config)
+        action_plugin.on_files(get_files(config), config=config)
+
+    def test_strict(self):
+        with self.assertRaises(PluginError) as cm:
+            self.on_files("strict")
+        message = str(cm.exception)
+        self.assertIn("invalid.yml:6: inputs.level", message)
+        self.assertIn("nameless.yml:1: missing required key 'name'", message)
+
+    def test_lenient(self):
+        with self.assertLogs("mkdocs.plugins.mkdocs_action_yml.mkdocs_plugin", "WARNING") as cm:
+            self.on_files("lenient")
+        self.assertEqual(len(cm.output), 6)
+
+    def write_rendered(self):
+        """Replace the pages by blocks of files that render in spite of their errors."""
+        for i in range(2):
+            write(f"warned{i}.yml", WARNED)
+            write(
+                f"docs/page{i}.md",
+                f"::: mkdocs-action-yml\n    :path: warned{i}.yml\n    :owner: me\n",
+            )
+
+    def test_rendered_blocks_are_not_parsed_again(self):
+        self.write_rendered()
+        with patch.object(_loaders, "load", wraps=_loaders.load) as load:
+            with self.assertLogs("mkdocs.plugins.mkdocs_action_yml.mkdocs_plugin") as cm:
+                self.on_files("lenient", plugin="      executor: process\n      workers: 2\n")
+        # Parsed by the worker processes only.
+        load.assert_not_called()
+        self.assertIn("warned0.yml:5: inputs.token.required: expected a boolean", cm.output[0])
+        self.assertEqual(len(cm.output), 2)
+
+    def test_store_hit_keeps_errors(self):
+        self.write_rendered()
+        cache = ":\n      cache_dir: cache\n"
+        with self.assertLogs("mkdocs.plugins.mkdocs_action_yml.mkdocs_plugin"):
+            self.on_files("lenient", extension=cache)
+        clear_cache()
+        with patch.object(_loaders, "load", wraps=_loaders.load) as load:
+            with self.assertRaises(PluginError) as cm:
+                self.on_files("strict", extension=cache)
+        load.assert_not_called()
+        self.assertIn("warned1.yml:6: inputs.token.colour: unknown key 'colour'", str(cm.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from mkdocs_action_yml import clear_cache, plugin
+from mkdocs_action_yml._store import RenderStore, render_key
+
+from helpers import write_action
+
+ACTION = "name: Stored\ndescription: d\nruns:\n  using: node20\n"
+
+
+class TestRenderKey(unittest.TestCase):
+    def test_depends_on_every_input(self):
+        base = render_key(b"a", "owner", "v1", {"path": "action.yml"})
+        self.assertEqual(base, render_key(b"a", "owner", "v1", {"path": "action.yml"}))
+        self.assertNotEqual(base, render_key(b"b", "owner", "v1", {"path": "action.yml"}))
+        self.assertNotEqual(base, render_key(b"a", "other", "v1", {"path": "action.yml"}))
+        self.assertNotEqual(base, render_key(b"a", "owner", "v2", {"path": "action.yml"}))
+        self.assertNotEqual(base, render_key(b"a", "owner", "v1", {"path": "x/action.yml"}))
+
+
+class TestRenderStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        store = RenderStore(self.tmpdir.name)
+        self.assertIsNone(store.get("k"))
+        store.put("k", ["# Title", ""])
+        self.assertEqual(store.get("k"), ["# Title", ""])
+        # A second process (here: a second connection) sees the same entries.
+        self.assertEqual(RenderStore(self.tmpdir.name).get("k"), ["# Title", ""])
+
+    def test_evicts_least_recently_used(self):
+        store = RenderStore(self.tmpdir.name, max_bytes=300)
+        for i in range(20):
+            store.put(f"k{i}", [f"line {i} " + os.urandom(16).hex()])
+        self.assertLess(len(store), 20)
+        self.assertIsNotNone(store.get("k19"))
+        self.assertIsNone(store.get("k0"))
+
+    def test_concurrent_writers(self):
+        def write(n):
+            store = RenderStore(self.tmpdir.name)
+            for i in range(25):
+                store.put(f"{n}-{i}", [str(i)])
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(RenderStore(self.tmpdir.name)), 100)
+
+    def test_forked_child_opens_its_own_connection(self):
+        store = RenderStore(self.tmpdir.name)
+        store.put("k", ["# Title"])
+        parent = store._connect()
+        with patch("os.getpid", return_value=-1):
+            self.assertEqual(store.get("k"), ["# Title"])
+            child = store._connect()
+            self.assertIsNot(child, parent)
+            child.close()
+        parent.close()
+
+
+class TestReplaceCommandDocsWithStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "action.yml")
+        with open(self.path, "w") as f:
+            f.write(ACTION)
+        self.config = {
+            "cache_dir": os.path.join(self.tmpdir.name, "cache"),
+            "cache_max_bytes": 2**20,
+        }
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_skips_rendering_on_hit(self):
+        first = list(plugin.replace_command_docs(self.config, path=self.path, owner="me"))
+        clear_cache()
+        with patch.object(plugin, "make_action_docs") as make_action_docs:
+            second = list(plugin.replace_command_docs(self.config, path=self.path, owner="me"))
+        make_action_docs.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(first[0], "# Stored")
+
+    def test_shared_by_checkouts_in_other_directories(self):
+        self.addCleanup(os.chdir, os.getcwd())
+        blocks = []
+        for checkout in ("one", "two"):
+            root = os.path.join(os.path.realpath(self.tmpdir.name), checkout)
+            write_action(os.path.join(root, "action.yml"), "Composite", uses=["./sub"])
+            write_action(os.path.join(root, "sub", "action.yml"), "Sub")
+            os.chdir(root)
+            clear_cache()
+            with patch.object(plugin, "make_action_docs", wraps=plugin.make_action_docs) as make:
+                path = os.path.join(root, "action.yml")
+                blocks.append(plugin.render_block(self.config, path=path, owner="me"))
+        make.assert_not_called()
+        self.assertEqual(blocks[0].lines, blocks[1].lines)
+        self.assertEqual(
+            [path for path, _ in blocks[1].local],
+            [os.path.join(root, "sub", "action.yml")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
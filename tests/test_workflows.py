@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import yaml
+from markdown import Markdown
+
+from mkdocs_action_yml import ActionYmlExtension, _cache, clear_cache
+from mkdocs_action_yml._docs import make_action_docs
+from mkdocs_action_yml._workflows import (
+    find_examples,
+    normalize_uses,
+    workflow_index,
+    workflow_root,
+)
+
+CI = """\
+on: push
+jobs:
+  build:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+      - name: Build
+        uses: ./actions/build
+        with:
+          target: release  # the real one
+
+      # Docker actions are not indexed.
+      - uses: docker://alpine:3
+  publish:
+    steps:
+      - uses: Me/Repo/actions/build@v2
+        with:
+          target: |
+            debug
+            release
+"""
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def touch(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+class TestWorkflows(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self.tmpdir.name)
+        os.mkdir(os.path.join(self.root, ".git"))
+        self.workflows = os.path.join(self.root, ".github", "workflows")
+        write(os.path.join(self.workflows, "ci.yml"), CI)
+        write(os.path.join(self.workflows, "other.yaml"), "jobs:\n  a:\n    steps: [{run: ls}]\n")
+        write(os.path.join(self.workflows, "broken.yml"), "jobs: [\n")
+        self.action = os.path.join(self.root, "actions", "build", "action.yml")
+        write(
+            self.action,
+            "name: Build\ndescription: d\ninputs:\n  target:\n    description: t\n"
+            "runs:\n  using: node20\n  main: index.js\n",
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        clear_cache()
+
+    def test_normalize_uses(self):
+        self.assertEqual(normalize_uses("./actions/build/"), "./actions/build")
+        self.assertEqual(normalize_uses("./"), "./.")
+        self.assertEqual(normalize_uses("Me/Repo/Sub/Dir@v1"), "me/repo/Sub/Dir")
+        self.assertEqual(normalize_uses("actions/checkout@v4"), "actions/checkout")
+
+    def test_index(self):
+        self.assertEqual(workflow_root(self.action), self.root)
+        index = workflow_index(self.root)
+        self.assertEqual(
+            sorted(index.steps), ["./actions/build", "actions/checkout", "me/repo/actions/build"]
+        )
+        (step,) = index.steps["./actions/build"]
+        self.assertEqual((step.workflow, step.job), (".github/workflows/ci.yml", "build"))
+        self.assertEqual(
+            step.snippet,
+            "- name: Build\n  uses: ./actions/build\n  with:\n    target: release  # the real one",
+        )
+        (step,) = index.steps["me/repo/actions/build"]
+        self.assertEqual(step.snippet.splitlines()[-1], "      release")
+
+    def test_find_examples(self):
+        steps = find_examples(self.action, "me", 5)
+        self.assertEqual([step.job for step in steps], ["build", "publish"])
+        self.assertEqual(len(find_examples(self.action, "me/repo", 5)), 2)
+        self.assertEqual(len(find_examples(self.action, "me/other", 5)), 1)
+        self.assertEqual(len(find_examples(self.action, "me", 1)), 1)
+
+    def test_index_is_built_once_per_build_and_rescans_modified_files(self):
+        with patch.object(yaml, "compose", wraps=yaml.compose) as compose:
+            workflow_index(self.root)
+            workflow_index(self.root)
+            self.assertEqual(compose.call_count, 3)
+
+            # A new build: only the modified file is read again.
+            touch(os.path.join(self.workflows, "other.yaml"))
+            _cache.discovered.clear()
+            workflow_index(self.root)
+            self.assertEqual(compose.call_count, 4)
+
+    def test_usage_examples(self):
+        lines = list(make_action_docs(self.action, "me", sections="usage", examples=1))
+        self.assertEqual(
+            lines,
+            [
+                "## Usage",
+                "",
+                "```yaml",
+                "# .github/workflows/ci.yml, job build",
+                "- name: Build",
+                "  uses: ./actions/build",
+                "  with:",
+                "    target: release  # the real one",
+                "```",
+                "",
+            ],
+        )
+        # Without any matching step, the usage example is made up.
+        other = os.path.join(self.root, "actions", "other", "action.yml")
+        with open(self.action) as f:
+            write(other, f.read())
+        lines = list(make_action_docs(other, "me", sections="usage", examples=1))
+        self.assertIn("name: Example usage", lines)
+
+    def test_examples_option_follows_workflow_changes(self):
+        source = (
+            f"::: mkdocs-action-yml\n    :path: {self.action}\n    :owner: me\n    :examples:\n"
+        )
+        html = Markdown(extensions=[ActionYmlExtension()]).convert(source)
+        self.assertIn("Me/Repo/actions/build@v2", html)
+
+        write(os.path.join(self.workflows, "ci.yml"), CI.replace("@v2", "@v3"))
+        touch(os.path.join(self.workflows, "ci.yml"))
+        _cache.discovered.clear()
+        html = Markdown(extensions=[ActionYmlExtension()]).convert(source)
+        self.assertIn("Me/Repo/actions/build@v3", html)
+
+
+if __name__ == "__main__":
+    unittest.main()